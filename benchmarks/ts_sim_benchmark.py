@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Benchmark of Tropic Square simulation flow scripts.
+#
+# Simulator tools (vlogan, vhdlan, vcs, simv, urg) are replaced by stand-in shell scripts,
+# so that only overhead of the flow scripts is measured. Synthetic repository (source list
+# files, test list file, simulation config file) is generated in working directory.
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"
+)
+
+# Version of results format. Increment when format changes!
+RESULTS_VERSION = 1
+
+TARGET = "bench"
+
+# Stand-in tools. Behaviour is controlled by TS_BENCH_* environment variables.
+FAKE_TOOLS = {
+    # Compilers: write log file, optionally sleep
+    "vlogan": """\
+#!/bin/sh
+while [ $# -gt 0 ]; do
+    case "$1" in -l) shift; log="$1";; esac; shift
+done
+sleep "${TS_BENCH_COMP_SLEEP:-0}"
+[ -n "$log" ] && echo "Parsing design files" > "$log"
+exit 0
+""",
+    # Elaborator: creates 'simv' which calls stand-in simulator
+    "vcs": """\
+#!/bin/sh
+while [ $# -gt 0 ]; do
+    case "$1" in -l) shift; log="$1";; esac; shift
+done
+sleep "${TS_BENCH_ELAB_SLEEP:-0}"
+[ -n "$log" ] && echo "Top Level Modules: bench_top" > "$log"
+printf '#!/bin/sh\\nexec fake_simv "$@"\\n' > simv
+chmod +x simv
+exit 0
+""",
+    # Simulator: emits log lines with optional error pattern, creates coverage database
+    "fake_simv": """\
+#!/bin/sh
+log=/dev/stdout
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -l) shift; log="$1";;
+        -cm_dir) shift; mkdir -p "$1.vdb";;
+    esac
+    shift
+done
+sleep "${TS_BENCH_SIM_SLEEP:-0}"
+lines="${TS_BENCH_SIM_LOG_LINES:-100}"
+yes "UVM_INFO @ 100ns: reporter [BENCH] Benchmark simulation log line" | head -n "$lines" > "$log"
+if [ "${TS_BENCH_SIM_ERROR:-0}" != "0" ]; then
+    echo "UVM_ERROR @ 200ns: reporter [BENCH] Benchmark error" >> "$log"
+fi
+exit 0
+""",
+    # Coverage merge: creates output database and report directory
+    "urg": """\
+#!/bin/sh
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -dbname) shift; mkdir -p "$1";;
+        -report) shift; mkdir -p "$1";;
+    esac
+    shift
+done
+sleep "${TS_BENCH_MERGE_SLEEP:-0}"
+exit 0
+""",
+}
+FAKE_TOOLS["vhdlan"] = FAKE_TOOLS["vlogan"]
+
+
+def generate_repository(work_dir: str, n_files: int, n_libs: int, n_tests: int):
+    """
+    Generates synthetic repository and stand-in tools.
+    :param work_dir: Working directory
+    :param n_files: Number of source files
+    :param n_libs: Number of compilation libraries (one source list file each)
+    :param n_tests: Number of tests in test list file
+    :return: Repository root and directory with stand-in tools
+    """
+    repo = os.path.join(work_dir, "repo")
+    bin_dir = os.path.join(work_dir, "bin")
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    os.makedirs(bin_dir)
+    for name, content in FAKE_TOOLS.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as fd:
+            fd.write(content)
+        os.chmod(path, 0o755)
+
+    rtl_dir = os.path.join(repo, "rtl")
+    os.makedirs(rtl_dir)
+    slf_files = []
+    for lib in range(n_libs):
+        lib_files = range(lib, n_files, n_libs)
+        for i in lib_files:
+            ext = ".vhd" if i % 4 == 0 else ".sv"
+            with open(os.path.join(rtl_dir, f"bench_{i:05d}{ext}"), "w") as fd:
+                fd.write(f"// Benchmark source file {i}\n")
+        slf = os.path.join(rtl_dir, f"slf_bench_lib_{lib:03d}.yml")
+        with open(slf, "w") as fd:
+            fd.write(f"library: bench_lib_{lib:03d}\n")
+            fd.write("source_list:\n")
+            for i in lib_files:
+                ext = ".vhd" if i % 4 == 0 else ".sv"
+                fd.write(f"    - file: bench_{i:05d}{ext}\n")
+        slf_files.append(os.path.relpath(slf, repo))
+
+    sim_dir = os.path.join(repo, "sim")
+    os.makedirs(sim_dir)
+    with open(os.path.join(sim_dir, "tlf_bench.yml"), "w") as fd:
+        fd.write("tests:\n")
+        for i in range(n_tests):
+            fd.write(f"    - name: bench_test_{i:05d}\n")
+
+    with open(os.path.join(sim_dir, "ts_sim_config.yml"), "w") as fd:
+        fd.write("simulator: vcs\n")
+        fd.write("test_list_file: sim/tlf_bench.yml\n")
+        fd.write("coverage: true\n")
+        fd.write("error_patterns:\n    common:\n        - \"UVM_ERROR\"\n")
+        fd.write(f"targets:\n    {TARGET}:\n        top_entity: bench_lib_000.bench_top\n")
+        fd.write("        source_list_files:\n")
+        for slf in slf_files:
+            fd.write(f"            - {slf}\n")
+
+    return repo, bin_dir
+
+
+def generate_log(path: str, size_mb: int):
+    """
+    Generates simulation log file with given size and log trailer.
+    :param path: Log file path
+    :param size_mb: Size of log file in MB
+    """
+    line = "UVM_INFO @ 100ns: reporter [BENCH] Benchmark simulation log line\n"
+    chunk = line * (1024 * 1024 // len(line))
+    with open(path, "w") as fd:
+        for _ in range(size_mb):
+            fd.write(chunk)
+        fd.write("\nTS_SIM_RUN_EXIT_CODE: 0\nTS_SIM_RUN_TIME: 1.0\n")
+
+
+class Benchmark:
+    def __init__(self, repo: str, bin_dir: str, repeat: int):
+        self.repo = repo
+        self.repeat = repeat
+        self.env = {
+            **os.environ,
+            "TS_REPO_ROOT": repo,
+            "PATH": os.pathsep.join((bin_dir, os.environ["PATH"])),
+        }
+        self.results = {}
+
+    def run_script(self, script: str, *args):
+        """
+        Runs flow script in repository root.
+        :return: Wall time of the script
+        """
+        command = [sys.executable, os.path.join(SCRIPTS_DIR, script), *args]
+        start = time.perf_counter()
+        res = subprocess.run(
+            command,
+            cwd=self.repo,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            encoding="latin-1",
+        )
+        wall_time = time.perf_counter() - start
+        if res.returncode != 0:
+            raise RuntimeError(
+                f"'{' '.join(command)}' failed with exit code {res.returncode}:\n"
+                f"{res.stderr[-2000:]}"
+            )
+        return wall_time
+
+    def scenario(self, name: str, script: str, *args, setup=None):
+        """
+        Measures scenario 'repeat' times.
+        :param name: Scenario name
+        :param script: Flow script
+        :param args: Arguments of the flow script
+        :param setup: Called before each measurement
+        """
+        runs = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            runs.append(self.run_script(script, *args))
+        self.results[name] = {
+            "runs": runs,
+            "min": min(runs),
+            "median": statistics.median(runs),
+        }
+        print(
+            f"{name:<32} min: {min(runs):>9.3f} s   median: {statistics.median(runs):>9.3f} s"
+        )
+
+
+def get_commit() -> str:
+    """
+    Commit of the flow scripts, with '-dirty' suffix for uncommitted changes.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=SCRIPTS_DIR,
+            capture_output=True,
+            encoding="utf-8",
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return commit
+
+
+def compare(results: dict, baseline_path: str):
+    """
+    Prints comparison of results with results of another run.
+    :param results: Results of this run
+    :param baseline_path: Results file of baseline run
+    """
+    with open(baseline_path) as fd:
+        baseline = json.load(fd)
+    print(f"\nComparison with {baseline['commit']} (median):")
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            print(f"{name:<32} not in baseline")
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        print(
+            f"{name:<32} {base['median']:>9.3f} s -> {result['median']:>9.3f} s "
+            f"({(ratio - 1) * 100:+.1f} %)"
+        )
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark of simulation flow scripts")
+    parser.add_argument(
+        "--work-dir",
+        default=os.path.join(os.getcwd(), "ts_sim_benchmark_work"),
+        help="Directory where synthetic repository is generated (removed at start).",
+    )
+    parser.add_argument("--files", type=int, default=2000, help="Number of source files.")
+    parser.add_argument("--libs", type=int, default=20, help="Number of libraries.")
+    parser.add_argument("--tests", type=int, default=1000, help="Number of tests.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=[1, 8],
+        help="Numbers of parallel regression jobs, one regression scenario each.",
+    )
+    parser.add_argument(
+        "--log-mb", type=int, default=1024, help="Size of log file checked (MB)."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of measurements of each scenario."
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=["compile", "elab", "regress", "check", "coverage"],
+        choices=["compile", "elab", "regress", "check", "coverage"],
+        help="Scenarios to be measured.",
+    )
+    parser.add_argument(
+        "-o", "--output", default="ts_sim_benchmark.json", help="Results file."
+    )
+    parser.add_argument("--compare", help="Results file of baseline run.")
+    args = parser.parse_args()
+
+    work_dir = os.path.abspath(args.work_dir)
+    repo, bin_dir = generate_repository(work_dir, args.files, args.libs, args.tests)
+    bench = Benchmark(repo, bin_dir, args.repeat)
+    build_dir = os.path.join(repo, "sim", "build")
+
+    if "compile" in args.scenarios:
+        bench.scenario(
+            "compile_cold",
+            "ts_sim_compile.py",
+            TARGET,
+            setup=lambda: shutil.rmtree(build_dir, ignore_errors=True),
+        )
+        bench.scenario("compile_warm", "ts_sim_compile.py", TARGET)
+    else:
+        bench.run_script("ts_sim_compile.py", TARGET)
+
+    if "elab" in args.scenarios:
+        bench.run_script("ts_sim_run.py", TARGET, "bench_test_00000", "--elab-only")
+        bench.scenario(
+            "elab_reuse", "ts_sim_run.py", TARGET, "bench_test_00000", "--elab-only"
+        )
+
+    if "regress" in args.scenarios or "coverage" in args.scenarios:
+        for jobs in args.jobs:
+            bench.scenario(
+                f"regress_{args.tests}_tests_{jobs}_jobs",
+                "ts_sim_regress.py",
+                TARGET,
+                "*",
+                "--regress-jobs",
+                str(jobs),
+            )
+
+    if "check" in args.scenarios:
+        log_file = os.path.join(work_dir, "sim_bench_check.log")
+        generate_log(log_file, args.log_mb)
+        bench.scenario(f"check_{args.log_mb}_mb_log", "ts_sim_check.py", TARGET, log_file)
+
+    if "coverage" in args.scenarios:
+        bench.scenario(
+            f"coverage_merge_{args.tests}_dbs", "ts_sim_coverage.py", "--clear"
+        )
+
+    results = {
+        "version": RESULTS_VERSION,
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "params": {
+            "files": args.files,
+            "libs": args.libs,
+            "tests": args.tests,
+            "jobs": args.jobs,
+            "log_mb": args.log_mb,
+            "repeat": args.repeat,
+        },
+        "scenarios": bench.results,
+    }
+    with open(args.output, "w") as fd:
+        json.dump(results, fd, indent=4)
+    print(f"Results stored in '{args.output}'")
+
+    if args.compare:
+        compare(results, args.compare)
@@ -214,6 +214,7 @@ class GRAMMAR_SIM_CFG:
             Optional("add_comp_options", default=""): str,
             Optional("add_vhdl_comp_options", default=""): str,
             Optional("add_verilog_comp_options", default=""): str,
+            Optional("compile_batch_reorder", default=False): bool,
             Optional("elab_options"): _simulator_comp_sim_elab_opts,
             Optional("add_elab_options", default=""): str,
             Optional("sim_options"): _simulator_comp_sim_elab_opts,
@@ -571,6 +572,28 @@ GRAMMAR_PWR_CONFIG = GrammarSchema(
     }
 )
 
+##################################################################################################
+#
+# Synopsys log waivers file grammar
+#
+###################################################################################################
+
+GRAMMAR_SNPS_WAIVERS = GrammarSchema(
+    {
+        "waivers": [
+            And(
+                {
+                    Optional("id"): str,
+                    Optional("regex"): str,
+                    Optional("reason"): str,
+                },
+                lambda w: "id" in w or "regex" in w,
+                error="Waiver shall have 'id' or 'regex'",
+            )
+        ],
+    }
+)
+
 ##################################################################################################
 #
 # Memory map generator file grammar
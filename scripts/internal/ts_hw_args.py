@@ -70,6 +70,13 @@ def add_cfg_files_arg(parser: ArgumentParser) -> None:
         default=ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG_PATH),
         help="Specifies Design configuration file to load.",
     )
+    parser.add_argument(
+        "--revalidate-pdk",
+        action="store_true",
+        default=False,
+        help="Validate PDK configuration files and their view files even if they were "
+        "validated by previous run (see PDK cache).",
+    )
     parser.add_argument(
         "-pc",
         "--pwr-cfg",
@@ -78,6 +85,39 @@ def add_cfg_files_arg(parser: ArgumentParser) -> None:
     )
 
 
+def add_profile_arg(parser: ArgumentParser) -> None:
+    """
+    Adds argument enabling timing profile of flow phases.
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    parser.add_argument(
+        "--profile",
+        default="",
+        help="Measure duration of flow phases. Chrome trace-event JSON is stored to "
+        "given file (open it in chrome://tracing or Perfetto), summary table is stored "
+        "next to it.",
+    )
+
+
+def add_metrics_args(parser: ArgumentParser) -> None:
+    """
+    Adds arguments enabling export of flow metrics.
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    parser.add_argument(
+        "--metrics-json",
+        default="",
+        help="Store metrics of the run (per-test wall time, CPU time, peak memory, exit "
+        "codes, elaboration reuse, compile cache hits, log check time) to JSON file.",
+    )
+
+    parser.add_argument(
+        "--metrics-prom",
+        default="",
+        help="Store metrics of the run to Prometheus textfile (see '--metrics-json').",
+    )
+
+
 def add_target_arg(parser: ArgumentParser) -> None:
     """
     Adds compilation/simulation target argument.
@@ -259,6 +299,15 @@ def add_ts_sim_compile_args(parser: ArgumentParser) -> None:
         "Verilog/System Verilog files.",
     )
 
+    parser.add_argument(
+        "--compile-batch-reorder",
+        action="store_true",
+        default=False,
+        help="Compile all files of a library with identical compile options by single "
+        "compiler call, even if they are not adjacent in source list files. "
+        "Compilation order of the files may change!",
+    )
+
     parser.add_argument(
         "--exp-tcl-file-dc",
         default="",
@@ -575,6 +624,42 @@ def add_ts_sim_coverage_args(parser: ArgumentParser) -> None:
         help="Do not generate report upon database merge",
     )
 
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Merge only databases which are not merged in output database yet. "
+        "Output database is rebuilt from scratch when an elaboration database, or already "
+        "merged simulation database changes.",
+    )
+
+    parser.add_argument(
+        "--grade",
+        nargs="?",
+        const="quick",
+        choices=["quick", "score"],
+        help="Grade tests instead of merging: select minimal set of tests which reaches "
+        "the merged coverage. Selected and redundant tests are stored in "
+        "<output>_grade.json. Optional value is grading method of urg (default: quick).",
+    )
+
+    parser.add_argument(
+        "--merge-fan-in",
+        type=int,
+        default=0,
+        help="Merge databases in a tree: at most N databases are merged by single merge, "
+        "intermediate databases are merged recursively. By default, all databases are "
+        "merged by single merge.",
+    )
+
+    parser.add_argument(
+        "--merge-jobs",
+        type=int,
+        default=1,
+        help="Number of merges running in parallel when merging in a tree "
+        "(see '--merge-fan-in').",
+    )
+
     parser.add_argument(
         "--no-sim-out",
         action="store_true",
@@ -708,6 +793,191 @@ def add_ts_pwr_run_args(parser: ArgumentParser) -> None:
         "do not continue and finish with error.",
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of scenarios executed in parallel. Each scenario runs in its own rundir.",
+    )
+
+    parser.add_argument(
+        "--sim-jobs",
+        type=int,
+        default=None,
+        help="Maximal number of simulations running in parallel (simulator license slots). "
+        "Default is --jobs.",
+    )
+
+    parser.add_argument(
+        "--pt-jobs",
+        type=int,
+        default=None,
+        help="Maximal number of PrimeTime runs in parallel (PrimeTime license slots). "
+        "Default is --jobs.",
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        default=False,
+        help="Run power analysis of a scenario while next scenarios are simulated. "
+        "Implied by --jobs > 1.",
+    )
+
+    parser.add_argument(
+        "--vcd-queue",
+        type=int,
+        default=None,
+        help="Maximal number of VCD files in flight (being dumped, waiting for power analysis "
+        "or being analyzed) in pipelined run. Default is --sim-jobs + --pt-jobs.",
+    )
+
+    parser.add_argument(
+        "--remove-vcd",
+        action="store_true",
+        default=False,
+        help="Remove VCD file of a scenario once its power analysis is finished.",
+    )
+
+    parser.add_argument(
+        "--no-shared-sim",
+        action="store_true",
+        default=False,
+        help="Simulate each scenario on its own. By default, scenarios with the same simulation "
+        "target, test and seed share one simulation and VCD file is sliced for each of them.",
+    )
+
+    parser.add_argument(
+        "--activity-format",
+        default=None,
+        choices=("vcd", "vcd.gz", "saif"),
+        help=dedent(
+            """\
+            Reduce VCD file dumped by simulation before power analysis: keep only signals
+            below strip path and store activity of each scenario in its rundir as VCD,
+            gzip-compressed VCD or SAIF toggle summary.
+            """
+        ),
+    )
+
+
+def add_ts_pwr_vcd_args(parser: ArgumentParser) -> None:
+    """
+    Adds arguments specific to ts_pwr_vcd.py
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    parser.add_argument("vcd_file", help="Input VCD file (may be gzip-compressed).")
+
+    parser.add_argument(
+        "output",
+        help="Output file. It is gzip-compressed if its name ends with '.gz'.",
+    )
+
+    parser.add_argument(
+        "--from",
+        dest="start",
+        type=int,
+        default=None,
+        help="Start of time window in ns. Default is start of the VCD file.",
+    )
+
+    parser.add_argument(
+        "--to",
+        dest="end",
+        type=int,
+        default=None,
+        help="End of time window in ns. Default is end of the VCD file.",
+    )
+
+    parser.add_argument(
+        "--scope",
+        type=str,
+        default=None,
+        help="Keep only signals below this hierarchical path (e.g. tb_top/dut).",
+    )
+
+    parser.add_argument(
+        "--format",
+        default="vcd",
+        choices=("vcd", "saif"),
+        help="Output format: VCD or SAIF toggle summary. Default is '%(default)s'.",
+    )
+
+
+def add_ts_qor_args(parser: ArgumentParser) -> None:
+    """
+    Adds arguments specific to ts_qor.py
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    add_qor_db_arg(parser)
+    subparsers = parser.add_subparsers(
+        title="Commands",
+        dest="command",
+        required=True,
+        parser_class=ArgumentParser,
+        description="runs - list runcodes, trend - metric across runcodes, diff - compare "
+        "two runcodes, paths - worst timing paths, ingest - ingest reports directory",
+    )
+
+    parser_runs = subparsers.add_parser("runs")
+    parser_runs.add_argument("--flow", type=str, default=None, help="Flow type (e.g. sta).")
+
+    parser_trend = subparsers.add_parser("trend")
+    parser_trend.add_argument(
+        "metric", help="Metric name, glob pattern allowed (e.g. 'timing.max.wns').",
+    )
+    parser_trend.add_argument("--flow", type=str, default="sta", help="Flow type.")
+    parser_trend.add_argument("--mode", type=str, default=None, help="Design mode.")
+    parser_trend.add_argument("--group", type=str, default=None, help="Path group.")
+    parser_trend.add_argument(
+        "--last", type=int, default=None, help="Number of most recent runcodes."
+    )
+
+    parser_diff = subparsers.add_parser("diff")
+    parser_diff.add_argument("runcode_a", help="Runcode compared.")
+    parser_diff.add_argument("runcode_b", help="Runcode compared to.")
+    parser_diff.add_argument("--flow", type=str, default="sta", help="Flow type.")
+    parser_diff.add_argument(
+        "--metric", type=str, default="*", help="Metric name, glob pattern allowed."
+    )
+    parser_diff.add_argument(
+        "--changed", action="store_true", default=False, help="Show only changed metrics."
+    )
+
+    parser_paths = subparsers.add_parser("paths")
+    parser_paths.add_argument("runcode", help="Runcode.")
+    parser_paths.add_argument("--flow", type=str, default="sta", help="Flow type.")
+    parser_paths.add_argument("--group", type=str, default=None, help="Path group.")
+    parser_paths.add_argument(
+        "--limit", type=int, default=20, help="Number of paths (default: %(default)s)."
+    )
+
+    parser_ingest = subparsers.add_parser("ingest")
+    parser_ingest.add_argument("flow", help="Flow type (e.g. sta).")
+    parser_ingest.add_argument("runcode", help="Runcode.")
+    parser_ingest.add_argument("reports_dir", help="Reports directory of the run.")
+    parser_ingest.add_argument(
+        "--mode", type=str, default=None, help="Mode of reports without mode in their path."
+    )
+
+
+def add_ts_release_verify_args(parser: ArgumentParser) -> None:
+    """
+    Adds arguments specific to ts_release_verify.py
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    parser.add_argument(
+        "release_dir", help="Release directory (with release manifest) to verify."
+    )
+
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        default=False,
+        help="Compare checksums of all released files. By default, only sizes are compared "
+        "and checksums only of files modified after release.",
+    )
+
 
 def add_ts_syn_run_args(parser: ArgumentParser, tool_type: str) -> None:
     """
@@ -808,6 +1078,21 @@ def add_ts_sta_run_args(parser: ArgumentParser, tool_type: str) -> None:
         help=f"Use mode name from ts_design_cfg.yml. Mutually exclusive with DMSA.",
     )
 
+    parser.add_argument(
+        "--modes",
+        default=None,
+        help="Run STA of several modes from ts_design_cfg.yml: 'all' or comma separated "
+        "list of mode names. Each mode runs its own pt_shell in sub-directory of the runcode "
+        "directory. Mutually exclusive with --mode and --dmsa.",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of modes (--modes) executed in parallel.",
+    )
+
     parser.add_argument(
         "--netlist",
         nargs="?",
@@ -819,7 +1104,7 @@ def add_ts_sta_run_args(parser: ArgumentParser, tool_type: str) -> None:
         "--dmsa",
         action="store_true",
         default=False,
-        help=f"Run DMSA. Mutually exclusive with --mode",
+        help=f"Run DMSA. Mutually exclusive with --mode and --modes",
     )
 
     parser.add_argument(
@@ -1048,6 +1333,70 @@ def add_release_arg(parser: ArgumentParser) -> None:
         default=False,
         help="Hard-copy results to destination folder according to flow_dir settings in a ts_design_cfg.yml file.",
     )
+    parser.add_argument(
+        "--release-mode",
+        choices=["auto", "reflink", "hardlink", "copy"],
+        default="auto",
+        help="How released files are created. 'auto' reflinks files when release directory is "
+        "on the same file system as the run directory and copies them otherwise. "
+        "'hardlink' shares files with the run directory, use it only if run directory is not "
+        "modified after release. Files unchanged since previous release are skipped "
+        "(default: %(default)s).",
+    )
+
+
+# Common arguments for checking of Synopsys tool logs
+def add_snps_log_args(parser: ArgumentParser) -> None:
+    """
+    Adds common arguments for checking of Synopsys tool logs
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    parser.add_argument(
+        "--log-waivers",
+        type=str,
+        default=None,
+        help="YAML file with waivers of tool log messages. Each waiver in 'waivers' list has "
+        "message 'id' (e.g. UID-401) and/or 'regex' matched to message text, and "
+        "optional 'reason'. Waived errors do not fail the run.",
+    )
+
+    parser.add_argument(
+        "--log-json",
+        type=str,
+        default=None,
+        help="JSON file with summary of tool log messages. Default is "
+        "'<log file>_messages.json'.",
+    )
+
+
+# Common arguments for QoR database
+def add_qor_db_arg(parser: ArgumentParser) -> None:
+    """
+    Adds common argument --qor-db
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    parser.add_argument(
+        "--qor-db",
+        type=str,
+        default=None,
+        help="QoR database (SQLite) of timing, QoR, area and power reports. Default is "
+        f"'{TsGlobals.TS_QOR_DB_FILE}' in repository root.",
+    )
+
+
+# Common arguments for ingestion of reports to QoR database
+def add_qor_ingest_args(parser: ArgumentParser) -> None:
+    """
+    Adds common arguments for ingestion of reports to QoR database
+    :param parser: Argparse parser to which arguments shall be added
+    """
+    add_qor_db_arg(parser)
+    parser.add_argument(
+        "--no-qor",
+        action="store_true",
+        default=False,
+        help="Do not ingest reports of the run to QoR database.",
+    )
 
 
 # Common argument, batch mode
@@ -262,7 +262,7 @@ def do_design_config_init(args, skip_check=False, enforce=False):
         ts_info(TsInfoCode.INFO_PDK_3)
 
     # Read in PDKS
-    load_pdk_configs()
+    load_pdk_configs(getattr(args, "revalidate_pdk", False))
 
     # Check that Design config is valid (it references towards PDK objects)
     validate_design_config_file()
@@ -526,65 +526,79 @@ def check_valid_mode_arg(args):
             ts_throw_error(TsErrCode.ERR_STA_5, args.mode)
 
 
-def parse_runcode_arg(args):
+def parse_runcode_arg_root_dir(args, root_dir):
     """
     Parses runcode with regards to defined rules by methodology.
-    Test of runcode existance, _n+1 rule usage.
+    Test of runcode existance, _n+1 rule usage. Run directory of new runcode is created
+    in root directory (see 'allocate_runcode').
     """
     if args.open_result or args.force:
         return f"{args.runcode}"
 
     if args.runcode:
-        root_dir = os.getcwd()
-        result = None
-        suffix = None
-
-        regex = re.compile(rf"({args.runcode})(_*)([0-9]*)$")
-        for dir in os.listdir(root_dir):
-            result = regex.search(dir)
-            if result:
-                if suffix is None:
-                    suffix = 0
-                if result.group(3):
-                    if suffix < int(result.group(3)):
-                        suffix = int(result.group(3))
-
-        if suffix is not None:
-            return f"{args.runcode}_{suffix+1}"
-        else:
-            return f"{args.runcode}"
+        return allocate_runcode(args.runcode, root_dir)
     else:
         return None
 
 
-def parse_runcode_arg_root_dir(args, root_dir):
+def __get_runcode_name(runcode: str, suffix: int) -> str:
     """
-    Parses runcode with regards to defined rules by methodology.
-    Test of runcode existance, _n+1 rule usage.
+    Returns runcode with suffix, suffix 0 stands for runcode without suffix.
     """
-    if args.open_result or args.force:
-        return f"{args.runcode}"
+    return f"{runcode}_{suffix}" if suffix else runcode
 
-    if not os.path.exists(root_dir):
-        return f"{args.runcode}"
 
-    if args.runcode:
-        result = None
-        suffix = None
-
-        regex = re.compile(rf"({args.runcode})(_*)([0-9]*)$")
-        for dir in os.listdir(root_dir):
-            result = regex.search(dir)
-            if result:
-                if suffix is None:
-                    suffix = 0
-                if result.group(3):
-                    if suffix < int(result.group(3)):
-                        suffix = int(result.group(3))
-
-        if suffix is not None:
-            return f"{args.runcode}_{suffix+1}"
-        else:
-            return f"{args.runcode}"
-    else:
-        return None
+def __scan_runcode_suffix(runcode: str, root_dir: str) -> int:
+    """
+    Returns first free suffix of runcode by listing of root directory.
+    :param runcode: Runcode
+    :param root_dir: Directory with run directories
+    :return: 0 if there is no run directory of the runcode, highest suffix + 1 otherwise
+    """
+    regex = re.compile(rf"{re.escape(runcode)}(?:_([0-9]+))?")
+    suffix = None
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            match = regex.fullmatch(entry.name)
+            if match:
+                suffix = max(suffix or 0, int(match.group(1) or 0))
+    return 0 if suffix is None else suffix + 1
+
+
+def allocate_runcode(runcode: str, root_dir: str) -> str:
+    """
+    Allocates run directory of new run in root directory following _n+1 rule: runcode is
+    used as is if there is no run directory of the runcode, otherwise suffix _n+1 is added
+    (n is the highest suffix used so far).
+    Run directory is created by exclusive mkdir, so concurrent runs never get the same
+    runcode. Next suffix of each runcode is kept in TS_RUNCODES_DIR of the root directory,
+    so the root directory is listed only when the runcode is allocated for the first time.
+    :param runcode: Runcode
+    :param root_dir: Directory with run directories
+    :return: Allocated runcode (name of created run directory)
+    """
+    counters_dir = os.path.join(root_dir, TsGlobals.TS_RUNCODES_DIR)
+    os.makedirs(counters_dir, exist_ok=True)
+    counter_path = os.path.join(counters_dir, runcode)
+
+    try:
+        with open(counter_path) as fd:
+            suffix = int(fd.read())
+    except (OSError, ValueError):
+        suffix = __scan_runcode_suffix(runcode, root_dir)
+
+    while True:
+        try:
+            os.mkdir(os.path.join(root_dir, __get_runcode_name(runcode, suffix)))
+            break
+        except FileExistsError:
+            suffix += 1
+
+    # Counter is only a hint, stale value written by a concurrent run costs a retry
+    tmp_path = f"{counter_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as fd:
+        fd.write(f"{suffix + 1}\n")
+    os.replace(tmp_path, counter_path)
+
+    ts_debug(f"Allocated runcode '{__get_runcode_name(runcode, suffix)}' in '{root_dir}'")
+    return __get_runcode_name(runcode, suffix)
@@ -5,14 +5,23 @@
 #
 # For license see LICENSE file in repository root.
 ####################################################################################################
+import json
 import os
 import re
 
+from schema import SchemaError
+
 from .ts_grammar import (
     BUILT_IN_UVM_IGNORE_START_PATTERN,
     BUILT_IN_UVM_IGNORE_STOP_PATTERN,
+    GRAMMAR_SNPS_WAIVERS,
+)
+from .ts_hw_common import (
+    load_yaml_file,
+    ts_get_cfg,
+    ts_is_at_least_verbose,
+    ts_is_uvm_enabled,
 )
-from .ts_hw_common import ts_get_cfg, ts_is_at_least_verbose, ts_is_uvm_enabled
 from .ts_hw_logging import (
     TsColors,
     TsErrCode,
@@ -437,46 +446,246 @@ class TSLogChecker:
             sep="\n",
         )
 
-def check_snps_log_file(flow_type, log_file_path: str) -> int:
+# Synopsys (DC, PT, ICC2) message: severity and text
+SNPS_MSG_REGEX = re.compile(r"^\[?(Error|Warning)(?:\]|:)\s*(.*?)\s*$")
+
+# Synopsys message ID at the end of message, e.g. "(UID-401)"
+SNPS_MSG_ID_REGEX = re.compile(r"\(([A-Za-z][A-Za-z0-9_]*-[0-9]+)\)$")
+
+# Line starting another tool message (e.g. "Information:", "[Error]") or a shell prompt,
+# it ends continuation of previous message
+SNPS_MSG_START_REGEX = re.compile(r"^(?:\[?[A-Za-z]\w*\]?:|\w*>\s)")
+
+# Maximal number of lines of single Synopsys message (message ID is on its last line)
+SNPS_MSG_MAX_LINES = 5
+
+# Maximal length of example message in Synopsys log summary
+SNPS_MSG_MAX_LEN = 80
+
+
+def __load_snps_waivers(waivers_file: str) -> list:
+    """
+    Loads waivers of Synopsys log messages.
+    :param waivers_file: Path to YAML waivers file, None if there are no waivers.
+    :return: List of waivers, each with message ID and/or compiled regex of message text.
+    """
+    if not waivers_file:
+        return []
+    cfg = load_yaml_file(waivers_file)
+    try:
+        GRAMMAR_SNPS_WAIVERS.validate(cfg)
+    except SchemaError as e:
+        ts_throw_error(TsErrCode.GENERIC, f"Invalid waivers file '{waivers_file}': {e}")
+
+    waivers = []
+    for waiver in cfg["waivers"]:
+        try:
+            regex = re.compile(waiver["regex"]) if "regex" in waiver else None
+        except re.error as e:
+            ts_throw_error(
+                TsErrCode.GENERIC,
+                f"Invalid waiver regex '{waiver['regex']}' in '{waivers_file}': {e}",
+            )
+        waivers.append({**waiver, "regex": regex, "count": 0})
+    return waivers
+
+
+def __get_snps_waiver(waivers: list, msg_id: str, text: str):
+    """
+    Returns first waiver matching Synopsys message, None if message is not waived.
+    :param waivers: Waivers loaded by '__load_snps_waivers'
+    :param msg_id: Message ID ("" if message has no ID)
+    :param text: Message text
+    """
+    for waiver in waivers:
+        # Message without ID is never waived by ID
+        if "id" in waiver and (not msg_id or waiver["id"] != msg_id):
+            continue
+        if waiver["regex"] is not None and not waiver["regex"].search(text):
+            continue
+        return waiver
+    return None
+
+
+def __parse_snps_log(fd, waivers: list) -> dict:
+    """
+    Parses Synopsys log line by line and aggregates messages by severity and message ID.
+    Memory use depends only on number of distinct message IDs.
+    :param fd: Opened log file
+    :param waivers: Waivers loaded by '__load_snps_waivers'
+    :return: Message records by (severity, message ID)
+    """
+    messages = {}
+
+    def __add_message(severity: str, line_number: int, text: str, msg_id: str):
+        key = (severity, msg_id)
+        record = messages.get(key)
+        if record is None:
+            record = messages[key] = {
+                "severity": severity,
+                "id": msg_id,
+                "count": 0,
+                "waived": 0,
+                "first_line": line_number,
+                "message": text[:SNPS_MSG_MAX_LEN],
+            }
+        record["count"] += 1
+        waiver = __get_snps_waiver(waivers, msg_id, text)
+        if waiver is not None:
+            waiver["count"] += 1
+            record["waived"] += 1
+
+    # Message whose ID was not found yet: [severity, line number, text, lines]
+    pending = None
+    for line_number, line in enumerate(fd, start=1):
+        # Quick check, most of the lines are not messages
+        match = SNPS_MSG_REGEX.match(line) if line[:1] in "EW[" else None
+
+        if pending is not None:
+            stripped = line.strip()
+            # Only indented or wrapped text continues the message
+            if (
+                match is None
+                and stripped
+                and pending[3] < SNPS_MSG_MAX_LINES
+                and not SNPS_MSG_START_REGEX.match(line)
+            ):
+                pending[2] += " " + stripped
+                pending[3] += 1
+                id_match = SNPS_MSG_ID_REGEX.search(stripped)
+                if id_match is None:
+                    continue
+                __add_message(pending[0], pending[1], pending[2], id_match.group(1))
+                pending = None
+                continue
+            __add_message(pending[0], pending[1], pending[2], "")
+            pending = None
+
+        if match is not None:
+            severity, text = match.groups()
+            id_match = SNPS_MSG_ID_REGEX.search(text)
+            if id_match is not None:
+                __add_message(severity, line_number, text, id_match.group(1))
+            else:
+                pending = [severity, line_number, text, 1]
+
+    if pending is not None:
+        __add_message(pending[0], pending[1], pending[2], "")
+
+    return messages
+
+
+def __print_snps_log_summary(flow_type: str, records: list):
+    """
+    Prints summary table of Synopsys log messages.
+    :param flow_type: Flow name (e.g. "Synthesis")
+    :param records: Message records sorted for printing
+    """
+    row_format = "{:10}{:16}{:>10}{:>10}{:>12}  {}"
+    header = row_format.format("Severity", "ID", "Count", "Waived", "First line", "Message")
+    ts_print(f"{flow_type} log messages:", color=TsColors.ORANGE, big=True)
+    ts_print(header, "-" * len(header), sep="\n")
+    for record in records:
+        ts_print(
+            row_format.format(
+                record["severity"],
+                record["id"] or "(no ID)",
+                record["count"],
+                record["waived"],
+                record["first_line"],
+                record["message"],
+            ),
+            color=TsColors.RED
+            if record["severity"] == "Error" and record["count"] > record["waived"]
+            else None,
+        )
+
+
+def check_snps_log_file(
+    flow_type, log_file_path: str, waivers_file: str = None, json_file: str = None
+) -> int:
     """
-    Simple checker of synopsys DC and PT logs
+    Checker of Synopsys DC, PT and ICC2 logs, see 'get_snps_log_summary'.
+    :return: True if there is an error which is not waived, False otherwise
     """
+    summary = get_snps_log_summary(flow_type, log_file_path, waivers_file, json_file)
+
+    # Fail if an error was detected
+    return summary["errors"] > summary["waived_errors"]
+
+
+def get_snps_log_summary(
+    flow_type, log_file_path: str, waivers_file: str = None, json_file: str = None
+) -> dict:
+    """
+    Checker of Synopsys DC, PT and ICC2 logs. Errors and warnings are aggregated by
+    message ID and printed as summary table. Summary is also stored as JSON file.
+    :param flow_type: Flow name (e.g. "Synthesis")
+    :param log_file_path: Path to the log file
+    :param waivers_file: Path to YAML file with waivers of messages (by ID and/or regex)
+    :param json_file: Path to JSON summary, default is next to the log file.
+    :return: Summary of the log (counts of errors and warnings and aggregated messages)
+    """
+    waivers = __load_snps_waivers(waivers_file)
+
     try:
         with open(log_file_path, encoding="latin-1") as fd:
-            lines = fd.readlines()
+            messages = __parse_snps_log(fd, waivers)
     except FileNotFoundError:
         ts_throw_error(
             TsErrCode.GENERIC,
             f"{log_file_path} log file was not found. Synthesis probably did not run...",
         )
 
-    errors = []
-    warnings = []
-
-    # DC and PT Error format is luckily simple enough that there is no need for regex
-    for line_number, line in enumerate(lines):
-        if (line.startswith("Error:") or line.startswith("[Error]")):
-            errors.append([line_number, line])
-        if (line.startswith("Warning:") or line.startswith("[Warning]")):
-            warnings.append([line_number, line])
-
-    if warnings:
-        ts_print(f"{flow_type} log Warnings:", color=TsColors.ORANGE, big=True)
-        for warning in warnings:
-            tmp = warning[1].strip('\n')
-            ts_print(f"Line {warning[0]}: {tmp}")
-    else:
-        ts_print(f"No warnings in {flow_type} log", color=TsColors.PURPLE, big=True)
+    records = sorted(
+        messages.values(), key=lambda x: (x["severity"] != "Error", -x["count"], x["id"])
+    )
+    counts = {"Error": 0, "Warning": 0}
+    waived = {"Error": 0, "Warning": 0}
+    for record in records:
+        counts[record["severity"]] += record["count"]
+        waived[record["severity"]] += record["waived"]
+
+    if records:
+        __print_snps_log_summary(flow_type, records)
 
-    if errors:
-        ts_print(f"{flow_type} log Errors:", color=TsColors.RED, big=True)
-        for error in errors:
-            tmp = error[1].strip('\n')
-            ts_print(f"Line {error[0]}: {tmp}")
-    else:
+    if counts["Warning"] == waived["Warning"]:
+        ts_print(f"No warnings in {flow_type} log", color=TsColors.PURPLE, big=True)
+    if counts["Error"] == waived["Error"]:
         ts_print(f"No errors in {flow_type} log", color=TsColors.PURPLE, big=True)
 
-    # Fail if an error was detected
-    return (len(errors) > 0)
+    ts_info(
+        TsInfoCode.GENERIC,
+        f"{flow_type} log: {counts['Error']} errors ({waived['Error']} waived), "
+        f"{counts['Warning']} warnings ({waived['Warning']} waived)",
+    )
+    for waiver in waivers:
+        if waiver["count"] == 0:
+            ts_debug(f"Unused waiver: {waiver.get('id', '')} {waiver.get('reason', '')}")
+
+    if json_file is None:
+        json_file = f"{os.path.splitext(log_file_path)[0]}_messages.json"
+    summary = {
+        "log": os.path.abspath(log_file_path),
+        "errors": counts["Error"],
+        "warnings": counts["Warning"],
+        "waived_errors": waived["Error"],
+        "waived_warnings": waived["Warning"],
+        "messages": records,
+        "waivers": [
+            {
+                "id": w.get("id"),
+                "regex": w["regex"].pattern if w["regex"] is not None else None,
+                "reason": w.get("reason"),
+                "count": w["count"],
+            }
+            for w in waivers
+        ],
+    }
+    with open(json_file, "w") as fd:
+        json.dump(summary, fd, indent=4)
+    ts_info(TsInfoCode.GENERIC, f"{flow_type} log summary stored in '{json_file}'")
+
+    return summary
 
 
@@ -13,11 +13,13 @@ import os
 import shutil
 import random
 import re
+import resource
 import select
 import shutil
 import signal
 import subprocess
 import termios
+import time
 import sys
 import tty
 import pty
@@ -333,6 +335,20 @@ __FORBIDDEN_LINES = {
 }
 
 
+def __get_process_tree_rss(pid: int) -> int:
+    """
+    Resident set size of a process and all its children (in bytes).
+    :param pid: Process ID
+    """
+    rss = 0
+    with contextlib.suppress(psutil.Error):
+        process = psutil.Process(pid)
+        for proc in [process, *process.children(recursive=True)]:
+            with contextlib.suppress(psutil.Error):
+                rss += proc.memory_info().rss
+    return rss
+
+
 def exec_cmd_in_dir(
     directory: str, command: str, no_std_out: bool = False, no_std_err: bool = False,
     batch_mode: bool = True
@@ -347,6 +363,9 @@ def exec_cmd_in_dir(
         True  - Run in batch mode. Do not redirect input to calling process.
         False - Create pseudo-terminal and redirect inputs to calling
                 process to the executed command.
+
+    In batch mode, resource usage of the command (wall time, CPU time and peak memory)
+    is stored in TsGlobals.TS_LAST_CMD_USAGE.
     """
 
     def __raise_timeout(*args):
@@ -374,17 +393,32 @@ def exec_cmd_in_dir(
 
         ts_debug(f"Executing command in directory '{directory}'")
 
+        usage_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+        wall_start = time.time()
+        max_rss = 0
+        last_rss_sample = 0.0
+
         # Launch the command
         p = subprocess.Popen(
             command, shell=True, encoding="latin-1", cwd=directory, env=os.environ, **opts
         )
 
-        with contextlib.suppress(AttributeError):
+        if not output:
+            # No output to process -> Only sample memory of the command once per second
+            while p.poll() is None:
+                max_rss = max(max_rss, __get_process_tree_rss(p.pid))
+                with contextlib.suppress(subprocess.TimeoutExpired):
+                    p.wait(timeout=1.0)
+        else:
             signal.signal(signal.SIGALRM, __raise_timeout)
             no_color = ts_get_cfg("no_color")
             color_regex = re.compile("\x1b\[[0-9]{1,2}m")
             # Manage lines while process is running
             while p.poll() is None:
+                # Sample memory of the command at most once per second
+                if time.time() - last_rss_sample > 1.0:
+                    max_rss = max(max_rss, __get_process_tree_rss(p.pid))
+                    last_rss_sample = time.time()
                 # Read a new line
                 try:
                     # Define a timeout for reading the line
@@ -404,7 +438,23 @@ def exec_cmd_in_dir(
                 ts_print(line, end="")
         signal.alarm(0)
 
-        return p.wait()
+        exit_code = p.wait()
+
+        # Peak memory of largest finished child is known only if it exceeds peaks of
+        # previously executed commands
+        usage_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+        if usage_end.ru_maxrss > usage_start.ru_maxrss:
+            max_rss = max(max_rss, usage_end.ru_maxrss * 1024)
+        TsGlobals.TS_LAST_CMD_USAGE = {
+            "wall_time": time.time() - wall_start,
+            "cpu_time": usage_end.ru_utime
+            - usage_start.ru_utime
+            + usage_end.ru_stime
+            - usage_start.ru_stime,
+            "max_rss": max_rss,
+        }
+
+        return exit_code
 
 
     ###########################################################################
@@ -545,40 +595,16 @@ def get_pdk_obj(obj_type: str, target_obj_name: str, target_obj_version: str) ->
     """ """
     assert obj_type == "std_cells" or obj_type == "ips"
 
-    pdk_name = TsGlobals.TS_DESIGN_CFG["design"]["pdk"]
-    target_pdk = None
-
-    for pdk in TsGlobals.TS_PDK_CFGS:
-        if pdk_name == pdk["name"]:
-            target_pdk = pdk
-
-    assert target_pdk is not None
-
-    for obj in target_pdk[obj_type]:
-        # print(obj)
-        if obj["name"] == target_obj_name and obj["version"] == target_obj_version:
-            return obj
-
-    # We should never get here since loading of design config file guarantees that
+    # We should never miss since loading of design config file guarantees that
     # std_cells and IPs referred to are consistent
-    assert False
+    return TsGlobals.TS_PDK_OBJS[(obj_type, target_obj_name, target_obj_version)]
 
 
 def get_pdk_corners() -> dict:
     """ """
-    pdk_name = TsGlobals.TS_DESIGN_CFG["design"]["pdk"]
+    assert TsGlobals.TS_PDK_TARGET is not None
 
-    for pdk in TsGlobals.TS_PDK_CFGS:
-        if pdk_name == pdk["name"]:
-            target_pdk = pdk
-
-    assert target_pdk is not None
-
-    return target_pdk["corners"]
-
-    # We should never get here since loading of design config file guarantees that
-    # std_cells and IPs referred to are consistent
-    assert False
+    return TsGlobals.TS_PDK_TARGET["corners"]
 
 
 def view_has_corner(pdk_view: str):
@@ -596,32 +622,37 @@ def view_has_corner(pdk_view: str):
     return False
 
 
+def __get_modes_by_corner() -> dict:
+    """
+    Returns first design mode of each used corner. Computed once, design modes
+    filtering resets it.
+    """
+    if TsGlobals.TS_MODES_BY_CORNER is None:
+        modes_by_corner = {}
+        for mode in TsGlobals.TS_DESIGN_CFG["design"]["modes"]:
+            modes_by_corner.setdefault(mode["corner"], mode)
+        TsGlobals.TS_MODES_BY_CORNER = modes_by_corner
+    return TsGlobals.TS_MODES_BY_CORNER
+
+
 def is_used_corner(corner: str):
     """ """
-    for mode in TsGlobals.TS_DESIGN_CFG["modes"]:
-        if mode["corner"] == corner:
-            return True
-    return False
+    return corner in __get_modes_by_corner()
 
 
 def get_used_corners():
     """ """
-    raw_list = []
-    filtered_list = []
-    for mode in TsGlobals.TS_DESIGN_CFG["modes"]:
-        raw_list.append(mode["corner"])
-    [filtered_list.append(x) for x in raw_list if x not in filtered_list]
-    return filtered_list
+    return list(__get_modes_by_corner().keys())
 
 
 def get_mode_for_corner(corner: str):
     """ """
-    for mode in TsGlobals.TS_DESIGN_CFG["modes"]:
-        if mode["corner"] == corner:
-            return mode
-    ts_script_bug(
-        "Mode not found for corner -> Was the Design config file checked properly during parsing?"
-    )
+    mode = __get_modes_by_corner().get(corner)
+    if mode is None:
+        ts_script_bug(
+            "Mode not found for corner -> Was the Design config file checked properly during parsing?"
+        )
+    return mode
 
 
 def ts_get_design_top():
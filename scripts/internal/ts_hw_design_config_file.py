@@ -6,9 +6,13 @@
 # For license see LICENSE file in repository root.
 ####################################################################################################
 
+import contextlib
+import hashlib
+import json
 import mmap
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from schema import SchemaError
 
@@ -19,7 +23,6 @@ from .ts_grammar import (
     PDK_VIEW_CONFIG,
 )
 from .ts_hw_common import (
-    concat_keys,
     expand_vars,
     load_yaml_file,
     ts_get_file_rel_path,
@@ -38,6 +41,21 @@ from .ts_hw_logging import (
     ts_warning,
 )
 
+# Version of liberty index format. Increment when format changes!
+LIBERTY_INDEX_VERSION = 1
+
+# Version of validated PDK config format. Increment when format or validation changes!
+VALIDATED_PDK_VERSION = 1
+
+# Version of PDK names index format. Increment when format changes!
+PDK_NAMES_VERSION = 1
+
+# Number of parallel file system checks when validating PDK
+PDK_VALIDATION_JOBS = 32
+
+# Name of operating conditions group in liberty file
+OPCOND_REGEX = re.compile(rb'operating_conditions\s*\(\s*"?([^"\)\s]*)"?\s*\)')
+
 
 def __load_pdk_config_file(pdk_cfg_path: str):
     """
@@ -62,42 +80,85 @@ def __concat_available_objects(objs: list, sep: str):
     return rv
 
 
-def mmap_size(filename):
+def __get_liberty_index_path() -> str:
     """
-    Returns True if given word in bytes is located in a file
-    :param filename: name of file
-    :param word : searched word in bytes
+    Returns path of liberty index in PDK cache.
     """
-    with open(filename, mode="r") as f:
-        with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as m:
-            return m.size()
+    return os.path.join(ts_get_root_rel_path(TsGlobals.TS_PDK_CACHE_DIR), "liberty_index.json")
+
+
+def __load_liberty_index() -> dict:
+    """
+    Loads index of operating conditions in liberty files from PDK cache (once per process).
+    :return: Index: liberty files by path, each with its size, mtime and operating conditions.
+    """
+    if TsGlobals.TS_LIBERTY_INDEX is None:
+        index = {"version": LIBERTY_INDEX_VERSION, "files": {}}
+        with contextlib.suppress(OSError, ValueError):
+            with open(__get_liberty_index_path()) as fd:
+                cached = json.load(fd)
+            if cached.get("version") == LIBERTY_INDEX_VERSION:
+                index = cached
+        index["dirty"] = False
+        TsGlobals.TS_LIBERTY_INDEX = index
+    return TsGlobals.TS_LIBERTY_INDEX
+
+
+def __store_liberty_index():
+    """
+    Stores index of operating conditions in liberty files to PDK cache if it changed.
+    """
+    index = TsGlobals.TS_LIBERTY_INDEX
+    if index is None or not index["dirty"]:
+        return
+    path = __get_liberty_index_path()
+    ts_debug(f"Storing liberty index: {path}")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fd:
+            json.dump({"version": index["version"], "files": index["files"]}, fd)
+        os.replace(tmp_path, path)
+        index["dirty"] = False
+    except OSError as e:
+        ts_warning(TsWarnCode.GENERIC, f"Liberty index not stored: {e}")
 
 
-def mmap_search_word(filename, word, index):
+def __scan_liberty_opconds(liberty: str) -> list:
     """
-    Returns True if given word in bytes is located in a file
-    :param filename: name of file
-    :param word : searched word in bytes
+    Extracts names of all operating conditions defined in liberty file in single pass.
+    :param liberty: Path to liberty file
+    :return: Names of operating conditions
     """
-    with open(filename, mode="r") as f:
+    ts_debug(f"Scanning operating conditions in: {liberty}")
+    with open(liberty, mode="rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
         with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as m:
-            m.seek(index)
-            return m.find(word)
+            return sorted(
+                set(match.group(1).decode("latin-1") for match in OPCOND_REGEX.finditer(m))
+            )
 
 
-def mmap_read_line(filename, index):
+def __get_liberty_opconds(liberty: str) -> list:
     """
-    Returns whole line from the file
-    :param filename: name of file
-    :param line : line int
+    Returns names of operating conditions defined in liberty file. Liberty file is scanned
+    only if it is not in liberty index or if its size or mtime changed.
+    :param liberty: Path to liberty file
     """
-    if index > 0:
-        with open(filename, mode="r") as f:
-            with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as m:
-                m.seek(index)
-                return str(m.readline())
-    else:
-        return str("")
+    index = __load_liberty_index()
+    path = os.path.realpath(liberty)
+    stat = os.stat(path)
+    entry = index["files"].get(path)
+    if entry is None or (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "opconds": __scan_liberty_opconds(path),
+        }
+        index["files"][path] = entry
+        index["dirty"] = True
+    return entry["opconds"]
 
 
 def __check_valid_opcond_corners(pdk_cfg: dict, obj: dict):
@@ -113,29 +174,13 @@ def __check_valid_opcond_corners(pdk_cfg: dict, obj: dict):
         liberty = obj.get("views", {}).get("nldm_lib", {}).get(corner, {})
         # check that definitions even exist
         if opcond and liberty:
-            # set limits
-            index_max = mmap_size(liberty)
-            # initialize
-            index = 0
-            check = None
-            # There could be several opcond definitions in a signle library file
-            # It is important to search thru a file until either opcond matching or end of file
-            while index < index_max:
-                # Check existance of operation conditions in a file - return character index (see method mmap.search())
-                index = mmap_search_word(
-                    liberty, bytes(f"operating_conditions", "utf-8"), index
-                )
-                # Return line as a string
-                line = str(mmap_read_line(liberty, index))
-                # Increase search character for mmap.seek() purpose - infinite looping problem
-                index = index + len(line)
-                regex = re.compile(f"{opcond}")
-                check = regex.search(line)
-                if check is not None or index < 0:
-                    # If opcond matchig the search - end it here, otherwise search thru a file
-                    # If operating_conditions not matching at all >> -1 of index value
-                    index = index_max
-            if check is None:
+            # There could be several opcond definitions in a single library file
+            opconds = __get_liberty_opconds(liberty)
+            if opcond in opconds:
+                continue
+            # Opcond is a pattern matching operating conditions name
+            regex = re.compile(f"{opcond}")
+            if not any(regex.search(name) for name in opconds):
                 ts_throw_error(TsErrCode.ERR_PDK_23, opcond, liberty)
 
 
@@ -158,13 +203,16 @@ def __check_valid_view_corners(pdk_cfg: dict, obj: dict):
                     )
 
 
-def __validate_views_exist(pdk_cfg: dict, obj: dict, pdk_cfg_path: str):
+def __validate_views_exist(pdk_cfg: dict, obj: dict, pdk_cfg_path: str) -> list:
     """
-    Expands paths to views relative to 'pdk_cfg_path' and checks that these view files exist.
+    Expands paths to views relative to 'pdk_cfg_path' and collects checks that these view files
+    exist. Checks are executed by '__check_views_exist'.
     :param pdk_cfg:
     :param obj:
     :param pdk_cfg_path:
+    :return: List of checks: path of view file and arguments of error reported if it is missing.
     """
+    checks = []
     for view_name, view in obj["views"].items():
         ts_debug("Checking view exists: {} for: {}".format(view_name, obj["name"]))
         if view_has_corner(view_name):
@@ -172,12 +220,13 @@ def __validate_views_exist(pdk_cfg: dict, obj: dict, pdk_cfg_path: str):
             # Check valid corners are referenced
             for corner_name, corner_path in view.items():
                 view[corner_name] = ts_get_file_rel_path(pdk_cfg_path, corner_path)
-                if not os.path.exists(view[corner_name]):
-                    ts_throw_error(
-                        TsErrCode.ERR_PDK_5,
+                checks.append(
+                    (
+                        view[corner_name],
                         "{}.{}.{}".format(pdk_cfg["name"], obj["name"], corner_name),
                         corner_path,
                     )
+                )
 
             # Check all corners are defined for all views which shall have corner
             for gold_corner in pdk_cfg["corners"]:
@@ -191,20 +240,32 @@ def __validate_views_exist(pdk_cfg: dict, obj: dict, pdk_cfg_path: str):
         elif type(view) == list:
             for i, item in enumerate(view):
                 view[i] = ts_get_file_rel_path(pdk_cfg_path, item)
-                if not os.path.exists(view[i]):
-                    ts_throw_error(
-                        TsErrCode.ERR_PDK_5,
-                        "{}.{}".format(pdk_cfg["name"], obj["name"]),
-                        item,
-                    )
+                checks.append(
+                    (view[i], "{}.{}".format(pdk_cfg["name"], obj["name"]), item)
+                )
         else:
             obj["views"][view_name] = ts_get_file_rel_path(pdk_cfg_path, view)
-            if not os.path.exists(obj["views"][view_name]):
-                ts_throw_error(
-                    TsErrCode.ERR_PDK_5,
+            checks.append(
+                (
+                    obj["views"][view_name],
                     "{}.{}".format(pdk_cfg["name"], obj["name"]),
                     view,
                 )
+            )
+    return checks
+
+
+def __check_views_exist(checks: list):
+    """
+    Checks that view files exist. Files are checked in parallel (file system may be remote),
+    first missing file (in order of checks) is reported.
+    :param checks: Checks collected by '__validate_views_exist'.
+    """
+    with ThreadPoolExecutor(PDK_VALIDATION_JOBS) as executor:
+        exists = list(executor.map(os.path.exists, [check[0] for check in checks]))
+    for (_, obj_name, view), view_exists in zip(checks, exists):
+        if not view_exists:
+            ts_throw_error(TsErrCode.ERR_PDK_5, obj_name, view)
 
 
 def __check_obj_duplicities(pdk, obj, obj_type, obj_type_name):
@@ -237,6 +298,7 @@ def __check_pdk_config_file(pdk_cfg_file: dict, path: str):
     # Check each PDK for valid semantic information
     pdk = pdk_cfg_file
     ts_info(TsInfoCode.INFO_PDK_4, pdk["name"])
+    view_checks = []
     for obj_type in ALLOWED_DESIGN_OBJ_TYPES:
         if obj_type in pdk:
             for obj in pdk[obj_type]:
@@ -252,29 +314,213 @@ def __check_pdk_config_file(pdk_cfg_file: dict, path: str):
                     ),
                 )
                 __check_valid_view_corners(pdk, obj)
-                __validate_views_exist(pdk, obj, path)
-                __check_valid_opcond_corners(pdk, obj)
+                view_checks.extend(__validate_views_exist(pdk, obj, path))
                 __check_obj_duplicities(pdk, obj, obj_type, obj_type_name)
 
+    __check_views_exist(view_checks)
+
+    # Liberty files are read only when they are known to exist
+    for obj_type in ALLOWED_DESIGN_OBJ_TYPES:
+        for obj in pdk.get(obj_type, []):
+            __check_valid_opcond_corners(pdk, obj)
+
+
+def __get_pdk_cfg_hash(pdk_cfg: dict, path: str) -> str:
+    """
+    Hash of PDK config file content (with expanded variables) and its location
+    (relative view paths are resolved against it).
+    :param pdk_cfg: Loaded PDK config file dictionary (not validated yet)
+    :param path: Path to the file
+    """
+    content = json.dumps([path, pdk_cfg], sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def __get_pdk_fingerprint_paths(pdk_cfg: dict) -> list:
+    """
+    Returns paths whose mtime fingerprints view files of validated PDK: directories of
+    all view files (their mtime changes when a view file is added, removed or renamed)
+    and liberty files (operating conditions are read from them).
+    :param pdk_cfg: Validated PDK config dictionary
+    """
+    paths = set()
+    for obj_type in ALLOWED_DESIGN_OBJ_TYPES:
+        for obj in pdk_cfg.get(obj_type, []):
+            for view_name, view in obj["views"].items():
+                if type(view) == dict:
+                    files = list(view.values())
+                elif type(view) == list:
+                    files = view
+                else:
+                    files = [view]
+                paths.update(os.path.dirname(f) for f in files)
+                if view_name == "nldm_lib":
+                    paths.update(files)
+    return sorted(paths)
+
+
+def __get_pdk_fingerprint(paths: list) -> dict:
+    """
+    Returns mtime of each path (None if path does not exist). Paths are checked in parallel.
+    :param paths: Paths returned by '__get_pdk_fingerprint_paths'
+    """
+
+    def __get_mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(PDK_VALIDATION_JOBS) as executor:
+        return dict(zip(paths, executor.map(__get_mtime, paths)))
+
+
+def __get_validated_pdk_path(path: str) -> str:
+    """
+    Returns path of validated PDK config in PDK cache.
+    :param path: Path to the PDK config file
+    """
+    name = hashlib.sha1(path.encode()).hexdigest()[:16]
+    return os.path.join(ts_get_root_rel_path(TsGlobals.TS_PDK_CACHE_DIR), f"validated_{name}.json")
+
+
+def __load_validated_pdk(cfg_hash: str, path: str):
+    """
+    Loads validated PDK config from PDK cache.
+    :param cfg_hash: Hash of PDK config file (see '__get_pdk_cfg_hash')
+    :param path: Path to the PDK config file
+    :return: Validated PDK config dictionary, None if it is not cached or PDK config file
+             or its view files changed since validation.
+    """
+    try:
+        with open(__get_validated_pdk_path(path)) as fd:
+            cached = json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get("version") != VALIDATED_PDK_VERSION or cached.get("hash") != cfg_hash:
+        ts_debug(f"PDK config changed since validation: {path}")
+        return None
+
+    fingerprint = cached["fingerprint"]
+    if __get_pdk_fingerprint(list(fingerprint.keys())) != fingerprint:
+        ts_debug(f"PDK view files changed since validation: {path}")
+        return None
+
+    return cached["cfg"]
+
+
+def __store_validated_pdk(pdk_cfg: dict, cfg_hash: str, path: str):
+    """
+    Stores validated PDK config to PDK cache.
+    :param pdk_cfg: Validated PDK config dictionary
+    :param cfg_hash: Hash of PDK config file (see '__get_pdk_cfg_hash')
+    :param path: Path to the PDK config file
+    """
+    cache_path = __get_validated_pdk_path(path)
+    ts_debug(f"Storing validated PDK config: {cache_path}")
+    cached = {
+        "version": VALIDATED_PDK_VERSION,
+        "path": path,
+        "hash": cfg_hash,
+        "fingerprint": __get_pdk_fingerprint(__get_pdk_fingerprint_paths(pdk_cfg)),
+        "cfg": pdk_cfg,
+    }
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fd:
+            json.dump(cached, fd, default=str)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        ts_warning(TsWarnCode.GENERIC, f"Validated PDK config not stored: {e}")
+
+
+def __get_pdk_names_path() -> str:
+    """
+    Returns path of PDK names index in PDK cache.
+    """
+    return os.path.join(ts_get_root_rel_path(TsGlobals.TS_PDK_CACHE_DIR), "pdk_names.json")
+
+
+def __load_pdk_names() -> dict:
+    """
+    Loads index of PDK names from PDK cache.
+    :return: Index: PDK config files by path, each with its size, mtime and PDK name.
+    """
+    with contextlib.suppress(OSError, ValueError):
+        with open(__get_pdk_names_path()) as fd:
+            cached = json.load(fd)
+        if cached.get("version") == PDK_NAMES_VERSION:
+            return cached["files"]
+    return {}
+
+
+def __store_pdk_names(files: dict):
+    """
+    Stores index of PDK names to PDK cache.
+    :param files: Index as returned by '__load_pdk_names'
+    """
+    path = __get_pdk_names_path()
+    ts_debug(f"Storing PDK names index: {path}")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fd:
+            json.dump({"version": PDK_NAMES_VERSION, "files": files}, fd)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        ts_warning(TsWarnCode.GENERIC, f"PDK names index not stored: {e}")
+
+
+def __get_pdk_name(path: str, names: dict):
+    """
+    Returns name of PDK in PDK config file without loading it when PDK names index is
+    up to date.
+    :param path: Path to the PDK config file
+    :param names: Index as returned by '__load_pdk_names', updated when the file changed.
+    :return: Tuple (PDK name, loaded PDK config file dictionary or None if not loaded)
+    """
+    st = os.stat(path)
+    entry = names.get(path)
+    if entry is not None and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["name"], None
+
+    pdk_cfg = __load_pdk_config_file(path)
+    name = pdk_cfg.get("name") if isinstance(pdk_cfg, dict) else None
+    names[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "name": name}
+    return name, pdk_cfg
+
+
+def __index_target_pdk(pdk_cfg: dict):
+    """
+    Builds index of standard cells and IPs of target PDK.
+    :param pdk_cfg: Validated PDK config dictionary
+    """
+    TsGlobals.TS_PDK_TARGET = pdk_cfg
+    TsGlobals.TS_PDK_OBJS = {
+        (obj_type, obj["name"], obj["version"]): obj
+        for obj_type in ALLOWED_DESIGN_OBJ_TYPES
+        for obj in pdk_cfg.get(obj_type, [])
+    }
+
 
 def __check_pdk_exists(pdk_name: str):
     """ """
-    ts_debug("Checking PDK: '{}' exists.")
-    for pdk in TsGlobals.TS_PDK_CFGS:
-        if pdk["name"] == pdk_name:
-            ts_debug("PDK: '{}' found.")
-            return
+    ts_debug("Checking PDK: '{}' exists.".format(pdk_name))
+    if TsGlobals.TS_PDK_TARGET is not None:
+        ts_debug("PDK: '{}' found.".format(pdk_name))
+        return
 
     ts_throw_error(
-        TsErrCode.ERR_PDK_6, pdk_name, concat_keys(TsGlobals.TS_PDK_CFGS, "name", "','")
+        TsErrCode.ERR_PDK_6, pdk_name, "','".join(str(x) for x in TsGlobals.TS_PDK_NAMES)
     )
 
 
 def __get_target_pdk():
     """ """
-    for pdk in TsGlobals.TS_PDK_CFGS:
-        if pdk["name"] == TsGlobals.TS_DESIGN_CFG["design"]["pdk"]:
-            return pdk
+    if TsGlobals.TS_PDK_TARGET is not None:
+        return TsGlobals.TS_PDK_TARGET
     ts_script_bug(
         "Unknown PDK '{}' to obtain. Did you load PDK config properly?".format(
             TsGlobals.TS_DESIGN_CFG["design"]["name"]
@@ -321,19 +567,13 @@ def __check_std_cells_valid():
     std_cells_version = list(cells.values())[0]
     target_pdk_name = TsGlobals.TS_DESIGN_CFG["design"]["pdk"]
 
-    for pdk in TsGlobals.TS_PDK_CFGS:
-        if pdk["name"] == target_pdk_name:
-            for std_cell in pdk["std_cells"]:
-                if (
-                    std_cell["name"] == std_cells_name
-                    and std_cell["version"] == std_cells_version
-                ):
-                    ts_debug(
-                        "Standard cells '{}' version '{}' checked OK".format(
-                            std_cells_name, std_cells_version
-                        )
-                    )
-                    return
+    if ("std_cells", std_cells_name, std_cells_version) in TsGlobals.TS_PDK_OBJS:
+        ts_debug(
+            "Standard cells '{}' version '{}' checked OK".format(
+                std_cells_name, std_cells_version
+            )
+        )
+        return
 
     ts_throw_error(
         TsErrCode.ERR_PDK_7,
@@ -354,15 +594,7 @@ def __check_used_ips_valid():
             if "ips" not in tgt_pdk:
                 ts_throw_error(TsErrCode.ERR_PDK_9, ip_name, tgt_pdk["name"])
 
-            found = False
-            for available_ip in tgt_pdk["ips"]:
-                if (
-                    available_ip["name"] == ip_name
-                    and available_ip["version"] == ip_version
-                ):
-                    found = True
-
-            if not found:
+            if ("ips", ip_name, ip_version) not in TsGlobals.TS_PDK_OBJS:
                 ts_throw_error(
                     TsErrCode.ERR_PDK_8,
                     ip_name,
@@ -432,6 +664,7 @@ def __filter_modes_usage(flow_type):
             tmp.append(TsGlobals.TS_DESIGN_CFG["design"]["modes"][i])
     if tmp:
         TsGlobals.TS_DESIGN_CFG["design"]["modes"] = tmp.copy()
+        TsGlobals.TS_MODES_BY_CORNER = None
         ts_debug("Filtered modes {}".format(TsGlobals.TS_DESIGN_CFG["design"]["modes"]))
 
 
@@ -502,20 +735,59 @@ def check_design_config_file_grammar(design_cfg_file: dict, path: str):
         ts_throw_error(TsErrCode.ERR_PDK_2, e, path)
 
 
-def load_pdk_configs():
+def load_pdk_configs(revalidate: bool = False, all_pdks: bool = False):
     """
-    Walk through PDK configs in design config files and loads them
+    Walk through PDK configs in design config files and loads them. Only PDK referenced
+    by design config file is loaded unless 'all_pdks' is set, names of PDKs in the other
+    PDK config files are taken from PDK cache. PDK configs validated by previous runs are
+    loaded from PDK cache unless they or their view files changed.
+    :param revalidate: Validate PDK configs even if they are cached.
+    :param all_pdks: Load and validate all PDK configs (e.g. to list them).
     """
+    target_pdk_name = TsGlobals.TS_DESIGN_CFG["design"]["pdk"]
+    names = __load_pdk_names()
+    names_changed = False
+
+    TsGlobals.TS_PDK_CFGS = []
+    TsGlobals.TS_PDK_NAMES = []
+    TsGlobals.TS_PDK_TARGET = None
+    TsGlobals.TS_PDK_OBJS = {}
+
     for pdk in TsGlobals.TS_DESIGN_CFG["pdk_configs"]:
 
         full_path = ts_get_root_rel_path(pdk)
         if not os.path.exists(full_path):
             ts_throw_error(TsErrCode.ERR_PDK_3, full_path)
 
-        pdk_cfg = __load_pdk_config_file(full_path)
-        __check_pdk_config_file(pdk_cfg, full_path)
+        # PDK config file is loaded only when PDK names index is out of date
+        pdk_name, pdk_cfg = __get_pdk_name(full_path, names)
+        names_changed |= pdk_cfg is not None
+        TsGlobals.TS_PDK_NAMES.append(pdk_name)
+
+        is_target = pdk_name == target_pdk_name and TsGlobals.TS_PDK_TARGET is None
+        if not (is_target or all_pdks):
+            ts_debug(f"Skipping PDK config file of PDK '{pdk_name}': {full_path}")
+            continue
+
+        if pdk_cfg is None:
+            pdk_cfg = __load_pdk_config_file(full_path)
+        cfg_hash = __get_pdk_cfg_hash(pdk_cfg, full_path)
+
+        validated_cfg = None if revalidate else __load_validated_pdk(cfg_hash, full_path)
+        if validated_cfg is None:
+            __check_pdk_config_file(pdk_cfg, full_path)
+            __store_validated_pdk(pdk_cfg, cfg_hash, full_path)
+        else:
+            ts_info(TsInfoCode.INFO_PDK_6, validated_cfg["name"])
+            pdk_cfg = validated_cfg
 
         TsGlobals.TS_PDK_CFGS.append(pdk_cfg)
+        if is_target:
+            __index_target_pdk(pdk_cfg)
+
+    if names_changed:
+        __store_pdk_names(names)
+    __store_liberty_index()
 
 
 def validate_design_config_file():
@@ -47,6 +47,7 @@ from .ts_hw_logging import (
     ts_throw_error,
     ts_warning,
 )
+from .ts_hw_release import release_flow
 
 
 def dft_logging(args):
@@ -71,6 +72,10 @@ def set_dft_global_vars(args):
     """
     Set DFT flow global variables
     """
+    # Setting the netlist (before runcode directory is allocated, netlist may be missing)
+    if not args.open_result:
+        TsGlobals.TS_DFT_NETLIST = __dft_netlist_selection(args)
+
     # Check runcode validity and update it if the _n+1 rule is applicable
     # Set synthesis run dir according to runcode
     TsGlobals.TS_DFT_RUNCODE = get_dft_runcode(args, get_dft_rootdir(args))
@@ -104,10 +109,6 @@ def set_dft_global_vars(args):
     TsGlobals.TS_DFT_SRC_RTL_FILE = os.path.join(
         TsGlobals.TS_DFT_RUN_DIR, TsGlobals.TS_DFT_SRC_RTL_FILE
     )
-    # Setting the netlist
-    if not args.open_result:
-        TsGlobals.TS_DFT_NETLIST = __dft_netlist_selection(args)
-
     # DFT setup file path
     TsGlobals.TS_DFT_SETUP_FILE = os.path.join(
         TsGlobals.TS_DFT_RUN_DIR, TsGlobals.TS_DFT_SETUP_FILE
@@ -150,7 +151,7 @@ def __dft_netlist_selection(args):
         and args.source_data in TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"]
     ):
         # Use default netlist location from flow_dirs/results/<design_name>.v
-        path = f'{ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{TsGlobals.TS_DFT_RUNCODE}/results/{str(ts_get_design_top()).lower()}.v'
+        path = f'{ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{args.runcode}/results/{str(ts_get_design_top()).lower()}.v'
     else:
         return None
 
@@ -635,25 +636,11 @@ def dft_lint_spyglass_open_design(args):
 
 
 
-def dft_release(source_dir, release_dir, flow_dir_type):
+def dft_release(source_dir, release_dir, flow_dir_type, mode="auto"):
     """
-    Hard-copy data from source directory to release directory
+    Release reports, logs and results from source directory to release directory.
+    Unchanged files are skipped, other files are linked or copied (see 'release_flow').
     """
     if source_dir is not release_dir:
-        os.makedirs(release_dir, exist_ok=True)
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_REPORTS_DIR"),
-            f"{release_dir}/reports",
-            dirs_exist_ok=True,
-        )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_LOGS_DIR"),
-            f"{release_dir}/logs",
-            dirs_exist_ok=True,
-        )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_RESULTS_DIR"),
-            f"{release_dir}/results",
-            dirs_exist_ok=True,
-        )
+        release_flow(flow_dir_type, release_dir, mode)
         ts_print("Release is done!", color=TsColors.PURPLE, big=True)
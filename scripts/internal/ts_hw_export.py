@@ -6,6 +6,8 @@
 # For license see LICENSE file in repository root.
 ####################################################################################################
 
+import hashlib
+import io
 import os
 
 from .ts_grammar import ALLOWED_DESIGN_OBJ_TYPES
@@ -19,7 +21,10 @@ from .ts_hw_common import (
     view_has_corner,
 )
 from .ts_hw_global_vars import TsGlobals
-from .ts_hw_logging import TsErrCode, TsWarnCode, ts_throw_error, ts_warning
+from .ts_hw_logging import TsErrCode, TsWarnCode, ts_debug, ts_throw_error, ts_warning
+
+# First line of exported file, followed by hash of exported content
+EXPORT_HASH_PREFIX = "# ts-hw-scripts export hash: "
 
 
 def __append_do_not_modify(lines: list):
@@ -111,28 +116,52 @@ def __get_design_config_header(views: list, args) -> list:
     return lines
 
 
+def __write_export_file(path: str, content: str):
+    """
+    Writes exported file unless it already has given content, so that its mtime changes
+    only when design config, PDK views, source list or arguments change the export.
+    Hash of the content is stored in the first line of the file. The file is replaced
+    atomically so that concurrent flows never read partially written file.
+    :param path: Path to the exported file
+    :param content: Exported content
+    """
+    hash_line = EXPORT_HASH_PREFIX + hashlib.sha256(content.encode()).hexdigest() + "\n"
+    try:
+        with open(path) as f:
+            if f.readline() == hash_line:
+                ts_debug(f"Exported file is up to date: {path}")
+                return
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(hash_line)
+            f.write(content)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        ts_throw_error(TsErrCode.GENERIC, f"Failed to export '{path}': {e}")
+
+
 def __write_syn_rtl_file(lines: list, tcl_file: str, tool: str):
     """
     Export TCL file
     """
-    with open(ts_get_curr_dir_rel_path(tcl_file), "w") as f:
-        __add_newline = lambda x: x + "\n"
-        # write header
-        f.writelines(map(__add_newline, __get_syn_rtl_header(tool)))
-        # write body
-        f.writelines(map(__add_newline, lines))
+    __add_newline = lambda x: x + "\n"
+    content = "".join(map(__add_newline, __get_syn_rtl_header(tool) + lines))
+    __write_export_file(ts_get_curr_dir_rel_path(tcl_file), content)
 
 
 def __write_lint_src_file(lines: list, tcl_file: str, tool: str):
     """
     Export file
     """
-    with open(ts_get_curr_dir_rel_path(tcl_file), "w") as f:
-        __add_newline = lambda x: x + "\n"
-        # write header
-        # f.writelines(map(__add_newline, __get_spyglass_rtl_header(tool)))
-        # write body
-        f.writelines(map(__add_newline, lines))
+    __add_newline = lambda x: x + "\n"
+    content = "".join(map(__add_newline, lines))
+    __write_export_file(ts_get_curr_dir_rel_path(tcl_file), content)
 
 
 def export_dc_tcl(tcl_file: str):
@@ -214,7 +243,7 @@ def export_dc_tcl(tcl_file: str):
                     for name, val in defines
                 ]
                 if defines:
-                    file_cmd.append(f"-define {{{' '.join(defines)}}} \\\n")
+                    file_cmd.append(f"-define {{{' '.join(sorted(defines))}}} \\\n")
 
                 included_dirs = set()
                 # sim cfg file include_dirs
@@ -228,7 +257,7 @@ def export_dc_tcl(tcl_file: str):
                 # src list file include_dirs
                 included_dirs.update(__get_included_dirs(source_file))
                 if included_dirs:
-                    file_cmd.append(f"-vcs +incdir+{'+'.join(included_dirs)} \\\n")
+                    file_cmd.append(f"-vcs +incdir+{'+'.join(sorted(included_dirs))} \\\n")
 
             file_cmd.append(f"{source_file['full_path']}\n\n")
 
@@ -462,9 +491,9 @@ def export_spyglass_src_file(tcl_file: str):
             lines.append(f"read_file -type hdl {source_file['full_path']}")
             lines_sub.append(source_file["full_path"])
         if defines:
-            lines.append(f"set_option define \"{' '.join(defines)}\" \n")
+            lines.append(f"set_option define \"{' '.join(sorted(defines))}\" \n")
         if included_dirs:
-            lines.append(f"set_option incdir \"{' '.join(included_dirs)}\" \n")
+            lines.append(f"set_option incdir \"{' '.join(sorted(included_dirs))}\" \n")
         lines.append(f"set_option libhdlfiles {lib} \"{' '.join(lines_sub)}\" \n")
 
     __write_lint_src_file(lines, tcl_file, "spyglass")
@@ -884,7 +913,7 @@ def __export_flow_dirs(fd):
 
 def export_design_config(path: str, args, enforce_views=[]):
     """ """
-    fd = open(path, "w")
+    fd = io.StringIO()
     __add_newline = lambda x: x + "\n"
 
     # write header
@@ -951,4 +980,4 @@ def export_design_config(path: str, args, enforce_views=[]):
     if args.add_opcond:
         __export_opcond_with_corners(fd)
 
-    fd.close()
+    __write_export_file(path, fd.getvalue())
@@ -66,9 +66,30 @@ class TsGlobals:
     # Test list - All available tests
     TS_TEST_LIST = None
 
+    # Test definitions - Read-only views of all available tests, by test name
+    TS_TEST_DEFS = None
+
     # Test list - All tests to be run in a single ts_sim_run.py/ts_sim_regress.py run
     TS_TEST_RUN_LIST = None
 
+    # Build metadata of simulated target (Dictionary from target manifest)
+    TS_SIM_TARGET_MANIFEST = None
+
+    # Simulation run context - Configuration snapshot shared with worker processes
+    TS_SIM_RUN_CONTEXT = None
+
+    # Profiling - Trace file path (profiling disabled if None) and recorded events
+    TS_PROFILE_FILE = None
+    TS_PROFILE_EVENTS = []
+
+    # Resource usage of last command executed by 'exec_cmd_in_dir' in batch mode
+    TS_LAST_CMD_USAGE = None
+
+    # Metrics - Output files and collected metrics (collection disabled if None)
+    TS_METRICS_FILE = None
+    TS_METRICS_PROM_FILE = None
+    TS_METRICS = None
+
     # Maximal depth supported for list files nesting (before throwing exception on circular
     # dependency)
     MAX_LIST_FILE_DEPTH = 10
@@ -85,6 +106,30 @@ class TsGlobals:
     # List of PDK configurations loaded
     TS_PDK_CFGS = []
 
+    # Names of PDKs available in PDK config files (loaded or not)
+    TS_PDK_NAMES = []
+
+    # PDK referenced by design config file
+    TS_PDK_TARGET = None
+
+    # Standard cells and IPs of target PDK by (object type, name, version)
+    TS_PDK_OBJS = {}
+
+    # First design mode of each used corner (in order of design modes)
+    TS_MODES_BY_CORNER = None
+
+    # Cache of PDK checks (relative to repository root)
+    TS_PDK_CACHE_DIR = os.path.join(".ts_cache", "pdk")
+
+    # QoR database of flow reports (relative to repository root)
+    TS_QOR_DB_FILE = os.path.join(".ts_cache", "qor.db")
+
+    # Next runcode suffixes of flow (relative to directory with run directories)
+    TS_RUNCODES_DIR = ".ts_runcodes"
+
+    # Index of operating conditions in liberty files (loaded from PDK cache)
+    TS_LIBERTY_INDEX = None
+
     # List of PDK views to be exported
     TS_EXP_VIEWS = []
 
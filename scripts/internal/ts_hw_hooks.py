@@ -6,11 +6,20 @@
 # For license see LICENSE file in repository root.
 ####################################################################################################
 
+import importlib
+import importlib.util
 import os
+import re
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Optional
 
 from .ts_hw_common import exec_cmd_in_dir, ts_get_cfg, ts_get_root_rel_path
+from .ts_hw_global_vars import TsGlobals
 from .ts_hw_logging import TsErrCode, TsInfoCode, ts_debug, ts_info, ts_throw_error
+from .ts_hw_profile import ts_span
 
 
 class TsHooks(str, Enum):
@@ -26,12 +35,94 @@ class TsHooks(str, Enum):
     POST_CHECK = "post_check_hook"
 
 
-def __call_hook(hook: TsHooks, root_dict: dict, *args):
+# Python hook reference: "package.module:function" or "path/to/file.py:function"
+__PYTHON_HOOK_REGEX = re.compile(r"^(?P<module>[\w./$-]+):(?P<function>[A-Za-z_]\w*)$")
+
+
+@dataclass(frozen=True)
+class TsHookContext:
+    """
+    Context passed to Python hooks.
+    """
+
+    # Hook keyword (e.g. "pre_test_hook")
+    hook: str
+    # Arguments passed to shell hooks
+    args: tuple = ()
+    # Test object (test name, seed, loop index and test definition)
+    test: Optional[Mapping] = None
+    seed: Optional[int] = None
+    loop: Optional[int] = None
+    # Simulation log file (post-test hook)
+    log_file: Optional[str] = None
+    # Result of the run (post-check hook: number of failed tests)
+    result: Any = None
+    # Simulation configuration
+    cfg: Mapping = field(default_factory=dict, repr=False)
+
+
+@lru_cache(maxsize=None)
+def __load_python_hook(hook_ref: str) -> Callable:
+    """
+    Imports Python hook. Each hook is imported only once.
+    :param hook_ref: "package.module:function" or "path/to/file.py:function". Modules are
+                     searched in $TS_REPO_ROOT, file paths are relative to $TS_REPO_ROOT.
+    """
+    module_ref, function_name = hook_ref.rsplit(":", 1)
+    try:
+        if module_ref.endswith(".py"):
+            module_path = ts_get_root_rel_path(module_ref)
+            module_name = f"ts_hook_{os.path.splitext(os.path.basename(module_path))[0]}"
+            spec = importlib.util.spec_from_file_location(module_name, module_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        else:
+            repo_root = os.environ[TsGlobals.TS_REPO_ROOT]
+            if repo_root not in sys.path:
+                sys.path.append(repo_root)
+            module = importlib.import_module(module_ref)
+        return getattr(module, function_name)
+    except (ImportError, OSError, AttributeError) as e:
+        ts_throw_error(TsErrCode.ERR_HOK_1, hook_ref, e)
+
+
+def __is_python_hook(hook_ref: str) -> bool:
+    """
+    :param hook_ref: Value of hook keyword
+    :return: True if hook is Python hook reference, False if it is shell hook.
+    """
+    match = __PYTHON_HOOK_REGEX.match(hook_ref)
+    return match is not None and (
+        match["module"].endswith(".py") or "/" not in match["module"]
+    )
+
+
+def __call_python_hook(hook_type: str, hook_ref: str, args: tuple, context: dict):
+    """
+    Calls Python hook in-process.
+    :param hook_type: Hook keyword
+    :param hook_ref: Python hook reference
+    :param args: Arguments passed to shell hooks
+    :param context: Additional context of the hook (see TsHookContext)
+    """
+    hook_function = __load_python_hook(hook_ref)
+    ctx = TsHookContext(hook=hook_type, args=args, cfg=ts_get_cfg(), **context)
+    try:
+        ret_val = hook_function(ctx)
+    except Exception as e:
+        ts_throw_error(TsErrCode.ERR_HOK_2, hook_ref, hook_type, repr(e))
+    # Hook fails by returning False or non-zero exit code
+    if ret_val is False or (type(ret_val) is int and ret_val != 0):
+        ts_throw_error(TsErrCode.ERR_HOK_2, hook_ref, hook_type, f"returned {ret_val}")
+
+
+def __call_hook(hook: TsHooks, root_dict: dict, *args, **context):
     """
     Internal hook call function.
     :param hook: Type of hook
     :param root_dict: Configuration dictionary which contains the hook keyword.
     :param args: Optional arguments to be passed to hook if specified.
+    :param context: Context passed to Python hooks (see TsHookContext).
     """
     hook_type = hook.value
     ts_debug(f"Attempting to run hook: '{hook_type}'")
@@ -47,6 +138,20 @@ def __call_hook(hook: TsHooks, root_dict: dict, *args):
     ts_info(TsInfoCode.INFO_HOK_0, hook_type)
     ts_debug(root_dict)
 
+    with ts_span(hook_type):
+        if __is_python_hook(hook_path):
+            __call_python_hook(hook_type, hook_path, args, context)
+        else:
+            __run_hook(hook_type, hook_path, *args)
+
+
+def __run_hook(hook_type: str, hook_path: str, *args):
+    """
+    Executes hook.
+    :param hook_type: Hook keyword
+    :param hook_path: Hook script or bash command
+    :param args: Optional arguments to be passed to hook script.
+    """
     abs_hook_path = ts_get_root_rel_path(hook_path)
 
     # If hook does not exist, try to execute it on system console
@@ -72,22 +177,24 @@ def __call_hook(hook: TsHooks, root_dict: dict, *args):
         )
 
 
-def ts_call_global_hook(hook: TsHooks, *args):
+def ts_call_global_hook(hook: TsHooks, *args, **context):
     """
     Call hook in simulation scripting system.
     :param hook: Type of hook.
     :param args: Optional arguments to be passed to hook if specified.
+    :param context: Context passed to Python hooks (see TsHookContext).
     """
     ts_debug("Calling global hook")
-    __call_hook(hook, ts_get_cfg(), *args)
+    __call_hook(hook, ts_get_cfg(), *args, **context)
 
 
-def ts_call_local_hook(hook: TsHooks, local_dict: dict, *args):
+def ts_call_local_hook(hook: TsHooks, local_dict: dict, *args, **context):
     """
     Call hook in simulation scripting system.
     :param hook: Type of hook
     :param local_dict: Local dictionary with hook keyword in it.
     :param args: Optional arguments to be passed to hook if specified.
+    :param context: Context passed to Python hooks (see TsHookContext).
     """
     ts_debug("Calling local hook")
-    __call_hook(hook, local_dict, *args)
+    __call_hook(hook, local_dict, *args, **context)
@@ -143,6 +143,10 @@ class TsErrCode(TsCode):
         "Elaboration can not be executed because simulator specificfile '%s' "
         "created during compilation was not found! Are you sure you did not erase it by mistake?"
     )
+    ERR_ELB_4 = (
+        "Target manifest '%s' is missing or corrupted (%s). The build directory was probably "
+        "compiled by an older flow. Run 'ts_sim_compile.py' to re-create it!"
+    )
 
     # Simulation errors
     ERR_SIM_0 = "Simulation binary '%s' does not exist. Make sure that elaboration finished successfully!"
@@ -150,6 +154,8 @@ class TsErrCode(TsCode):
 
     # Hook errors
     ERR_HOK_0 = "Hook '%s' does not exist, or it failed when executing for hook: %s"
+    ERR_HOK_1 = "Python hook '%s' can not be loaded: %s"
+    ERR_HOK_2 = "Python hook '%s' failed when executing for hook '%s': %s"
 
     # PDK config file errors
     ERR_PDK_0 = "PDK config file '%s' is invalid. \n %s"
@@ -207,8 +213,9 @@ class TsErrCode(TsCode):
     ERR_STA_3 = "Source --source %s is not matching flow_dirs"
     ERR_STA_4 = "Netlist %s was not found"
     ERR_STA_5 = "Mode %s was not found"
-    ERR_STA_6 = "Either --dmsa or --mode <mode_name> must be used."
+    ERR_STA_6 = "Either --dmsa, --mode <mode_name> or --modes <mode_names> must be used."
     ERR_STA_7 = "Switch --open-result shall not be used with --dmsa switch."
+    ERR_STA_8 = "Switch --%s shall not be used with --modes switch."
 
     # DFT error messages
     ERR_DFT_0 = "Missing runcode parameter"
@@ -292,6 +299,7 @@ class TsInfoCode(TsCode):
     INFO_PDK_3 = "Design configuration OK!"
     INFO_PDK_4 = "Loading PDK: %s"
     INFO_PDK_5 = "Exporting design configuration to: '%s'"
+    INFO_PDK_6 = "PDK '%s' already validated, using PDK cache"
 
     # PWR info messages
     INFO_PWR_0 = "Loading Power configuration file: '%s'"
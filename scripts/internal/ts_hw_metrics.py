@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Machine-readable metrics of simulation flow
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import atexit
+import json
+import os
+import time
+
+from .ts_hw_global_vars import TsGlobals
+from .ts_hw_logging import TsInfoCode, ts_info
+
+# Version of metrics file format. Increment when format changes!
+__METRICS_VERSION = 1
+
+
+def __new_metrics() -> dict:
+    """
+    Empty metrics: counters and metrics of tests by test name and seed.
+    """
+    return {"counters": {}, "tests": {}}
+
+
+def ts_metrics_init(metrics_file: str, prom_file: str = ""):
+    """
+    Enables metrics collection in main process. Metrics are exported when the script exits.
+    :param metrics_file: Path of JSON metrics file.
+    :param prom_file: Path of Prometheus textfile.
+    Collection is disabled if both paths are empty.
+    """
+    if not metrics_file and not prom_file:
+        return
+    TsGlobals.TS_METRICS_FILE = os.path.abspath(metrics_file) if metrics_file else None
+    TsGlobals.TS_METRICS_PROM_FILE = os.path.abspath(prom_file) if prom_file else None
+    TsGlobals.TS_METRICS = __new_metrics()
+    TsGlobals.TS_METRICS["start_time"] = time.time()
+    atexit.register(ts_metrics_export)
+
+
+def ts_metrics_init_worker():
+    """
+    Enables metrics collection in worker process. Collected metrics are sent to main
+    process by 'ts_metrics_pop'.
+    """
+    TsGlobals.TS_METRICS = __new_metrics()
+
+
+def ts_metrics_count(counter: str, value=1):
+    """
+    Increments counter.
+    :param counter: Name of the counter
+    :param value: Increment
+    """
+    if TsGlobals.TS_METRICS is None:
+        return
+    counters = TsGlobals.TS_METRICS["counters"]
+    counters[counter] = counters.get(counter, 0) + value
+
+
+def ts_metrics_record_test(test, phase: str, **values):
+    """
+    Records metrics of a test phase.
+    :param test: Test object (with name and seed)
+    :param phase: Phase of the test (e.g. "elab", "sim")
+    :param values: Metrics of the phase
+    """
+    if TsGlobals.TS_METRICS is None:
+        return
+    record = TsGlobals.TS_METRICS["tests"].setdefault(
+        f"{test['name']}:{test['seed']}", {"test": test["name"], "seed": test["seed"]}
+    )
+    record.setdefault(phase, {}).update(values)
+
+
+def ts_metrics_record_cmd(test, phase: str, **values):
+    """
+    Records resource usage of last executed command as metrics of a test phase.
+    :param test: Test object (with name and seed)
+    :param phase: Phase of the test (e.g. "elab", "sim")
+    :param values: Additional metrics of the phase
+    """
+    if TsGlobals.TS_METRICS is None:
+        return
+    ts_metrics_record_test(test, phase, **(TsGlobals.TS_LAST_CMD_USAGE or {}), **values)
+
+
+def ts_metrics_pop():
+    """
+    Returns metrics collected by worker process and resets them.
+    """
+    metrics = TsGlobals.TS_METRICS
+    if metrics is not None:
+        TsGlobals.TS_METRICS = __new_metrics()
+    return metrics
+
+
+def ts_metrics_merge(metrics):
+    """
+    Merges metrics collected by worker process (see 'ts_metrics_pop').
+    :param metrics: Metrics returned by worker process, None if collection was disabled.
+    """
+    if TsGlobals.TS_METRICS is None or metrics is None:
+        return
+    for counter, value in metrics["counters"].items():
+        ts_metrics_count(counter, value)
+    tests = TsGlobals.TS_METRICS["tests"]
+    for key, record in metrics["tests"].items():
+        merged = tests.setdefault(key, {"test": record["test"], "seed": record["seed"]})
+        for phase, values in record.items():
+            if isinstance(values, dict):
+                merged.setdefault(phase, {}).update(values)
+
+
+def __prom_labels(**labels) -> str:
+    """
+    Formats Prometheus sample labels.
+    """
+    escape = lambda x: str(x).replace("\\", "\\\\").replace('"', '\\"')
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+def __get_prometheus_text(metrics: dict) -> str:
+    """
+    Converts metrics to Prometheus text exposition format.
+    :param metrics: Exported metrics
+    """
+    lines = [
+        "# TYPE ts_sim_run_wall_seconds gauge",
+        f"ts_sim_run_wall_seconds {metrics['wall_time']}",
+    ]
+    for counter, value in sorted(metrics["counters"].items()):
+        lines.append(f"# TYPE ts_sim_{counter} gauge")
+        lines.append(f"ts_sim_{counter} {value}")
+
+    for name, key in (
+        ("wall_seconds", "wall_time"),
+        ("cpu_seconds", "cpu_time"),
+        ("max_rss_bytes", "max_rss"),
+        ("queue_seconds", "queue_time"),
+        ("exit_code", "exit_code"),
+    ):
+        samples = [
+            f"ts_sim_test_{name}{{{__prom_labels(test=t['test'], seed=t['seed'], phase=p)}}} "
+            f"{values[key]}"
+            for t in metrics["tests"]
+            for p, values in t.items()
+            if isinstance(values, dict) and values.get(key) is not None
+        ]
+        if samples:
+            lines.append(f"# TYPE ts_sim_test_{name} gauge")
+            lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def __write_atomic(path: str, content: str):
+    """
+    Writes file via temporary file so that readers never see partial content.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as fd:
+        fd.write(content)
+    os.replace(tmp_path, path)
+
+
+def ts_metrics_export():
+    """
+    Exports collected metrics to JSON file and/or Prometheus textfile.
+    """
+    if TsGlobals.TS_METRICS is None:
+        return
+
+    metrics = {
+        "version": __METRICS_VERSION,
+        "target": (TsGlobals.TS_SIM_CFG or {}).get("target"),
+        "start_time": TsGlobals.TS_METRICS["start_time"],
+        "wall_time": time.time() - TsGlobals.TS_METRICS["start_time"],
+        "counters": TsGlobals.TS_METRICS["counters"],
+        "tests": list(TsGlobals.TS_METRICS["tests"].values()),
+    }
+
+    if TsGlobals.TS_METRICS_FILE:
+        __write_atomic(TsGlobals.TS_METRICS_FILE, json.dumps(metrics, indent=4))
+        ts_info(TsInfoCode.GENERIC, f"Metrics stored in '{TsGlobals.TS_METRICS_FILE}'")
+
+    # Prometheus textfile collector requires atomic replacement of the file
+    if TsGlobals.TS_METRICS_PROM_FILE:
+        __write_atomic(TsGlobals.TS_METRICS_PROM_FILE, __get_prometheus_text(metrics))
+        ts_info(
+            TsInfoCode.GENERIC, f"Metrics stored in '{TsGlobals.TS_METRICS_PROM_FILE}'"
+        )
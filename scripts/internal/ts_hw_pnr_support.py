@@ -14,7 +14,7 @@ import shutil
 import subprocess
 from datetime import datetime
 
-from .ts_hw_cfg_parser import parse_runcode_arg
+from .ts_hw_cfg_parser import parse_runcode_arg_root_dir
 from .ts_hw_common import (
     get_env_var_path,
     get_repo_root_path,
@@ -32,6 +32,7 @@ from .ts_hw_logging import (
     ts_info,
     ts_print,
 )
+from .ts_hw_release import release_flow
 
 
 def set_pnr_global_vars(args):
@@ -39,7 +40,7 @@ def set_pnr_global_vars(args):
     Set pnr flow python TsGlobals variables
     """
     # Check runcode validity and update it if the _n+1 rule is applicable
-    TsGlobals.TS_PNR_RUNCODE = parse_runcode_arg(args)
+    TsGlobals.TS_PNR_RUNCODE = parse_runcode_arg_root_dir(args, f"{get_repo_root_path()}/pnr")
     # Set PNR run dir according to runcode
     TsGlobals.TS_PNR_RUN_DIR = get_pnr_rundir(TsGlobals.TS_PNR_RUNCODE)
     # Set PNR dirs for purpose of the run
@@ -542,7 +543,7 @@ def __pnr_netlist_selection(args):
         path = f"{ts_get_root_rel_path(args.netlist)}"
     else:
         # Use default netlist location from flow_dirs/results/<design_name>.v
-        path = f'{ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{TsGlobals.TS_PNR_RUNCODE}/results/{str(ts_get_design_top()).lower()}.v'
+        path = f'{ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{args.runcode}/results/{str(ts_get_design_top()).lower()}.v'
 
     if os.path.isfile(path):
         return path
@@ -605,25 +606,11 @@ def pnr_open_design(args):
         run_file.writelines(lines)
 
 
-def release(source_dir, release_dir, flow_dir_type):
+def release(source_dir, release_dir, flow_dir_type, mode="auto"):
     """
-    Hard-copy data from source directory to release directory
+    Release reports, logs and results from source directory to release directory.
+    Unchanged files are skipped, other files are linked or copied (see 'release_flow').
     """
     if source_dir is not release_dir:
-        os.makedirs(release_dir, exist_ok=True)
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_REPORTS_DIR"),
-            f"{release_dir}/reports",
-            dirs_exist_ok=True,
-        )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_LOGS_DIR"),
-            f"{release_dir}/logs",
-            dirs_exist_ok=True,
-        )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_RESULTS_DIR"),
-            f"{release_dir}/results",
-            dirs_exist_ok=True,
-        )
+        release_flow(flow_dir_type, release_dir, mode)
         ts_print("Release is done!", TsColors.PURPLE, big=True)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Timing instrumentation of flow phases
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import atexit
+import contextlib
+import glob
+import json
+import os
+import shutil
+import time
+
+from .ts_hw_global_vars import TsGlobals
+from .ts_hw_logging import TsColors, TsInfoCode, ts_info, ts_print
+
+# Returned by 'ts_span' when profiling is disabled
+__NULL_SPAN = contextlib.nullcontext()
+
+
+class TsSpan:
+    """
+    Span of a flow phase. Recorded when span is exited.
+    """
+
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.time_ns()
+        return self
+
+    def __exit__(self, *exc):
+        ts_profile_event(self.name, self.start, time.time_ns(), **self.args)
+        return False
+
+
+def __get_parts_dir() -> str:
+    """
+    Directory where worker processes store their events.
+    """
+    return f"{TsGlobals.TS_PROFILE_FILE}.parts"
+
+
+def ts_profile_init(profile_file: str):
+    """
+    Enables profiling in main process. Trace is exported when the script exits.
+    :param profile_file: Path of trace file. Profiling is disabled if empty.
+    """
+    if not profile_file:
+        return
+    TsGlobals.TS_PROFILE_FILE = os.path.abspath(profile_file)
+    TsGlobals.TS_PROFILE_EVENTS = []
+    shutil.rmtree(__get_parts_dir(), ignore_errors=True)
+    os.makedirs(__get_parts_dir())
+    atexit.register(ts_profile_export)
+
+
+def ts_profile_init_worker(profile_file: str):
+    """
+    Enables profiling in worker process. Events are stored by 'ts_profile_flush'.
+    :param profile_file: Path of trace file (as passed to 'ts_profile_init' in main process).
+    """
+    TsGlobals.TS_PROFILE_FILE = profile_file
+    TsGlobals.TS_PROFILE_EVENTS = []
+
+
+def ts_span(name: str, **args):
+    """
+    Context manager measuring duration of a flow phase.
+    :param name: Name of the phase
+    :param args: Additional information shown in trace viewer
+    """
+    if TsGlobals.TS_PROFILE_FILE is None:
+        return __NULL_SPAN
+    return TsSpan(name, args)
+
+
+def ts_profile_event(name: str, start: int, end: int, **args):
+    """
+    Records flow phase with known start and end.
+    :param name: Name of the phase
+    :param start: Start time (ns, as returned by 'time.time_ns')
+    :param end: End time (ns, as returned by 'time.time_ns')
+    :param args: Additional information shown in trace viewer
+    """
+    if TsGlobals.TS_PROFILE_FILE is None:
+        return
+    TsGlobals.TS_PROFILE_EVENTS.append(
+        {
+            "name": name,
+            "ph": "X",
+            "ts": start / 1000,
+            "dur": (end - start) / 1000,
+            "tid": os.getpid(),
+            "args": args,
+        }
+    )
+
+
+def ts_profile_flush():
+    """
+    Stores events recorded by worker process so that main process can export them.
+    """
+    if TsGlobals.TS_PROFILE_FILE is None or not TsGlobals.TS_PROFILE_EVENTS:
+        return
+    with open(os.path.join(__get_parts_dir(), f"{os.getpid()}.jsonl"), "a") as fd:
+        for event in TsGlobals.TS_PROFILE_EVENTS:
+            fd.write(json.dumps(event) + "\n")
+    TsGlobals.TS_PROFILE_EVENTS = []
+
+
+def __get_summary(events: list) -> str:
+    """
+    Summary table of recorded phases: count, total, mean and maximal duration.
+    :param events: Recorded events
+    """
+    phases = {}
+    for event in events:
+        phases.setdefault(event["name"], []).append(event["dur"] / 1e6)
+
+    lines = [
+        f"{'Phase':<24} {'Count':>8} {'Total [s]':>12} {'Mean [s]':>12} {'Max [s]':>12}"
+    ]
+    lines.append("-" * len(lines[0]))
+    for name, durations in sorted(phases.items(), key=lambda x: -sum(x[1])):
+        lines.append(
+            f"{name:<24} {len(durations):>8} {sum(durations):>12.3f} "
+            f"{sum(durations) / len(durations):>12.3f} {max(durations):>12.3f}"
+        )
+    return "\n".join(lines)
+
+
+def ts_profile_export():
+    """
+    Exports events of main process and all workers to Chrome trace-event JSON file (one
+    track per process) and prints summary table. Summary is stored next to trace file.
+    """
+    if TsGlobals.TS_PROFILE_FILE is None:
+        return
+
+    events = list(TsGlobals.TS_PROFILE_EVENTS)
+    for part in sorted(glob.glob(os.path.join(__get_parts_dir(), "*.jsonl"))):
+        with open(part) as fd:
+            events.extend(json.loads(line) for line in fd)
+    shutil.rmtree(__get_parts_dir(), ignore_errors=True)
+
+    main_pid = os.getpid()
+    tracks = sorted(set(event["tid"] for event in events) | {main_pid})
+    trace_events = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": main_pid,
+            "tid": tid,
+            "args": {"name": "main" if tid == main_pid else f"worker {tid}"},
+        }
+        for tid in tracks
+    ]
+    trace_events.extend({**event, "pid": main_pid} for event in events)
+
+    with open(TsGlobals.TS_PROFILE_FILE, "w") as fd:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, fd)
+
+    summary = __get_summary(events)
+    summary_file = os.path.splitext(TsGlobals.TS_PROFILE_FILE)[0] + "_summary.txt"
+    with open(summary_file, "w") as fd:
+        fd.write(summary + "\n")
+
+    ts_print("Profile summary", color=TsColors.PURPLE, big=True)
+    ts_print(summary)
+    ts_info(
+        TsInfoCode.GENERIC,
+        f"Trace stored in '{TsGlobals.TS_PROFILE_FILE}', summary in '{summary_file}'",
+    )
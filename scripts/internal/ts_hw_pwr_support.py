@@ -6,16 +6,23 @@
 # For license see LICENSE file in repository root.
 ####################################################################################################
 
+import contextlib
 import logging
 import os
 import re
 import shutil
+import signal
+from argparse import Namespace
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
 
+import psutil
+
 from .ts_hw_common import (
     exec_cmd_in_dir,
     get_repo_root_path,
     load_yaml_file,
+    ts_generate_seed,
     ts_get_root_rel_path,
     ts_get_test_dir,
     ts_rmdir,
@@ -29,6 +36,7 @@ from .ts_hw_logging import (
     TSFormatter,
     TsInfoCode,
     TsWarnCode,
+    ts_configure_logging,
     ts_debug,
     ts_info,
     ts_print,
@@ -36,12 +44,24 @@ from .ts_hw_logging import (
     ts_throw_error,
     ts_warning,
 )
+from .ts_hw_pwr_vcd import reduce_vcd
 
 CORNER_DICT = {"bc": "TLUP_MIN_-40", "tc": "TLUP_TYP_25", "wc": "TLUP_MAX_125"}
 
 RUNCODE_RESULTS_DIR = "results"
 RUNCODE_FILE_PREFIX = "write_data"
 
+# Global variables shipped to worker processes of parallel run
+PWR_RUN_CONTEXT_VARS = (
+    "TS_SIM_CFG",
+    "TS_DESIGN_CFG",
+    "TS_PWR_CFG",
+    "TS_PWR_RUN_FILE",
+    "TS_PWR_RUNCODE_DIR",
+    "TS_RUNCODE",
+    "TS_RUNCODE_DIR",
+)
+
 
 def check_path(path: str):
     if not os.path.exists(path):
@@ -436,6 +456,9 @@ def generate_scenario_setup(scenario: dict, vcd_file: str, args):
     lines.append("# Non-DMSA Power Analysis Setup Section\n")
     lines.append("##############################################\n")
     lines.append('set ACTIVITY_FILE "{}"\n'.format(vcd_file))
+    lines.append(
+        "set ACTIVITY_FORMAT {}\n".format("saif" if vcd_file.endswith(".saif") else "vcd")
+    )
     lines.append('set STRIP_PATH "{}"\n'.format(TsGlobals.TS_PWR_CFG["strip_path"]))
     lines.append("\n")
 
@@ -679,3 +702,445 @@ def open_pwr_waves(args):
     )
 
     return return_code
+
+
+def get_scenario_seed(scenario: dict, args) -> int:
+    """
+    Selects simulation seed of a scenario.
+    :param scenario: Power scenario.
+    :param args: args.
+    :return: Seed from command line, random seed for randomized scenario, 0 otherwise.
+    """
+    if hasattr(args, "seed"):
+        return args.seed
+    if not args.no_sim and get_optional_key(scenario, "randomized"):
+        return ts_generate_seed()
+    return 0
+
+
+def get_scenario_sim_key(scenario: dict, seed: int) -> tuple:
+    """
+    Identifies simulation of a scenario. Scenarios with the same key dump the same VCD file.
+    :param scenario: Power scenario.
+    :param seed: Seed for simulation.
+    """
+    return scenario["simulation_target"], scenario["test_name"], seed
+
+
+def get_pwr_sim_groups(scenarios: list, shared: bool) -> list:
+    """
+    Groups scenarios which can be analyzed from the same simulation.
+    :param scenarios: List of (scenario, seed) pairs.
+    :param shared: Scenarios with the same simulation target, test and seed share simulation.
+                   Otherwise each scenario is simulated on its own.
+    :return: List of simulation groups. Each group contains its scenarios, seed and
+             'sim_scenario' whose dump window covers windows of all the scenarios.
+    """
+    groups = {}
+    for scenario, seed in scenarios:
+        key = get_scenario_sim_key(scenario, seed) if shared else scenario["name"]
+        groups.setdefault(key, []).append((scenario, seed))
+
+    sim_groups = []
+    for members in groups.values():
+        sim_scenario = dict(members[0][0])
+        if len(members) > 1:
+            sim_scenario["name"] = ", ".join(s["name"] for s, _ in members)
+            sim_scenario["from"] = min(s["from"] for s, _ in members)
+            sim_scenario["to"] = max(s["to"] for s, _ in members)
+            ts_info(
+                TsInfoCode.GENERIC,
+                f"Scenarios {sim_scenario['name']} share simulation "
+                f"(window {sim_scenario['from']}-{sim_scenario['to']} ns).",
+            )
+        sim_groups.append(
+            {"scenarios": members, "seed": members[0][1], "sim_scenario": sim_scenario}
+        )
+    return sim_groups
+
+
+def get_scenario_vcd_file(group: dict, scenario: dict, args):
+    """
+    Returns activity file prepared for a scenario from VCD dumped by simulation.
+    :param group: Simulation group (see 'get_pwr_sim_groups').
+    :param scenario: Power scenario of the group.
+    :param args: args.
+    :return: Path of activity file in rundir of the scenario, None if the scenario uses
+             VCD file dumped by simulation as is (always when simulation is not executed).
+    """
+    if args.no_sim:
+        return None
+    if args.activity_format == "saif":
+        return os.path.join(scenario["rundir"], "activity.saif")
+    if args.activity_format == "vcd.gz":
+        return os.path.join(scenario["rundir"], "inter.vcd.gz")
+    if args.activity_format == "vcd" or len(group["scenarios"]) > 1:
+        return os.path.join(scenario["rundir"], "inter.vcd")
+    return None
+
+
+def run_pwr_simulation(scenario: dict, seed: int, args) -> int:
+    """
+    Runs simulation dumping VCD file of a scenario.
+    :param scenario: Power scenario.
+    :param seed: Seed for simulation.
+    :param args: args.
+    :return: Exit code of the simulation.
+    """
+    ts_print(
+        "Running simulation for '{}'.".format(scenario["name"]),
+        color=TsColors.PURPLE,
+        big=True,
+    )
+    ts_info(TsInfoCode.GENERIC, f"Seed: {seed}")
+
+    run_sim_cmd = xterm_cmd_wrapper(build_run_sim_cmd(scenario, seed, args))
+
+    ts_debug(f"Running command {run_sim_cmd}")
+    sim_exit_code = exec_cmd_in_dir(
+        directory=TsGlobals.TS_PWR_DIR,
+        command=run_sim_cmd,
+        batch_mode=args.batch_mode
+    )
+
+    ts_debug(f"Simulation exit code: {sim_exit_code}")
+    return sim_exit_code
+
+
+def run_pwr_group_simulation(group: dict, args) -> int:
+    """
+    Runs simulation of a group. If the simulation is shared or activity format is selected,
+    prepares activity file of each scenario from the dumped VCD file (see
+    'get_scenario_vcd_file').
+    :param group: Simulation group (see 'get_pwr_sim_groups').
+    :param args: args.
+    :return: Exit code of the simulation.
+    """
+    sim_exit_code = run_pwr_simulation(group["sim_scenario"], group["seed"], args)
+    if sim_exit_code or get_scenario_vcd_file(group, group["scenarios"][0][0], args) is None:
+        return sim_exit_code
+
+    # Activity of each scenario is sliced to its window and reduced to strip path
+    scope = TsGlobals.TS_PWR_CFG["strip_path"] if args.activity_format else None
+    vcd_file = get_vcd_file(group["sim_scenario"], group["seed"])
+    for scenario, _ in group["scenarios"]:
+        activity_file = get_scenario_vcd_file(group, scenario, args)
+        ts_info(
+            TsInfoCode.GENERIC,
+            f"Preparing activity file '{activity_file}' for '{scenario['name']}' "
+            f"({scenario['from']}-{scenario['to']} ns).",
+        )
+        reduce_vcd(
+            vcd_file,
+            activity_file,
+            scenario["from"],
+            scenario["to"],
+            scope,
+            "saif" if args.activity_format == "saif" else "vcd",
+        )
+
+    # VCD dumped by simulation is not needed anymore
+    if args.remove_vcd:
+        ts_debug(f"Removing VCD file {vcd_file}")
+        os.remove(vcd_file)
+
+    return sim_exit_code
+
+
+def run_pwr_analysis(scenario: dict, seed: int, args, vcd_file: str = None) -> int:
+    """
+    Generates setup of a scenario and runs PrimeTime power analysis.
+    :param scenario: Power scenario.
+    :param seed: Seed the simulation was runned with.
+    :param args: args.
+    :param vcd_file: VCD file to analyze, VCD file dumped by simulation if None.
+    :return: Exit code of PrimeTime.
+    """
+    if vcd_file is None:
+        vcd_file = get_vcd_file(scenario, seed)
+    else:
+        check_path(vcd_file)
+
+    # Generate specific power setup
+    generate_scenario_setup(scenario, vcd_file, args)
+
+    # Generate post PrimeTime hook file
+    generate_post_pwr_hook(scenario, args)
+
+    # Generate PrimeTime command
+    pt_shell_cmd = xterm_cmd_wrapper(build_prime_time_cmd(scenario, args))
+
+    ts_print(
+        "Running power analysis for '{}'.".format(scenario["name"]),
+        color=TsColors.PURPLE,
+        big=True,
+    )
+
+    ts_debug(f"Running command {pt_shell_cmd}")
+    pwr_exit_code = exec_cmd_in_dir(
+        directory=scenario["rundir"],
+        command=pt_shell_cmd,
+        batch_mode=args.batch_mode
+    )
+
+    ts_debug(f"PrimeTime exit code: {pwr_exit_code}")
+
+    # VCD dumped by this run is not needed anymore
+    if args.remove_vcd and not args.no_sim:
+        ts_debug(f"Removing VCD file {vcd_file}")
+        os.remove(vcd_file)
+
+    return pwr_exit_code
+
+
+def new_pwr_result(scenario: dict, seed: int, status: str = "PASSED") -> dict:
+    """
+    Creates result of a scenario.
+    :param scenario: Power scenario.
+    :param seed: Seed for simulation.
+    :param status: Initial status of the scenario.
+    """
+    return {
+        "name": scenario["name"],
+        "seed": seed,
+        "sim_exit_code": None,
+        "pwr_exit_code": None,
+        "status": status,
+    }
+
+
+def run_pwr_group(group: dict, args) -> list:
+    """
+    Runs simulation (unless disabled) and power analysis of scenarios of a group.
+    :param group: Simulation group (see 'get_pwr_sim_groups').
+    :param args: args.
+    :return: Results of the scenarios (name, seed, exit codes and status).
+    """
+    results = [new_pwr_result(scenario, seed) for scenario, seed in group["scenarios"]]
+
+    if not args.no_sim:
+        sim_exit_code = run_pwr_group_simulation(group, args)
+        for result in results:
+            result["sim_exit_code"] = sim_exit_code
+        if sim_exit_code:
+            for result in results:
+                result["status"] = "SIM FAILED"
+            if not args.fail_fast:
+                ts_warning(
+                    TsWarnCode.GENERIC,
+                    "Simulation failed on scenario {}... Skipping its power analysis...".format(
+                        group["sim_scenario"]["name"]
+                    ),
+                )
+            return results
+
+    for result, (scenario, seed) in zip(results, group["scenarios"]):
+        result["pwr_exit_code"] = run_pwr_analysis(
+            scenario, seed, args, get_scenario_vcd_file(group, scenario, args)
+        )
+        if result["pwr_exit_code"] and result["status"] == "PASSED":
+            result["status"] = "PWR FAILED"
+    return results
+
+
+def get_pwr_run_context() -> dict:
+    """
+    Returns global configuration needed by worker processes of pipelined run.
+    """
+    return {var: getattr(TsGlobals, var, None) for var in PWR_RUN_CONTEXT_VARS}
+
+
+def init_pwr_worker(ctx: dict, args):
+    """
+    Power run worker process initializer.
+    :param ctx: Global configuration built by main process (see 'get_pwr_run_context').
+    :param args: args.
+    """
+    for var, value in ctx.items():
+        setattr(TsGlobals, var, value)
+
+    # Interrupt is handled by main process which terminates the whole process tree
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Worker which is not forked does not have logging configured
+    if not logging.getLogger().handlers:
+        ts_configure_logging(Namespace(verbose=args.verbose, no_color=args.no_color))
+
+
+def run_pwr_analysis_job(scenario: dict, seed: int, args, vcd_file: str = None):
+    """
+    Runs power analysis in worker process, see 'run_pwr_analysis'.
+    :return: Exit code of PrimeTime, None if the analysis could not be started
+             (e.g. VCD file is missing).
+    """
+    try:
+        return run_pwr_analysis(scenario, seed, args, vcd_file)
+    except SystemExit:
+        return None
+
+
+def __terminate_pwr_jobs():
+    """
+    Terminates tools launched by worker processes. Workers then finish their jobs
+    as failed.
+    """
+    for worker in psutil.Process().children():
+        for child in worker.children(recursive=True):
+            ts_debug(f"Terminating process {child}")
+            with contextlib.suppress(psutil.NoSuchProcess):
+                child.terminate()
+
+
+def run_pwr_pipeline(groups: list, args) -> list:
+    """
+    Runs scenarios in two-stage pipeline. Stage 1 simulates groups of scenarios and produces
+    VCD files, stage 2 runs power analysis of scenarios whose VCD is ready. Both stages run
+    in parallel, each scenario runs in its own rundir.
+
+    Number of VCD files in flight (being dumped, waiting for power analysis or being analyzed)
+    is bounded by --vcd-queue, simulation of next group is not started until a slot
+    in the queue is freed.
+
+    :param groups: Simulation groups (see 'get_pwr_sim_groups').
+    :param args: args.
+    :return: Results of scenarios (see 'run_pwr_group') in order of scenarios in 'groups'.
+    """
+    sim_limit = args.sim_jobs or args.jobs
+    pt_limit = args.pt_jobs or args.jobs
+    vcd_limit = args.vcd_queue or sim_limit + pt_limit
+
+    scenarios = [(g, s, seed) for g in groups for s, seed in g["scenarios"]]
+    ts_info(
+        TsInfoCode.GENERIC,
+        f"Running {len(scenarios)} scenarios in pipeline (simulation jobs: {sim_limit}, "
+        f"PrimeTime jobs: {pt_limit}, VCD queue: {vcd_limit}).",
+    )
+
+    results = {s["name"]: new_pwr_result(s, seed) for _, s, seed in scenarios}
+    to_simulate = [] if args.no_sim else list(groups)
+    vcd_queue = list(scenarios) if args.no_sim else []
+    running = {}
+    failed = False
+
+    def group_sim_key(group):
+        return get_scenario_sim_key(group["sim_scenario"], group["seed"])
+
+    def in_flight_sim_keys():
+        return set(group_sim_key(g) for _, g, _, _ in running.values()) | set(
+            group_sim_key(g) for g, _, _ in vcd_queue
+        )
+
+    with ProcessPoolExecutor(
+        sim_limit + pt_limit,
+        initializer=init_pwr_worker,
+        initargs=(get_pwr_run_context(), args),
+    ) as executor:
+        while True:
+            ########################################################################################
+            # Schedule jobs
+            ########################################################################################
+            while not failed and vcd_queue:
+                if sum(stage == "pt" for stage, _, _, _ in running.values()) >= pt_limit:
+                    break
+                group, scenario, seed = vcd_queue.pop(0)
+                future = executor.submit(
+                    run_pwr_analysis_job,
+                    scenario,
+                    seed,
+                    args,
+                    get_scenario_vcd_file(group, scenario, args),
+                )
+                running[future] = ("pt", group, scenario, seed)
+
+            for group in list(to_simulate):
+                if failed or len(running) + len(vcd_queue) >= vcd_limit:
+                    break
+                if sum(stage == "sim" for stage, _, _, _ in running.values()) >= sim_limit:
+                    break
+                # Simulations with the same target, test and seed dump the same VCD file.
+                # Simulations of the same target share build directories.
+                target = group["sim_scenario"]["simulation_target"]
+                if group_sim_key(group) in in_flight_sim_keys() or any(
+                    stage == "sim" and g["sim_scenario"]["simulation_target"] == target
+                    for stage, g, _, _ in running.values()
+                ):
+                    continue
+                to_simulate.remove(group)
+                future = executor.submit(run_pwr_group_simulation, group, args)
+                running[future] = ("sim", group, None, group["seed"])
+
+            if not running:
+                break
+
+            ########################################################################################
+            # Collect finished jobs
+            ########################################################################################
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, group, scenario, seed = running.pop(future)
+                exit_code = future.result()
+
+                if stage == "sim":
+                    group_results = [results[s["name"]] for s, _ in group["scenarios"]]
+                    for result in group_results:
+                        result["sim_exit_code"] = exit_code
+                        if exit_code != 0:
+                            result["status"] = "SIM FAILED"
+                    # Power analysis is skipped for failed simulation (same as in 'run_pwr_group')
+                    if exit_code == 0:
+                        vcd_queue.extend((group, s, seed) for s, _ in group["scenarios"])
+                        ts_debug(f"VCD of '{group['sim_scenario']['name']}' queued.")
+                        continue
+                    name = group["sim_scenario"]["name"]
+                    if not args.fail_fast:
+                        ts_warning(
+                            TsWarnCode.GENERIC,
+                            f"Simulation failed on scenario {name}... Skipping its power analysis...",
+                        )
+                else:
+                    group_results = [results[scenario["name"]]]
+                    group_results[0]["pwr_exit_code"] = exit_code
+                    if exit_code is None:
+                        group_results[0]["status"] = "ERROR"
+                    elif exit_code and group_results[0]["status"] == "PASSED":
+                        group_results[0]["status"] = "PWR FAILED"
+                    name = scenario["name"]
+
+                status = group_results[0]["status"]
+                if failed and status != "PASSED":
+                    status = "CANCELLED"
+                    for result in group_results:
+                        result["status"] = status
+
+                ts_info(TsInfoCode.GENERIC, f"Scenario '{name}' finished: {status}")
+
+                if status != "PASSED" and args.fail_fast and not failed:
+                    ts_warning(
+                        TsWarnCode.GENERIC, f"Scenario {name} failed... Failing fast!"
+                    )
+                    failed = True
+                    __terminate_pwr_jobs()
+
+    for group in to_simulate:
+        for scenario, _ in group["scenarios"]:
+            results[scenario["name"]]["status"] = "CANCELLED"
+    for _, scenario, _ in vcd_queue:
+        results[scenario["name"]]["status"] = "CANCELLED"
+
+    return [results[scenario["name"]] for _, scenario, _ in scenarios]
+
+
+def print_pwr_results(results: list):
+    """
+    Prints results of scenarios.
+    :param results: Results of scenarios (see 'run_pwr_scenario').
+    """
+    exit_code = lambda x: "-" if x is None else x
+    ts_print("Power Analysis Results", color=TsColors.PURPLE, big=True)
+    ts_print(f"{'Scenario':<32} {'Seed':>12} {'Sim':>6} {'PT':>6}  Status")
+    for r in results:
+        ts_print(
+            f"{r['name']:<32} {r['seed']:>12} {exit_code(r['sim_exit_code']):>6} "
+            f"{exit_code(r['pwr_exit_code']):>6}  {r['status']}",
+            color=TsColors.GREEN if r["status"] == "PASSED" else TsColors.RED,
+        )
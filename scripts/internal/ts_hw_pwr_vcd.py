@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Streaming processing of VCD files for power analysis
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import gzip
+import os
+import re
+from datetime import datetime
+
+from .ts_hw_logging import TsErrCode, ts_debug, ts_throw_error
+
+# Time units of VCD timescale in femtoseconds
+VCD_TIME_UNITS_FS = {
+    "s": 10**15,
+    "ms": 10**12,
+    "us": 10**9,
+    "ns": 10**6,
+    "ps": 10**3,
+    "fs": 1,
+}
+
+# Output formats of reduced activity file
+ACTIVITY_FORMATS = ("vcd", "saif")
+
+__TIMESCALE_REGEX = re.compile(r"^(\d+)\s*([munpf]?s)$")
+
+__VAR_REF_REGEX = re.compile(r"^(\S+?)\s*(?:\[(\d+)(?::(\d+))?\])?$")
+
+__DUMP_KEYWORDS = ("$dumpvars", "$dumpall", "$dumpon", "$dumpoff")
+
+
+def __open_vcd(path: str, mode: str):
+    """
+    Opens VCD file, gzip-compressed if its name ends with '.gz'.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="latin-1")
+    return open(path, mode, encoding="latin-1")
+
+
+def __read_header(fin, vcd_file: str) -> list:
+    """
+    Reads VCD header.
+    :param fin: Input VCD file, positioned at its start.
+    :param vcd_file: Path of VCD file (for error reporting).
+    :return: Header commands, each as list of tokens from keyword to '$end'.
+    """
+    commands = []
+    command = []
+    for line in fin:
+        for token in line.split():
+            command.append(token)
+            if token != "$end":
+                continue
+            commands.append(command)
+            if command[0] == "$enddefinitions":
+                return commands
+            command = []
+    ts_throw_error(TsErrCode.GENERIC, f"Invalid VCD file '{vcd_file}': missing header")
+
+
+def __get_timescale(commands: list, vcd_file: str) -> tuple:
+    """
+    Reads timescale from VCD header.
+    :param commands: Header commands (see '__read_header').
+    :param vcd_file: Path of VCD file (for error reporting).
+    :return: Multiplier and unit of timescale. Default timescale (1ns) if not present.
+    """
+    for command in commands:
+        if command[0] == "$timescale":
+            match = __TIMESCALE_REGEX.match("".join(command[1:-1]))
+            if match is None:
+                ts_throw_error(
+                    TsErrCode.GENERIC,
+                    f"Invalid timescale '{' '.join(command[1:-1])}' in '{vcd_file}'",
+                )
+            return int(match.group(1)), match.group(2)
+    return 1, "ns"
+
+
+def __filter_header(commands: list, scope: list) -> tuple:
+    """
+    Filters VCD header to a scope. Enclosing scopes of the scope are kept so that
+    hierarchical paths stay the same.
+    :param commands: Header commands (see '__read_header').
+    :param scope: Hierarchical path of the scope, None to keep all scopes.
+    :return: Kept header commands and variables by identifier. Each variable is a tuple
+             of scope path, reference name, width, msb and lsb.
+    """
+    kept = []
+    variables = {}
+    stack = []
+    kept_stack = []
+
+    in_scope = lambda path: scope is None or path[: len(scope)] == scope
+
+    for command in commands:
+        keyword = command[0]
+        if keyword == "$scope":
+            stack.append(command[2])
+            keep = in_scope(stack) or stack == scope[: len(stack)]
+            kept_stack.append(keep)
+            if keep:
+                kept.append(command)
+        elif keyword == "$upscope":
+            stack.pop()
+            if kept_stack.pop():
+                kept.append(command)
+        elif keyword == "$var":
+            if not in_scope(stack):
+                continue
+            kept.append(command)
+            match = __VAR_REF_REGEX.match(" ".join(command[4:-1]))
+            name, msb, lsb = match.group(1), match.group(2), match.group(3)
+            width = int(command[2])
+            if msb is not None and lsb is None:
+                # Bit select is part of the name
+                name = f"{name}[{msb}]"
+                msb = None
+            msb = int(msb) if msb is not None else width - 1
+            lsb = int(lsb) if lsb is not None else msb - width + 1
+            variables.setdefault(command[3], []).append(
+                (tuple(stack), name, width, msb, lsb)
+            )
+        else:
+            kept.append(command)
+
+    return kept, variables
+
+
+def __split_value_changes(tokens: list):
+    """
+    Splits tokens of VCD body line to value changes.
+    :param tokens: Tokens of the line.
+    :return: Generator of (identifier, value) pairs.
+    """
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token[0] in "bBrR":
+            # Vector and real values: value and identifier are separate tokens
+            if i + 1 < len(tokens):
+                yield tokens[i + 1], token
+            i += 2
+            continue
+        if token[0] in "01xXzZ":
+            yield token[1:], token[0]
+        i += 1
+
+
+class TsVcdWriter:
+    """
+    Writes header and value changes within the window to VCD file.
+    """
+
+    @staticmethod
+    def format_value_change(ident: str, value: str) -> str:
+        """
+        Formats value change as VCD body line.
+        """
+        return f"{value}{ident}\n" if len(value) == 1 else f"{value} {ident}\n"
+
+    def __init__(self, fout, commands: list):
+        self.fout = fout
+        self.last = None
+        fout.writelines(" ".join(command) + "\n" for command in commands)
+
+    def begin(self, start, values: dict):
+        """
+        Opens the window. Writes initial value dump of all signals at its start.
+        """
+        if start is None:
+            return
+        self.fout.write(f"#{start}\n$dumpvars\n")
+        self.fout.writelines(
+            self.format_value_change(ident, value) for ident, value in values.items()
+        )
+        self.fout.write("$end\n")
+        self.last = start
+
+    def time(self, time: int, line: str):
+        self.fout.write(line)
+        self.last = time
+
+    def change(self, ident: str, value: str, line: str):
+        self.fout.write(line)
+
+    def keyword(self, line: str):
+        self.fout.write(line)
+
+    def finish(self, end):
+        """
+        Closes the window. Marks its end by time stamp.
+        """
+        if end is not None and (self.last is None or self.last < end):
+            self.fout.write(f"#{end}\n")
+
+
+class TsSaifWriter:
+    """
+    Accumulates time at 0, 1 and X and number of toggles of each bit within the window.
+    Writes them to SAIF file when the window is closed.
+    """
+
+    def __init__(self, fout, variables: dict, timescale: tuple):
+        self.fout = fout
+        self.variables = variables
+        self.timescale = timescale
+        self.start = None
+        self.last = None
+        # Current bits, time of their change and T0, T1, TX, TC of each bit by identifier
+        self.state = {}
+
+    def __expand(self, ident: str, value: str) -> str:
+        """
+        Converts VCD value to string of bits (0, 1 or x) of variable width.
+        """
+        width = self.variables[ident][0][2]
+        if value[0] in "bB":
+            value = value[1:].lower().replace("z", "x")
+            pad = "x" if value[0] == "x" else "0"
+            return value.rjust(width, pad)[-width:]
+        if value[0] in "rR":
+            return "x" * width
+        return value.lower().replace("z", "x")
+
+    @staticmethod
+    def __accumulate(state: list, time: int):
+        """
+        Adds time since last change to T0, T1 or TX of each bit.
+        """
+        duration = time - state[1]
+        for i, bit in enumerate(state[0]):
+            state[2 + "01x".index(bit)][i] += duration
+        state[1] = time
+
+    def begin(self, start, values: dict):
+        """
+        Opens the window. Values at its start are values of last changes before it.
+        """
+        self.start = start
+        for ident, variables in self.variables.items():
+            width = variables[0][2]
+            bits = self.__expand(ident, values[ident]) if ident in values else "x" * width
+            self.state[ident] = [bits, start or 0] + [[0] * width for _ in range(4)]
+
+    def time(self, time: int, line: str):
+        if self.start is None:
+            self.start = time
+            for state in self.state.values():
+                state[1] = time
+        self.last = time
+
+    def change(self, ident: str, value: str, line: str):
+        state = self.state.get(ident)
+        if state is None:
+            return
+        bits = self.__expand(ident, value)
+        if state[0] == bits:
+            return
+        for i, (old, new) in enumerate(zip(state[0], bits)):
+            if old != new and old != "x" and new != "x":
+                state[5][i] += 1
+        self.__accumulate(state, self.last if self.last is not None else state[1])
+        state[0] = bits
+
+    def keyword(self, line: str):
+        pass
+
+    def finish(self, end):
+        """
+        Closes the window and writes SAIF file.
+        """
+        end = end if end is not None else (self.last or 0)
+        start = self.start if self.start is not None else end
+        for state in self.state.values():
+            self.__accumulate(state, end)
+
+        # Nets (one per bit) by scope
+        nets = {}
+        for ident, variables in self.variables.items():
+            t0, t1, tx, tc = self.state[ident][2:]
+            for path, name, width, msb, lsb in variables:
+                # Brackets of bit selects are escaped in SAIF (also if they are part of name)
+                name = name.replace("[", "\\[").replace("]", "\\]")
+                step = -1 if msb >= lsb else 1
+                for i in range(width):
+                    net = name if width == 1 else f"{name}\\[{msb + i * step}\\]"
+                    nets.setdefault(path, []).append((net, t0[i], t1[i], tx[i], tc[i]))
+
+        fout = self.fout
+        fout.write("(SAIFILE\n")
+        fout.write('(SAIFVERSION "2.0")\n')
+        fout.write('(DIRECTION "backward")\n')
+        fout.write(f'(DATE "{datetime.now().strftime("%a %b %d %H:%M:%S %Y")}")\n')
+        fout.write('(PROGRAM_NAME "ts-hw-scripts")\n')
+        fout.write("(DIVIDER / )\n")
+        fout.write(f"(TIMESCALE {self.timescale[0]} {self.timescale[1]})\n")
+        fout.write(f"(DURATION {end - start})\n")
+
+        paths = sorted(set(p[:i] for p in nets for i in range(1, len(p) + 1)))
+        stack = []
+        for path in paths:
+            while path[: len(stack)] != tuple(stack):
+                stack.pop()
+                fout.write(f"{'  ' * len(stack)})\n")
+            indent = "  " * len(stack)
+            fout.write(f"{indent}(INSTANCE {path[-1]}\n")
+            stack.append(path[-1])
+            if path not in nets:
+                continue
+            fout.write(f"{indent}  (NET\n")
+            for net, t0, t1, tx, tc in nets[path]:
+                fout.write(
+                    f"{indent}    ({net}\n"
+                    f"{indent}      (T0 {t0}) (T1 {t1}) (TX {tx})\n"
+                    f"{indent}      (TC {tc}) (IG 0)\n"
+                    f"{indent}    )\n"
+                )
+            fout.write(f"{indent}  )\n")
+        while stack:
+            stack.pop()
+            fout.write(f"{'  ' * len(stack)})\n")
+        fout.write(")\n")
+
+
+def reduce_vcd(
+    vcd_file: str,
+    out_file: str,
+    start_ns: int = None,
+    end_ns: int = None,
+    scope: str = None,
+    fmt: str = "vcd",
+):
+    """
+    Reduces VCD file in single pass. Memory use is bounded by number of signals, not by
+    length of the file.
+
+    VCD output contains header of the input file, initial value dump of all signals at the
+    window start and value changes within the window. Time stamps are kept absolute.
+    SAIF output contains time at 0, 1 and X and number of toggles of each bit within
+    the window. Input and output files are gzip-compressed if their name ends with '.gz'.
+
+    :param vcd_file: Input VCD file.
+    :param out_file: Output file.
+    :param start_ns: Start of the window (ns), None for start of the file.
+    :param end_ns: End of the window (ns), None for end of the file.
+    :param scope: Hierarchical path of scope ('/' or '.' separated) whose signals are kept,
+                  None to keep all signals.
+    :param fmt: Output format, one of ACTIVITY_FORMATS.
+    """
+    ts_debug(
+        f"Reducing '{vcd_file}' (window: {start_ns}-{end_ns} ns, scope: {scope}, "
+        f"format: {fmt}) into '{out_file}'"
+    )
+    scope_path = re.split(r"[/.]", scope.strip("/")) if scope else None
+
+    tmp_file = f"{out_file}.{os.getpid()}.tmp"
+    if out_file.endswith(".gz"):
+        tmp_file += ".gz"
+
+    with __open_vcd(vcd_file, "r") as fin, __open_vcd(tmp_file, "w") as fout:
+        commands = __read_header(fin, vcd_file)
+        timescale = __get_timescale(commands, vcd_file)
+        commands, variables = __filter_header(commands, scope_path)
+        keep = set(variables) if scope_path else None
+
+        timescale_fs = timescale[0] * VCD_TIME_UNITS_FS[timescale[1]]
+        to_units = lambda ns: None if ns is None else ns * VCD_TIME_UNITS_FS["ns"] // timescale_fs
+        start, end = to_units(start_ns), to_units(end_ns)
+
+        if fmt == "saif":
+            writer = TsSaifWriter(fout, variables, timescale)
+        else:
+            writer = TsVcdWriter(fout, commands)
+
+        # Values of signals before the window by identifier
+        values = {}
+        in_comment = False
+        window_open = start is None
+        if window_open:
+            writer.begin(None, values)
+
+        for line in fin:
+            first = line[:1]
+
+            ################################################################################
+            # Time stamp
+            ################################################################################
+            if first == "#":
+                time = int(line[1:])
+                if not window_open:
+                    if time <= start:
+                        continue
+                    window_open = True
+                    writer.begin(start, values)
+                if end is not None and time > end:
+                    break
+                writer.time(time, line)
+                continue
+
+            ################################################################################
+            # Value change
+            ################################################################################
+            if first and first in "01xXzZbBrR":
+                for ident, value in __split_value_changes(line.split()):
+                    if keep is not None and ident not in keep:
+                        continue
+                    if window_open:
+                        writer.change(ident, value, line)
+                    else:
+                        values[ident] = value
+                continue
+
+            ################################################################################
+            # Keywords and comments
+            ################################################################################
+            tokens = line.split()
+            if not tokens:
+                continue
+            if in_comment or tokens[0] == "$comment":
+                in_comment = tokens[-1] != "$end"
+                continue
+            if tokens[0] in __DUMP_KEYWORDS and len(tokens) > 1:
+                # Value changes on the same line as keyword
+                if window_open:
+                    writer.keyword(f"{tokens[0]}\n")
+                for ident, value in __split_value_changes(tokens[1:]):
+                    if keep is not None and ident not in keep:
+                        continue
+                    if window_open:
+                        writer.change(
+                            ident, value, TsVcdWriter.format_value_change(ident, value)
+                        )
+                    else:
+                        values[ident] = value
+                if window_open and tokens[-1] == "$end":
+                    writer.keyword("$end\n")
+                continue
+            if window_open:
+                writer.keyword(line)
+
+        # File ended before the window
+        if not window_open:
+            writer.begin(start, values)
+        writer.finish(end)
+
+    os.replace(tmp_file, out_file)
+
+
+def slice_vcd(vcd_file: str, out_file: str, start_ns: int, end_ns: int):
+    """
+    Cuts time window out of VCD file, see 'reduce_vcd'.
+    :param vcd_file: Input VCD file.
+    :param out_file: Output VCD file.
+    :param start_ns: Start of the window (ns).
+    :param end_ns: End of the window (ns).
+    """
+    reduce_vcd(vcd_file, out_file, start_ns, end_ns)
@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# QoR database: ingestion of timing, QoR, area and power reports of Synopsys tools
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import gzip
+import heapq
+import os
+import re
+import sqlite3
+import time
+
+from .ts_hw_common import ts_get_root_rel_path
+from .ts_hw_global_vars import TsGlobals
+from .ts_hw_logging import TsInfoCode, TsWarnCode, ts_debug, ts_info, ts_warning
+
+# Version of QoR database schema. Increment when schema changes!
+QOR_DB_VERSION = 1
+
+# Number of worst paths stored per path group, path type, mode and corner
+QOR_MAX_PATHS = 50
+
+# Number of lines searched for report header
+QOR_HEADER_LINES = 50
+
+# Types of reports ingested (as in report header, e.g. "Report : timing")
+QOR_REPORT_TYPES = ("timing", "qor", "area", "power")
+
+QOR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    flow TEXT NOT NULL,
+    runcode TEXT NOT NULL,
+    design TEXT,
+    time REAL NOT NULL,
+    UNIQUE (flow, runcode)
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    UNIQUE (run_id, path)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    run_id INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    corner TEXT NOT NULL,
+    path_group TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS metrics_by_run ON metrics (run_id, name);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics (name, mode, corner, path_group);
+CREATE TABLE IF NOT EXISTS paths (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    run_id INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    corner TEXT NOT NULL,
+    path_group TEXT NOT NULL,
+    path_type TEXT NOT NULL,
+    slack REAL NOT NULL,
+    startpoint TEXT,
+    endpoint TEXT
+);
+CREATE INDEX IF NOT EXISTS paths_by_run ON paths (run_id, path_group, slack);
+"""
+
+# Report header, e.g. "Report : timing"
+REPORT_HEADER_REGEX = re.compile(r"^\s*Report\s*:\s*(\w+)")
+
+# Number in report, e.g. "-0.12", ".5" or "1.2e-03"
+NUMBER_PATTERN = r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+
+# Slack of timing path, e.g. "slack (VIOLATED)    -0.12"
+SLACK_REGEX = re.compile(rf"^slack \((?:MET|VIOLATED)[^)]*\)\s+({NUMBER_PATTERN})")
+
+# Numeric attribute of QoR and area report, e.g. "Critical Path Slack:    -0.05"
+ATTR_REGEX = re.compile(rf"^\s*([A-Za-z][\w .()/%'-]*?)\s*:\s*({NUMBER_PATTERN})\s*$")
+
+# Power of power report, e.g. "Cell Leakage Power     =  12.3456 uW"
+POWER_REGEX = re.compile(
+    rf"^\s*([A-Za-z][\w ]*?Power)\s*=\s*({NUMBER_PATTERN})\s*([munpf]?W)?"
+)
+
+# Power units to Watts
+POWER_UNITS = {"W": 1, "mW": 1e-3, "uW": 1e-6, "nW": 1e-9, "pW": 1e-12, "fW": 1e-15}
+
+
+def __normalize_name(label: str) -> str:
+    """
+    Converts report label to metric name, e.g. "No. of Violating Paths" -> "no_of_violating_paths"
+    """
+    return re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
+
+
+def __open_report(path: str):
+    """
+    Opens (gzip-compressed) report for streaming.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="latin-1")
+    return open(path, encoding="latin-1", buffering=1024 * 1024)
+
+
+def __get_report_type(path: str):
+    """
+    Returns type of report from its header, None if report type is not ingested.
+    """
+    with __open_report(path) as fd:
+        for i, line in enumerate(fd):
+            if i >= QOR_HEADER_LINES:
+                break
+            match = REPORT_HEADER_REGEX.match(line)
+            if match is not None:
+                report_type = match.group(1).lower()
+                return report_type if report_type in QOR_REPORT_TYPES else None
+    return None
+
+
+def __get_report_mode(rel_path: str, modes: dict, default_mode: str) -> str:
+    """
+    Returns mode of report by its path (longest mode name contained in the path).
+    :param rel_path: Path of report relative to reports directory
+    :param modes: Corners by mode name
+    :param default_mode: Mode used when path does not contain mode name
+    """
+    found = [mode for mode in modes if mode in rel_path]
+    return max(found, key=len) if found else default_mode
+
+
+def __parse_timing_report(fd, mode: str) -> tuple:
+    """
+    Parses report_timing output in single pass. Only paths summary and worst paths are
+    kept, so memory use does not depend on report size.
+    :param fd: Opened report
+    :param mode: Mode of report (overridden by "Scenario:" of DMSA reports)
+    :return: Tuple (metrics, worst paths), both keyed by (mode, path group, path type)
+    """
+    stats = {}
+    worst = {}
+    path = {"mode": mode, "group": "", "type": "max", "start": None, "end": None}
+
+    for line in fd:
+        line = line.strip()
+        prefix = line[:2]
+        if prefix not in ("St", "En", "Pa", "Sc", "sl"):
+            continue
+        if line.startswith("Startpoint:"):
+            path["start"] = line[11:].strip().split(" ")[0]
+            path["group"] = ""
+            path["type"] = "max"
+        elif line.startswith("Endpoint:"):
+            path["end"] = line[9:].strip().split(" ")[0]
+        elif line.startswith("Path Group:"):
+            path["group"] = line[11:].strip()
+        elif line.startswith("Path Type:"):
+            path["type"] = line[10:].strip().split(" ")[0]
+        elif line.startswith("Scenario:"):
+            path["mode"] = line[9:].strip()
+        else:
+            match = SLACK_REGEX.match(line)
+            if match is None:
+                continue
+            slack = float(match.group(1))
+            key = (path["mode"], path["group"], path["type"])
+            stat = stats.setdefault(key, {"wns": slack, "tns": 0.0, "violations": 0, "paths": 0})
+            stat["wns"] = min(stat["wns"], slack)
+            stat["paths"] += 1
+            if slack < 0:
+                stat["tns"] += slack
+                stat["violations"] += 1
+
+            # Heap of worst paths: the best of them is on top to be replaced
+            heap = worst.setdefault(key, [])
+            item = (-slack, stat["paths"], path["start"], path["end"])
+            if len(heap) < QOR_MAX_PATHS:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    return stats, worst
+
+
+def __parse_attr_report(fd, mode: str, prefix: str) -> list:
+    """
+    Parses numeric attributes of report_qor or report_area output.
+    :param fd: Opened report
+    :param mode: Mode of report (overridden by "Scenario" of DMSA reports)
+    :param prefix: Prefix of metric names (e.g. "qor")
+    :return: List of metrics (mode, path group, name, value)
+    """
+    metrics = []
+    group = ""
+    prev = ""
+    for line in fd:
+        stripped = line.strip()
+        # Section heading is underlined by dashes
+        if stripped.startswith("---") and prev and ":" not in prev:
+            group_match = re.match(r"Timing Path Group '(.*)'", prev)
+            group = group_match.group(1) if group_match else ""
+        elif stripped.startswith("Scenario"):
+            scenario = re.match(r"Scenario\s*:?\s*'?([^'\s]+)", stripped)
+            if scenario is not None:
+                mode = scenario.group(1)
+        else:
+            match = ATTR_REGEX.match(line)
+            if match is not None:
+                name = f"{prefix}.{__normalize_name(match.group(1))}"
+                metrics.append((mode, group, name, float(match.group(2))))
+        if stripped:
+            prev = stripped
+    return metrics
+
+
+def __parse_power_report(fd, mode: str) -> list:
+    """
+    Parses power summary of report_power output. Powers are converted to Watts.
+    :param fd: Opened report
+    :param mode: Mode of report
+    :return: List of metrics (mode, path group, name, value)
+    """
+    metrics = []
+    for line in fd:
+        if "Power" not in line:
+            continue
+        match = POWER_REGEX.match(line)
+        if match is not None:
+            label, value, unit = match.groups()
+            value = float(value) * POWER_UNITS.get(unit or "W", 1)
+            metrics.append((mode, "", f"power.{__normalize_name(label)}", value))
+    return metrics
+
+
+def qor_db_connect(db_file: str = None) -> sqlite3.Connection:
+    """
+    Opens QoR database, creates it if it does not exist.
+    :param db_file: Path to the database, default is TS_QOR_DB_FILE in repository root.
+    """
+    if db_file is None:
+        db_file = ts_get_root_rel_path(TsGlobals.TS_QOR_DB_FILE)
+    os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+    conn = sqlite3.connect(db_file, timeout=60)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != QOR_DB_VERSION:
+        # Database of older version is rebuilt
+        with conn:
+            for table in ("paths", "metrics", "reports", "runs"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(QOR_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {QOR_DB_VERSION}")
+    return conn
+
+
+def __ingest_report(conn, run_id: int, path: str, rel_path: str, corners: dict, mode: str):
+    """
+    Ingests single report unless it is ingested already.
+    :return: True if report was ingested, False if it is not QoR report or unchanged.
+    """
+    st = os.stat(path)
+    row = conn.execute(
+        "SELECT id, size, mtime_ns FROM reports WHERE run_id = ? AND path = ?",
+        (run_id, rel_path),
+    ).fetchone()
+    if row is not None and row["size"] == st.st_size and row["mtime_ns"] == st.st_mtime_ns:
+        ts_debug(f"Report already ingested: {rel_path}")
+        return False
+
+    report_type = __get_report_type(path)
+    if report_type is None:
+        return False
+
+    ts_debug(f"Ingesting {report_type} report: {rel_path}")
+    paths = []
+    with __open_report(path) as fd:
+        if report_type == "timing":
+            stats, worst = __parse_timing_report(fd, mode)
+            metrics = [
+                (m, group, f"timing.{path_type}.{name}", value)
+                for (m, group, path_type), stat in stats.items()
+                for name, value in stat.items()
+            ]
+            paths = [
+                (m, group, path_type, -item[0], item[2], item[3])
+                for (m, group, path_type), heap in worst.items()
+                for item in heap
+            ]
+        elif report_type == "power":
+            metrics = __parse_power_report(fd, mode)
+        else:
+            metrics = __parse_attr_report(fd, mode, report_type)
+
+    with conn:
+        if row is not None:
+            conn.execute("DELETE FROM reports WHERE id = ?", (row["id"],))
+        report_id = conn.execute(
+            "INSERT INTO reports (run_id, path, type, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+            (run_id, rel_path, report_type, st.st_size, st.st_mtime_ns),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (report_id, run_id, m, corners.get(m, ""), group, name, value)
+                for m, group, name, value in metrics
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO paths VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (report_id, run_id, m, corners.get(m, ""), group, path_type, slack, sp, ep)
+                for m, group, path_type, slack, sp, ep in paths
+            ),
+        )
+    return True
+
+
+def ingest_qor_reports(
+    flow: str,
+    runcode: str,
+    reports_dir: str,
+    db_file: str = None,
+    default_mode: str = None,
+    design: str = None,
+):
+    """
+    Ingests timing, QoR, area and power reports of a run to QoR database. Reports are
+    recognized by their header, unchanged reports are skipped. Mode of report is taken
+    from its path (mode names of design config file) or from DMSA scenario.
+    Failures are reported as warnings so that they never fail the flow.
+    :param flow: Flow type (e.g. "syn", "sta")
+    :param runcode: Runcode of the run
+    :param reports_dir: Reports directory of the run
+    :param db_file: Path to QoR database, default is TS_QOR_DB_FILE in repository root.
+    :param default_mode: Mode of reports whose path does not contain mode name
+    :param design: Design target
+    """
+    corners = {}
+    if TsGlobals.TS_DESIGN_CFG is not None:
+        corners = {m["name"]: m["corner"] for m in TsGlobals.TS_DESIGN_CFG["design"]["modes"]}
+
+    try:
+        conn = qor_db_connect(db_file)
+        with conn:
+            conn.execute(
+                "INSERT INTO runs (flow, runcode, design, time) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (flow, runcode) DO UPDATE SET time = excluded.time",
+                (flow, runcode, design, time.time()),
+            )
+        run_id = conn.execute(
+            "SELECT id FROM runs WHERE flow = ? AND runcode = ?", (flow, runcode)
+        ).fetchone()["id"]
+
+        found = set()
+        ingested = 0
+        for root, _, files in os.walk(reports_dir):
+            for file in sorted(files):
+                path = os.path.join(root, file)
+                rel_path = os.path.relpath(path, reports_dir)
+                found.add(rel_path)
+                mode = __get_report_mode(rel_path, corners, default_mode or "")
+                try:
+                    ingested += __ingest_report(conn, run_id, path, rel_path, corners, mode)
+                except (OSError, EOFError, ValueError) as e:
+                    ts_warning(TsWarnCode.GENERIC, f"Report '{path}' not ingested: {e}")
+
+        # Reports removed since previous ingestion
+        with conn:
+            for row in conn.execute(
+                "SELECT id, path FROM reports WHERE run_id = ?", (run_id,)
+            ).fetchall():
+                if row["path"] not in found:
+                    conn.execute("DELETE FROM reports WHERE id = ?", (row["id"],))
+        conn.close()
+    except (OSError, sqlite3.Error) as e:
+        ts_warning(TsWarnCode.GENERIC, f"Reports of runcode '{runcode}' not ingested: {e}")
+        return
+
+    ts_info(
+        TsInfoCode.GENERIC,
+        f"Ingested {ingested} reports of {flow} runcode '{runcode}' to QoR database",
+    )
+
+
+def get_qor_runs(conn, flow: str = None) -> list:
+    """
+    Returns runs in QoR database ordered by time of ingestion.
+    :param flow: Flow type, None for all flows
+    """
+    return conn.execute(
+        "SELECT runs.*, COUNT(reports.id) AS reports FROM runs "
+        "LEFT JOIN reports ON reports.run_id = runs.id "
+        "WHERE ? IS NULL OR flow = ? GROUP BY runs.id ORDER BY time",
+        (flow, flow),
+    ).fetchall()
+
+
+def get_qor_trend(
+    conn, flow: str, metric: str, mode: str = None, group: str = None, last: int = None
+) -> list:
+    """
+    Returns values of metrics across runcodes ordered by time of ingestion.
+    :param flow: Flow type
+    :param metric: Metric name, glob pattern (e.g. "timing.max.*")
+    :param mode: Mode, None for all modes
+    :param group: Path group, None for all groups
+    :param last: Number of most recent runcodes, None for all
+    """
+    return conn.execute(
+        "SELECT runs.runcode, runs.time, reports.path AS report, metrics.mode, "
+        "metrics.corner, metrics.path_group, metrics.name, metrics.value FROM metrics "
+        "JOIN runs ON runs.id = metrics.run_id "
+        "JOIN reports ON reports.id = metrics.report_id "
+        "WHERE runs.flow = ? AND metrics.name GLOB ? "
+        "AND (? IS NULL OR metrics.mode = ?) AND (? IS NULL OR metrics.path_group = ?) "
+        "AND runs.id IN (SELECT id FROM runs WHERE flow = ? ORDER BY time DESC LIMIT ?) "
+        "ORDER BY metrics.name, metrics.mode, metrics.path_group, reports.path, runs.time",
+        (flow, metric, mode, mode, group, group, flow, -1 if last is None else last),
+    ).fetchall()
+
+
+def get_qor_diff(conn, flow: str, runcode_a: str, runcode_b: str, metric: str = "*") -> list:
+    """
+    Returns metrics of two runcodes side by side. Metrics are matched by report path,
+    mode, path group and name, missing values are None.
+    :param flow: Flow type
+    :param runcode_a: Runcode compared
+    :param runcode_b: Runcode compared to
+    :param metric: Metric name, glob pattern
+    """
+    query = (
+        "SELECT reports.path AS report, metrics.mode, metrics.corner, metrics.path_group, "
+        "metrics.name, metrics.value FROM metrics "
+        "JOIN runs ON runs.id = metrics.run_id "
+        "JOIN reports ON reports.id = metrics.report_id "
+        "WHERE runs.flow = ? AND runs.runcode = ? AND metrics.name GLOB ?"
+    )
+    diff = {}
+    for i, runcode in enumerate((runcode_a, runcode_b)):
+        for row in conn.execute(query, (flow, runcode, metric)):
+            key = (row["name"], row["mode"], row["corner"], row["path_group"], row["report"])
+            diff.setdefault(key, [None, None])[i] = row["value"]
+    return [(*key, a, b) for key, (a, b) in sorted(diff.items())]
+
+
+def get_qor_paths(conn, flow: str, runcode: str, group: str = None, limit: int = 20) -> list:
+    """
+    Returns worst timing paths of a runcode.
+    :param flow: Flow type
+    :param runcode: Runcode
+    :param group: Path group, None for all groups
+    :param limit: Maximal number of paths
+    """
+    return conn.execute(
+        "SELECT paths.* FROM paths JOIN runs ON runs.id = paths.run_id "
+        "WHERE runs.flow = ? AND runs.runcode = ? AND (? IS NULL OR path_group = ?) "
+        "ORDER BY slack LIMIT ?",
+        (flow, runcode, group, group, limit),
+    ).fetchall()
+
+
+def get_qor_wns_by_mode(conn, flow: str, runcode: str) -> dict:
+    """
+    Returns worst setup and hold slack of a runcode by mode.
+    :param flow: Flow type
+    :param runcode: Runcode
+    :return: Dictionary {mode: {"max": WNS of setup, "min": WNS of hold}}
+    """
+    wns = {}
+    for row in conn.execute(
+        "SELECT metrics.mode, metrics.name, MIN(metrics.value) AS value FROM metrics "
+        "JOIN runs ON runs.id = metrics.run_id "
+        "WHERE runs.flow = ? AND runs.runcode = ? "
+        "AND metrics.name IN ('timing.max.wns', 'timing.min.wns') "
+        "GROUP BY metrics.mode, metrics.name",
+        (flow, runcode),
+    ):
+        wns.setdefault(row["mode"], {})[row["name"].split(".")[1]] = row["value"]
+    return wns
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Incremental release of flow results
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import contextlib
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from .ts_hw_global_vars import TsGlobals
+from .ts_hw_logging import TsErrCode, TsInfoCode, ts_debug, ts_info, ts_throw_error
+
+# Version of release manifest format. Increment when format changes!
+RELEASE_MANIFEST_VERSION = 1
+
+# Name of release manifest file in release directory
+RELEASE_MANIFEST_FILE = "release_manifest.json"
+
+# Ways of releasing files (see --release-mode), "auto" tries reflink and copy in order.
+# Hardlink is used only on request, hardlinked files change when run directory changes.
+RELEASE_MODES = ["auto", "reflink", "hardlink", "copy"]
+
+# Number of files released in parallel
+RELEASE_JOBS = 8
+
+# Buffer size for copying and hashing files
+RELEASE_BUFFER_SIZE = 16 * 1024 * 1024
+
+# Sub-directories of release directory and flow directories they are released from
+RELEASE_SUB_DIRS = {"reports": "REPORTS_DIR", "logs": "LOGS_DIR", "results": "RESULTS_DIR"}
+
+# ioctl cloning file content (Linux, e.g. Btrfs or XFS)
+__FICLONE = 0x40049409
+
+
+def __hash_file(path: str, out_fd=None) -> str:
+    """
+    Returns SHA-256 of file content.
+    :param path: Path to the file
+    :param out_fd: File object to which content is copied while hashing, None to only hash.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as fd:
+        while True:
+            chunk = fd.read(RELEASE_BUFFER_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            if out_fd is not None:
+                out_fd.write(chunk)
+    return digest.hexdigest()
+
+
+def __reflink(src: str, dst: str):
+    """
+    Clones content of 'src' to new file 'dst' (copy-on-write).
+    """
+    with open(src, "rb") as src_fd, open(dst, "wb") as dst_fd:
+        fcntl.ioctl(dst_fd.fileno(), __FICLONE, src_fd.fileno())
+
+
+def __release_file(src: str, dst: str, modes: list) -> tuple:
+    """
+    Releases single file. File is created next to the destination and renamed over it,
+    so that readers of a previous release never see partially written file.
+    :param src: Source file
+    :param dst: Destination file
+    :param modes: Ways of releasing tried in order ("reflink", "hardlink", "copy")
+    :return: Tuple (way the file was released, SHA-256 of the file)
+    """
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(tmp)
+
+    for mode in modes:
+        try:
+            if mode == "reflink":
+                __reflink(src, tmp)
+                shutil.copystat(src, tmp)
+                digest = __hash_file(src)
+            elif mode == "hardlink":
+                os.link(src, tmp)
+                digest = __hash_file(src)
+            else:
+                with open(tmp, "wb") as out_fd:
+                    digest = __hash_file(src, out_fd)
+                shutil.copystat(src, tmp)
+        except OSError as e:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            # Cloning or linking not supported by file system -> Try next way
+            if mode != "copy" and e.errno in (
+                errno.EXDEV,
+                errno.EOPNOTSUPP,
+                errno.ENOTTY,
+                errno.EINVAL,
+                errno.EPERM,
+                errno.EMLINK,
+            ):
+                continue
+            raise
+        os.replace(tmp, dst)
+        return mode, digest
+
+    raise OSError(errno.EOPNOTSUPP, f"No release mode applicable to '{src}'")
+
+
+def __get_release_modes(mode: str, src_dir: str, release_dir: str) -> list:
+    """
+    Returns ways of releasing files tried in order.
+    :param mode: Release mode (see RELEASE_MODES)
+    :param src_dir: Source directory
+    :param release_dir: Release directory
+    """
+    if mode != "auto":
+        return [mode, "copy"] if mode != "copy" else ["copy"]
+
+    # Files can be only copied between file systems
+    if os.stat(src_dir).st_dev != os.stat(release_dir).st_dev:
+        return ["copy"]
+    return ["reflink", "copy"]
+
+
+def __load_manifest(release_dir: str) -> dict:
+    """
+    Loads manifest of previous release.
+    :param release_dir: Release directory
+    :return: Released files by path relative to release directory, empty if there is no
+             previous release.
+    """
+    with contextlib.suppress(OSError, ValueError):
+        with open(os.path.join(release_dir, RELEASE_MANIFEST_FILE)) as fd:
+            manifest = json.load(fd)
+        if manifest.get("version") == RELEASE_MANIFEST_VERSION:
+            return manifest["files"]
+    return {}
+
+
+def __store_manifest(release_dir: str, files: dict):
+    """
+    Stores manifest of release.
+    :param release_dir: Release directory
+    :param files: Released files by path relative to release directory
+    """
+    path = os.path.join(release_dir, RELEASE_MANIFEST_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as fd:
+        json.dump(
+            {"version": RELEASE_MANIFEST_VERSION, "algorithm": "sha256", "files": files},
+            fd,
+            indent=4,
+            sort_keys=True,
+        )
+    os.replace(tmp_path, path)
+
+
+def __is_unchanged(src: str, dst: str, st: os.stat_result, prev: dict, modes: list):
+    """
+    Checks whether released file is same as the source file.
+    :param src: Source file
+    :param dst: Released file
+    :param st: Status of source file
+    :param prev: Manifest entry of released file, None if it was not released.
+    :param modes: Ways of releasing tried in order
+    :return: SHA-256 of the file if it is unchanged, None otherwise
+    """
+    if prev is None or prev["size"] != st.st_size:
+        return None
+    try:
+        if os.stat(dst).st_size != prev["size"]:
+            return None
+        # File hardlinked by previous release shall be replaced unless hardlinking
+        if "hardlink" not in modes and os.path.samefile(src, dst):
+            return None
+    except OSError:
+        return None
+
+    # Source not touched since previous release -> No need to read it
+    if prev.get("mtime_ns") == st.st_mtime_ns:
+        return prev["sha256"]
+
+    digest = __hash_file(src)
+    return digest if digest == prev["sha256"] else None
+
+
+def __release_entry(src: str, dst: str, prev: dict, modes: list) -> tuple:
+    """
+    Releases single file unless it is unchanged since previous release.
+    :return: Tuple (way the file was released or "unchanged", manifest entry)
+    """
+    st = os.stat(src)
+    digest = __is_unchanged(src, dst, st, prev, modes)
+    if digest is not None:
+        mode = "unchanged"
+    else:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        mode, digest = __release_file(src, dst, modes)
+    return mode, {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+
+
+def release_dirs(src_dirs: dict, release_dir: str, mode: str = "auto"):
+    """
+    Releases directories to release directory. Unchanged files (same size and hash as in
+    previous release) are skipped, other files are reflinked when release directory is on
+    the same file system, copied otherwise (hardlinked only with "hardlink" mode). Files are
+    released in parallel.
+    Manifest with checksums of released files is stored in release directory.
+    :param src_dirs: Source directories by sub-directory of release directory
+    :param release_dir: Release directory
+    :param mode: Release mode (see RELEASE_MODES)
+    """
+    os.makedirs(release_dir, exist_ok=True)
+    prev_files = __load_manifest(release_dir)
+
+    jobs = []
+    for sub_dir, src_dir in src_dirs.items():
+        if not os.path.isdir(src_dir):
+            ts_throw_error(TsErrCode.GENERIC, f"Release source '{src_dir}' does not exist!")
+        modes = __get_release_modes(mode, src_dir, release_dir)
+        ts_debug(f"Releasing '{src_dir}' (modes: {modes})")
+        for root, _, files in os.walk(src_dir, followlinks=True):
+            for file in files:
+                src = os.path.join(root, file)
+                rel = os.path.join(sub_dir, os.path.relpath(src, src_dir))
+                jobs.append((rel, src, os.path.join(release_dir, rel), modes))
+
+    files = {}
+    stats = {}
+    with ThreadPoolExecutor(max_workers=RELEASE_JOBS) as executor:
+        futures = [
+            (rel, executor.submit(__release_entry, src, dst, prev_files.get(rel), modes))
+            for rel, src, dst, modes in jobs
+        ]
+        for rel, future in futures:
+            try:
+                file_mode, files[rel] = future.result()
+            except OSError as e:
+                ts_throw_error(TsErrCode.GENERIC, f"Failed to release '{rel}': {e}")
+            stats[file_mode] = stats.get(file_mode, 0) + 1
+
+    __store_manifest(release_dir, files)
+    ts_info(
+        TsInfoCode.GENERIC,
+        f"Released {len(files)} files to '{release_dir}' "
+        f"({', '.join(f'{m}: {c}' for m, c in sorted(stats.items()))})",
+    )
+
+
+def release_flow(flow_dir_type: str, release_dir: str, mode: str = "auto"):
+    """
+    Releases reports, logs and results of a flow.
+    :param flow_dir_type: Flow type (e.g. "syn", "sta")
+    :param release_dir: Release directory
+    :param mode: Release mode (see RELEASE_MODES)
+    """
+    src_dirs = {
+        sub_dir: getattr(TsGlobals, f"TS_{str(flow_dir_type).upper()}_{var}")
+        for sub_dir, var in RELEASE_SUB_DIRS.items()
+    }
+    release_dirs(src_dirs, release_dir, mode)
+
+
+def verify_release(release_dir: str, full: bool = False) -> list:
+    """
+    Verifies released files towards release manifest.
+    :param release_dir: Release directory
+    :param full: Compare checksums of all files. Only sizes are compared otherwise,
+                 checksums are compared only for files modified after release.
+    :return: List of tuples (file relative to release directory, problem)
+    """
+    files = __load_manifest(release_dir)
+    if not files:
+        ts_throw_error(
+            TsErrCode.GENERIC, f"No release manifest found in '{release_dir}'!"
+        )
+
+    def __verify(rel: str, entry: dict):
+        path = os.path.join(release_dir, rel)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return rel, "missing"
+        if st.st_size != entry["size"]:
+            return rel, "size differs"
+        if (full or st.st_mtime_ns != entry["mtime_ns"]) and __hash_file(
+            path
+        ) != entry["sha256"]:
+            return rel, "checksum differs"
+        return None
+
+    with ThreadPoolExecutor(max_workers=RELEASE_JOBS) as executor:
+        results = executor.map(lambda x: __verify(*x), sorted(files.items()))
+        return [x for x in results if x is not None]
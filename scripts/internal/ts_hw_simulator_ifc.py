@@ -7,12 +7,19 @@
 ####################################################################################################
 
 import contextlib
+import hashlib
+import json
+import logging
 import os
 import pickle
 import re
 import shutil
 import time
-from typing import Tuple
+from argparse import Namespace
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Tuple
 
 from .ts_hw_common import (
     create_log_file_name,
@@ -29,13 +36,15 @@ from .ts_hw_logging import (
     TsColors,
     TsErrCode,
     TsInfoCode,
+    ts_configure_logging,
     ts_debug,
     ts_info,
     ts_print,
     ts_script_bug,
     ts_throw_error,
 )
-from .ts_hw_test_list_files import get_test
+from .ts_hw_metrics import ts_metrics_count, ts_metrics_record_cmd, ts_metrics_record_test
+from .ts_hw_profile import ts_profile_event, ts_span
 
 __SIMULATOR_COMMANDS = {
     "vcs": {
@@ -107,20 +116,31 @@ __ALLOWED_FILE_EXTENSIONS = {
 
 __SIM_CONFIG_FILES = lambda x, y: os.path.join(y, {"vcs": "synopsys_sim.setup"}[x])
 
+# Shared simulator config file of a target. Linked to build, elaboration and simulation directories.
+__SHARED_SIM_CONFIG_FILE = lambda x, y, z: os.path.join(
+    ts_get_cfg("build_dir"), f"_ts_flow_{y}_{x}_sim_config_{z}"
+)
+
+# Shared simulator config files already generated by this process: content hash -> path
+__SHARED_SIM_CONFIG_FILES_CACHE = {}
+
 __LIB_FILE_LIST = lambda x: os.path.join(x, "_ts_flow_files_list")
 
-__TARGET_LIBS_LIST = lambda x: os.path.join(
-    ts_get_cfg("build_dir"), f"_ts_flow_{x}_libs_list"
+__TARGET_MANIFEST = lambda x: os.path.join(
+    ts_get_cfg("build_dir"), f"_ts_flow_{x}_manifest.json"
 )
 
+# Version of target manifest format. Increment when format changes!
+__TARGET_MANIFEST_VERSION = 1
+
 __ELAB_CMD_FILE = lambda x: os.path.join(x, "_ts_flow_elaboration_command")
 
 __REF_ELAB_DIR = lambda x: os.path.join(x, "_ts_flow_reference_elaboration_directory")
 
-__VHDL_ONLY = lambda x: os.path.join(x, "_ts_flow_this_lib_is_vhdl_only")
-
 __SIM_CMD_FILE = lambda x: os.path.join(x, "sim_cmd_file.do")
 
+__SIM_RUN_INFO = lambda x: os.path.join(x, "_ts_flow_simulation_run_info.json")
+
 __GUI_COMPILE_OPTIONS = {
     None: {
         "languages": {
@@ -146,15 +166,89 @@ __GUI_COMPILE_OPTIONS = {
 }
 
 
-def __get_gui_simulation_options() -> list:
+@dataclass(frozen=True)
+class TsSimRunContext:
+    """
+    Snapshot of everything needed to build elaboration and simulation commands. It is built
+    once in main process and shipped once to each worker process by pool initializer, so
+    command building does not depend on state inherited by fork. Content must not be modified.
+    """
+
+    # Global simulation configuration (merged with command line arguments)
+    cfg: dict
+    # Configuration of simulated target (inheritance resolved)
+    target_cfg: dict
+    # Simulator name
+    simulator: str
+    # Simulator specific commands
+    sim_cmds: dict
+    # Options of selected simulation verbosity level
+    verbosity_cfg: dict
+    # UVM enabled globally or for the target
+    uvm_enabled: bool
+    # List of target libraries: (library name, library directory)
+    libs: tuple
+    # All target libraries contain VHDL files only
+    vhdl_only: bool
+    # Definitions of available tests by test name
+    test_defs: dict
+
+
+def ts_get_sim_run_context() -> TsSimRunContext:
+    """
+    Returns simulation run context. Builds it from current configuration on first call.
+    Must be called after compilation (library list of a target is read from build directory).
+    """
+    if TsGlobals.TS_SIM_RUN_CONTEXT is not None:
+        return TsGlobals.TS_SIM_RUN_CONTEXT
+
+    ts_debug("Building simulation run context")
+    manifest = __load_target_manifest()
+
+    simulator = ts_get_cfg("simulator")
+    TsGlobals.TS_SIM_RUN_CONTEXT = TsSimRunContext(
+        cfg=ts_get_cfg(),
+        target_cfg=ts_get_cfg("targets")[ts_get_cfg("target")],
+        simulator=simulator,
+        sim_cmds=__SIMULATOR_COMMANDS[simulator],
+        verbosity_cfg=ts_get_cfg("sim_verbosity_levels")[ts_get_cfg("sim_verbosity")],
+        uvm_enabled=bool(ts_is_uvm_enabled()),
+        libs=tuple((lib["name"], lib["dir"]) for lib in manifest["libs"]),
+        vhdl_only=all(lib["vhdl_only"] for lib in manifest["libs"]),
+        test_defs={
+            name: dict(test) for name, test in (TsGlobals.TS_TEST_DEFS or {}).items()
+        },
+    )
+    return TsGlobals.TS_SIM_RUN_CONTEXT
+
+
+def ts_init_sim_run_context(ctx: TsSimRunContext):
+    """
+    Installs simulation run context in a worker process. Intended as process pool initializer.
+    :param ctx: Simulation run context built by main process.
+    """
+    TsGlobals.TS_SIM_RUN_CONTEXT = ctx
+    TsGlobals.TS_SIM_CFG = ctx.cfg
+    TsGlobals.TS_TEST_DEFS = {
+        name: MappingProxyType(test) for name, test in ctx.test_defs.items()
+    }
+
+    # Worker which is not forked does not have logging configured
+    if not logging.getLogger().handlers:
+        ts_configure_logging(
+            Namespace(verbose=ctx.cfg["verbose"], no_color=ctx.cfg["no_color"])
+        )
+
+
+def __get_gui_simulation_options(cfg: dict) -> list:
     gui_opts = []
 
-    gui = ts_get_cfg("gui")
+    gui = cfg["gui"]
     if gui is not None:
 
         gui_opts.append(f"-gui={gui}")
 
-        session_file = ts_get_cfg("session_file")
+        session_file = cfg.get("session_file")
         if session_file is not None:
             session_file = ts_get_root_rel_path(session_file)
 
@@ -168,9 +262,9 @@ def __get_gui_simulation_options() -> list:
     return gui_opts
 
 
-def __generate_lib_list_file():
+def __get_target_libs_list() -> list:
     """
-    Create list of librairies used for current target and dump it to a file
+    Returns list of libraries used for current target: (library name, library directory)
     """
     __add_lib = lambda x: (x.upper(), os.path.join(ts_get_cfg("build_dir"), x))
 
@@ -179,14 +273,120 @@ def __generate_lib_list_file():
         target_libs_list.append(__add_lib(lib))
     if ts_is_uvm_enabled():
         target_libs_list.append(__add_lib("uvm"))
+    return target_libs_list
+
+
+def __write_target_manifest(vhdl_only_libs: set):
+    """
+    Dumps build metadata of current target (libraries, VHDL only flags and last compilation
+    time of each library) to target manifest. Shall be called after compilation.
+    :param vhdl_only_libs: Names of libraries which contain VHDL files only.
+    """
+    libs = []
+    for lib_name, lib_dir in __get_target_libs_list():
+        try:
+            mtime = os.path.getmtime(__LIB_FILE_LIST(lib_dir))
+        except FileNotFoundError:
+            mtime = None
+        libs.append(
+            {
+                "name": lib_name,
+                "dir": lib_dir,
+                "vhdl_only": lib_name.lower() in vhdl_only_libs,
+                "mtime": mtime,
+            }
+        )
 
-    with open(__TARGET_LIBS_LIST(ts_get_cfg("target")), "wb") as fd:
-        pickle.dump(target_libs_list, fd)
+    manifest = {
+        "version": __TARGET_MANIFEST_VERSION,
+        "target": ts_get_cfg("target"),
+        "libs": libs,
+    }
+
+    with open(__TARGET_MANIFEST(ts_get_cfg("target")), "w") as fd:
+        json.dump(manifest, fd, indent=4)
 
+    TsGlobals.TS_SIM_TARGET_MANIFEST = manifest
 
-def __generate_sim_config_file(directory: str):
+
+def __load_target_manifest() -> dict:
+    """
+    Loads target manifest written by compilation. Manifest is read only once per process.
+    """
+    if TsGlobals.TS_SIM_TARGET_MANIFEST is not None:
+        return TsGlobals.TS_SIM_TARGET_MANIFEST
+
+    manifest_path = __TARGET_MANIFEST(ts_get_cfg("target"))
+    ts_debug(f"Loading target manifest: {manifest_path}")
+    try:
+        with open(manifest_path) as fd:
+            manifest = json.load(fd)
+    except FileNotFoundError:
+        ts_throw_error(TsErrCode.ERR_ELB_4, manifest_path, "not found")
+    except ValueError as exc:
+        ts_throw_error(TsErrCode.ERR_ELB_4, manifest_path, exc)
+
+    if manifest.get("version") != __TARGET_MANIFEST_VERSION:
+        ts_throw_error(
+            TsErrCode.GENERIC,
+            f"Target manifest '{manifest_path}' has unsupported version "
+            f"'{manifest.get('version')}'. Run 'ts_sim_compile.py' to re-create it!",
+        )
+
+    for lib in manifest["libs"]:
+        ts_debug(f"Checking library compilation directory. '{lib['name']}': {lib['dir']}")
+        if not os.path.isdir(lib["dir"]):
+            ts_throw_error(
+                TsErrCode.GENERIC,
+                f"Library compilation directory not found! '{lib['name']}': {lib['dir']}",
+            )
+
+    TsGlobals.TS_SIM_TARGET_MANIFEST = manifest
+    return manifest
+
+
+def __is_elab_up_to_date(elab_dir: str) -> bool:
+    """
+    Checks elaboration directory is newer than last compilation of each target library.
+    :param elab_dir: Elaboration directory
+    """
+    manifest = __load_target_manifest()
+    # Simulator config file is shared between directories and its time-stamp does not tell
+    # when the elaboration was executed. Elaboration command file is saved after elaboration.
+    elab_time = os.path.getmtime(__ELAB_CMD_FILE(elab_dir))
+    return all(
+        lib["mtime"] is None or lib["mtime"] <= elab_time for lib in manifest["libs"]
+    )
+
+
+def __link_file(src: str, dst: str):
+    """
+    Places 'src' file to 'dst' path as hard link. Falls back to symbolic link, and to copy
+    when links are not supported by the file system.
+    :param src: Source file path
+    :param dst: Destination file path
+    """
+    with contextlib.suppress(FileNotFoundError):
+        if os.path.samefile(src, dst):
+            return
+        os.remove(dst)
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        try:
+            os.symlink(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+
+def __generate_sim_config_file(directory: str, target_libs_list: list):
     """
     Generates simulator specific config file (if needed).
+    Config file is generated only once per target and content. It is shared by all
+    directories via links and re-generated only when its content changes.
+    :param directory: Directory where to place the config file
+    :param target_libs_list: List of target libraries: (library name, library directory)
     """
     simulator = ts_get_cfg("simulator")
 
@@ -206,13 +406,27 @@ def __generate_sim_config_file(directory: str):
         lines.append(f"DEFAULT : {ts_get_cfg('build_dir')}")
 
         lines.append("-- Library mapping:")
-        with open(__TARGET_LIBS_LIST(ts_get_cfg("target")), "rb") as fd:
-            target_libs_list = pickle.load(fd)
         for lib, lib_dir in target_libs_list:
             lines.append(f"{lib} : {lib_dir}")
 
-        with open(__SIM_CONFIG_FILES(simulator, directory), "w") as fd:
-            fd.writelines(map(lambda x: x + "\n", lines))
+        content = "".join(map(lambda x: x + "\n", lines))
+        content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
+
+        shared_file = __SHARED_SIM_CONFIG_FILES_CACHE.get(content_hash)
+        if shared_file is None:
+            shared_file = __SHARED_SIM_CONFIG_FILE(
+                simulator, ts_get_cfg("target"), content_hash
+            )
+            if not os.path.isfile(shared_file):
+                ts_debug(f"Generating shared simulator config file: {shared_file}")
+                # Write atomically, other processes may be linking the file
+                tmp_file = f"{shared_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "w") as fd:
+                    fd.write(content)
+                os.replace(tmp_file, shared_file)
+            __SHARED_SIM_CONFIG_FILES_CACHE[content_hash] = shared_file
+
+        __link_file(shared_file, __SIM_CONFIG_FILES(simulator, directory))
 
     else:
         ts_script_bug(
@@ -220,11 +434,12 @@ def __generate_sim_config_file(directory: str):
         )
 
 
-def __add_comp_sim_elab_opts(cfg_dict: dict, kwd: str) -> list:
+def __add_comp_sim_elab_opts(cfg_dict: dict, kwd: str, simulator: str) -> list:
     """
     Adds comp_options, elab_options or sim_options to compiler/elaborator/simulator command
     :param cfg_dict: Dictionary with "elab_options", "comp_options" or "sim_options" values.
     :param kwd: Keyword to choose from the dictionary.
+    :param simulator: Simulator name.
     """
     try:
         cfg_dict[kwd]
@@ -232,19 +447,18 @@ def __add_comp_sim_elab_opts(cfg_dict: dict, kwd: str) -> list:
         return []
 
     opts = []
-    for item in ("common", ts_get_cfg("simulator")):
+    for item in ("common", simulator):
         value = cfg_dict[kwd].get(item)
         if value is not None:
             opts.append(value)
     return opts
 
 
-def __add_generics(cfg_dict: dict) -> list:
+def __add_generics(cfg_dict: dict, simulator: str) -> list:
     """
     Adds generics (VHDL) to elaboration command line.
     :param cfg_dict: Dictionary with generics configuration
-    :param gfile: Name of generics file
-    :param elab_dir: Path to directory with binary for current directory.
+    :param simulator: Simulator name.
     """
     try:
         cfg_dict["generics"]
@@ -253,8 +467,6 @@ def __add_generics(cfg_dict: dict) -> list:
 
     cmd = []
 
-    simulator = ts_get_cfg("simulator")
-
     if simulator == "vcs":
 
         for gen_name, gen_val in cfg_dict["generics"].items():
@@ -283,10 +495,11 @@ def __add_generics(cfg_dict: dict) -> list:
     return cmd
 
 
-def __add_parameters(cfg_dict: dict) -> list:
+def __add_parameters(cfg_dict: dict, simulator: str) -> list:
     """
     Add parameters (Verilog) to elaboration command line.
     :param cfg_dict: Dictionary with generics configuration
+    :param simulator: Simulator name.
     """
     try:
         cfg_dict["parameters"]
@@ -295,8 +508,6 @@ def __add_parameters(cfg_dict: dict) -> list:
 
     cmd = []
 
-    simulator = ts_get_cfg("simulator")
-
     if simulator == "vcs":
 
         for param_name, param_val in cfg_dict["parameters"].items():
@@ -313,6 +524,46 @@ def __add_parameters(cfg_dict: dict) -> list:
     return cmd
 
 
+@lru_cache(maxsize=None)
+def __which(command: str) -> Optional[str]:
+    """
+    Looks-up command in PATH. Lookup is executed only once per process for each command.
+    :param command: Command name
+    """
+    return shutil.which(command)
+
+
+def __freeze(obj):
+    """
+    Converts (nested) dictionaries and lists to hashable tuples.
+    :param obj: Object to convert
+    """
+    if isinstance(obj, dict):
+        return tuple((k, __freeze(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return tuple(map(__freeze, obj))
+    return obj
+
+
+def __get_compile_command_key(language: str, source_file_dict: dict) -> tuple:
+    """
+    Returns hashable key of compile command of a source file. Files with equal keys
+    are compiled by equal compile command.
+    :param language: Language of source file
+    :param source_file_dict: Source file dictionary (entry of "source_list" list)
+    """
+    key = [
+        language,
+        source_file_dict["library"],
+        __freeze(source_file_dict.get("comp_options")),
+    ]
+    # Macro definitions and include files are verilog only!
+    if language in ("verilog", "system_verilog"):
+        key.append(__freeze(source_file_dict.get("define")))
+        key.append(__freeze(source_file_dict.get("include_dirs")))
+    return tuple(key)
+
+
 def __build_compile_command(
     language: str, sim_cmds_dict: dict, source_file_dict: dict, log_file_path: str
 ) -> str:
@@ -367,7 +618,7 @@ def __build_compile_command(
 
     # Check compile command can be found
     comp_cmd_short, *_ = comp_cmd[0].split(maxsplit=1)
-    if not shutil.which(comp_cmd_short):
+    if not __which(comp_cmd_short):
         ts_throw_error(TsErrCode.ERR_CMP_3, comp_cmd_short, ts_get_cfg("simulator"))
 
     # Add work library
@@ -416,7 +667,9 @@ def __build_compile_command(
         ts_get_cfg("targets")[ts_get_cfg("target")],
         source_file_dict,
     ):
-        comp_cmd.extend(__add_comp_sim_elab_opts(cfg_dict, "comp_options"))
+        comp_cmd.extend(
+            __add_comp_sim_elab_opts(cfg_dict, "comp_options", ts_get_cfg("simulator"))
+        )
 
     # Add Extra compile options from command line
     comp_cmd.append(ts_get_cfg("add_comp_options"))
@@ -469,9 +722,10 @@ def __run_uvm_compile() -> int:
     )
 
 
-def __compile_all_files():
+def __compile_all_files() -> set:
     """
     Compiles all source files. If compilation of any file fails, throws an exception.
+    :return: Names of libraries which contain VHDL files only.
     """
 
     def _get_included_files(*elements):
@@ -493,6 +747,8 @@ def __compile_all_files():
                     included_files.append(os.path.join(d, f))
         return included_files
 
+    check_start = time.time_ns()
+
     sim_cmds_dict = __SIMULATOR_COMMANDS[ts_get_cfg("simulator")]
 
     # Temporary log file
@@ -504,6 +760,10 @@ def __compile_all_files():
     )
 
     libs_to_compile = {}
+    vhdl_only_libs = set()
+
+    # Compile commands by command key (see '__get_compile_command_key')
+    comp_cmds = {}
 
     # Compile libraries one after the other
     for lib, source_files in TsGlobals.TS_SIM_SRCS_BY_LIB.items():
@@ -543,8 +803,9 @@ def __compile_all_files():
             os.path.getmtime(f) > lib_last_modification_time for f in included_files
         )
 
-        current_comp_cmd = ""
-        current_file_list = []
+        # Batches of files compiled by single command: (command key, list of files)
+        batches = []
+        batches_by_key = {}
         # Iterate on every file to see if they have to be compiled
         for source_file_dict in source_files:
             ts_debug(f"Checking file: {source_file_dict['full_path']}")
@@ -595,36 +856,42 @@ def __compile_all_files():
                             TsInfoCode.GENERIC,
                             f"Skipping unchanged file {source_file_dict['full_path']}",
                         )
+                        ts_metrics_count("compile_cache_hits")
                         continue
 
-            # Get compilation command of individual file
-            local_comp_cmd = __build_compile_command(
-                language, sim_cmds_dict, source_file_dict, tmp_log_file_path
-            )
+            ts_metrics_count("compile_cache_misses")
 
-            # If file compilation command is different from latest file's add it to list of commands
-            if local_comp_cmd != current_comp_cmd:
-                if current_comp_cmd != "":
-                    libs_to_compile[lib]["compilation_commands"].append(
-                        current_comp_cmd
-                    )
-                    libs_to_compile[lib]["files_to_compile"].append(current_file_list)
-                current_comp_cmd = local_comp_cmd
-                current_file_list = [source_file_dict["full_path"]]
-            # Else add file to list of files
+            # Get compilation command of individual file. Command is built only once
+            # for all files with the same language, library and file specific options.
+            comp_key = __get_compile_command_key(language, source_file_dict)
+            if comp_key not in comp_cmds:
+                comp_cmds[comp_key] = __build_compile_command(
+                    language, sim_cmds_dict, source_file_dict, tmp_log_file_path
+                )
+
+            # Add file to batch with the same command. By default, only adjacent files are
+            # batched so that compilation order given by source list files is kept.
+            if ts_get_cfg("compile_batch_reorder"):
+                batch = batches_by_key.get(comp_key)
+            elif batches and batches[-1][0] == comp_key:
+                batch = batches[-1]
             else:
-                current_file_list.append(source_file_dict["full_path"])
+                batch = None
+
+            if batch is None:
+                batch = (comp_key, [])
+                batches.append(batch)
+                batches_by_key[comp_key] = batch
+            batch[1].append(source_file_dict["full_path"])
 
-        # Flush
-        if current_comp_cmd != "":
-            libs_to_compile[lib]["compilation_commands"].append(current_comp_cmd)
-            libs_to_compile[lib]["files_to_compile"].append(current_file_list)
+        for comp_key, file_list in batches:
+            libs_to_compile[lib]["compilation_commands"].append(comp_cmds[comp_key])
+            libs_to_compile[lib]["files_to_compile"].append(file_list)
 
-        # If lib is made of vhdl files only, create a file in the lib directory
+        # If lib is made of vhdl files only, note it in target manifest
         if vhdl_only:
             ts_debug(f"Lib {lib} is VHDL-only")
-            with open(__VHDL_ONLY(lib_dir), "a"):
-                pass
+            vhdl_only_libs.add(lib.lower())
 
     # Filter out the libs that do not need to be compiled
     libs_to_compile = {
@@ -633,6 +900,8 @@ def __compile_all_files():
         if lib_dict["compilation_commands"]
     }
 
+    ts_profile_event("compile_check", check_start, time.time_ns())
+
     if libs_to_compile:
         ts_info(TsInfoCode.GENERIC, "Compilation is needed.")
 
@@ -651,6 +920,7 @@ def __compile_all_files():
             for comp_cmd, comp_file_list in zip(
                 lib_dict["compilation_commands"], lib_dict["files_to_compile"]
             ):
+                comp_start = time.time_ns()
 
                 final_comp_cmd = comp_cmd + " " + " ".join(comp_file_list)
 
@@ -673,6 +943,10 @@ def __compile_all_files():
                 ) as tmp_log_file:
                     shutil.copyfileobj(tmp_log_file, log_file)
 
+                ts_profile_event(
+                    "compile", comp_start, time.time_ns(), lib=lib, files=len(comp_file_list)
+                )
+
                 # Check compilation result
                 if comp_res != 0:
                     ts_throw_error(TsErrCode.ERR_CMP_2, comp_res)
@@ -697,6 +971,8 @@ def __compile_all_files():
     with contextlib.suppress(FileNotFoundError):
         os.remove(tmp_log_file_path)
 
+    return vhdl_only_libs
+
 
 def __write_log_trailer(log_file_path, exit_code, run_time, log_type):
     """
@@ -735,39 +1011,40 @@ def __generate_coverage_spec_file(dir, top_entity):
 
 
 def __build_elab_command(
-    test: dict, top_entity: str, log_file_path: str = ""
+    ctx: TsSimRunContext, test: dict, log_file_path: str = ""
 ) -> Tuple[str, str]:
     """
     Builds elaboration command.
+    :param ctx: Simulation run context
     :param test: Test object/dictionary (from test list file)
-    :param top_entity: Top design entity to be elaborated.
+    :param log_file_path: Path to elaboration log file
     """
-    cmds = __SIMULATOR_COMMANDS[ts_get_cfg("simulator")]
-    elab_dict = cmds["elaborate"]
+    cfg = ctx.cfg
+    elab_dict = ctx.sim_cmds["elaborate"]
 
     elab_cmd = [elab_dict["command"]]
 
-    if ts_get_cfg("coverage"):
+    if cfg["coverage"]:
         elab_cmd.append(elab_dict["coverage"])
 
-    if ts_get_cfg("compile_debug"):
+    if cfg["compile_debug"]:
         elab_cmd.append(elab_dict["compile_debug"])
 
     # Add common options
-    elab_cmd.append(cmds["common_options"])
+    elab_cmd.append(ctx.sim_cmds["common_options"])
 
     # Add GUI and dump waves options
-    if ts_get_cfg("gui") is not None:
+    if cfg["gui"] is not None:
         elab_cmd.append(elab_dict["gui"])
-    if ts_get_cfg("dump_waves"):
+    if cfg["dump_waves"]:
         elab_cmd.append(elab_dict["dump_waves"])
 
     # Add verbosity options
-    if ts_is_very_verbose():
+    if cfg["verbose"] >= 2:
         elab_cmd.append(elab_dict["verbose"])
 
     # Add license wait option
-    if ts_get_cfg("license_wait"):
+    if cfg["license_wait"]:
         elab_cmd.append(elab_dict["license_wait"])
 
     # Add common options
@@ -775,18 +1052,20 @@ def __build_elab_command(
 
     # Add Global, Target specific, Test specific and Verbosity level specific elab. options
     for cfg_dict in (
-        ts_get_cfg(),
-        ts_get_cfg("targets")[ts_get_cfg("target")],
-        get_test(test["name"], TsGlobals.TS_TEST_LIST),
-        ts_get_cfg("sim_verbosity_levels")[ts_get_cfg("sim_verbosity")],
+        cfg,
+        ctx.target_cfg,
+        ctx.test_defs[test["name"]],
+        ctx.verbosity_cfg,
     ):
-        elab_cmd.extend(__add_comp_sim_elab_opts(cfg_dict, "elab_options"))
+        elab_cmd.extend(
+            __add_comp_sim_elab_opts(cfg_dict, "elab_options", ctx.simulator)
+        )
 
     # Add extra options passed from command line
-    elab_cmd.append(ts_get_cfg("add_elab_options"))
+    elab_cmd.append(cfg["add_elab_options"])
 
     # Add test name generic/parameter (if set)
-    for single_dict in (ts_get_cfg(), ts_get_cfg("targets")[ts_get_cfg("target")]):
+    for single_dict in (cfg, ctx.target_cfg):
         if single_dict["test_name_strategy"] == "generic_parameter":
             for param, item, function in (
                 ("test_name_generic", "generics", __add_generics),
@@ -794,40 +1073,34 @@ def __build_elab_command(
             ):
                 with contextlib.suppress(KeyError):
                     elab_cmd.extend(
-                        function({item: {single_dict[param]: test["base_name"]}})
+                        function(
+                            {item: {single_dict[param]: test["base_name"]}},
+                            ctx.simulator,
+                        )
                     )
 
     # Add seed generic if it is define.
-    if "seed_generic" in ts_get_cfg():
-        seed_dict = {
-            "generics": {ts_get_cfg("seed_generic"): test["seed"]}
-        }
-        elab_cmd.extend(__add_generics(seed_dict))
+    if "seed_generic" in cfg:
+        seed_dict = {"generics": {cfg["seed_generic"]: test["seed"]}}
+        elab_cmd.extend(__add_generics(seed_dict, ctx.simulator))
 
     # Add global, target, test  and verbosity level specific generics and parameters
     for function in (__add_generics, __add_parameters):
-        for cfg_dict in (
-            ts_get_cfg(),
-            ts_get_cfg("targets")[ts_get_cfg("target")],
-            test,
-            ts_get_cfg("sim_verbosity_levels")[ts_get_cfg("sim_verbosity")],
-        ):
-            elab_cmd.extend(function(cfg_dict))
+        for cfg_dict in (cfg, ctx.target_cfg, test, ctx.verbosity_cfg):
+            elab_cmd.extend(function(cfg_dict, ctx.simulator))
 
     # Add simulation resolution
-    if "simulation_resolution" in ts_get_cfg():
+    if "simulation_resolution" in cfg:
         elab_cmd.append(
-            elab_dict["simulation_resolution"].format(
-                ts_get_cfg("simulation_resolution")
-            )
+            elab_dict["simulation_resolution"].format(cfg["simulation_resolution"])
         )
 
     # Add UVM elab options
-    if ts_is_uvm_enabled():
+    if ctx.uvm_enabled:
         elab_cmd.append(elab_dict["enable_uvm"])
 
     # Append top entity
-    elab_cmd.append(top_entity)
+    elab_cmd.append(ctx.target_cfg["top_entity"])
 
     return " ".join(filter(str.strip, elab_cmd)), elab_dict["log_file"].format(
         log_file_path
@@ -842,11 +1115,8 @@ def ts_sim_compile():
     ts_debug("Creating compile directory...")
     os.makedirs(ts_get_cfg("build_dir"), exist_ok=True)
 
-    ts_debug("Create list file of target libraries")
-    __generate_lib_list_file()
-
     ts_debug("Generate compilation configuration file in 'build' folder")
-    __generate_sim_config_file(ts_get_cfg("build_dir"))
+    __generate_sim_config_file(ts_get_cfg("build_dir"), __get_target_libs_list())
 
     ts_debug("Create 'comp_log' directory (if it does not exist)")
     if ts_get_cfg("clear_logs"):
@@ -855,7 +1125,11 @@ def ts_sim_compile():
         )
     create_sim_sub_dir(TsGlobals.TS_COMP_LOG_DIR_PATH)
 
-    __compile_all_files()
+    vhdl_only_libs = __compile_all_files()
+
+    ts_debug("Create manifest of target libraries")
+    __write_target_manifest(vhdl_only_libs)
+
     ts_print("Compilation successful", color=TsColors.PURPLE, big=True)
 
 
@@ -876,13 +1150,15 @@ def ts_sim_elaborate(test: dict) -> str:
     if not os.path.exists(ts_get_cfg("build_dir")):
         ts_throw_error(TsErrCode.ERR_ELB_2)
 
+    ctx = ts_get_sim_run_context()
+
     ts_debug("Get log file name")
     log_file_path = create_log_file_name("elab", test)
 
     # Build elaboration command
-    top_entity = ts_get_cfg("targets")[ts_get_cfg("target")]["top_entity"]
+    top_entity = ctx.target_cfg["top_entity"]
     ts_debug(f"Target's top entity is '{top_entity}'")
-    elab_cmd, log_file_opt = __build_elab_command(test, top_entity, log_file_path)
+    elab_cmd, log_file_opt = __build_elab_command(ctx, test, log_file_path)
 
     # Print elaboration command
     ts_info(TsInfoCode.GENERIC, elab_cmd)
@@ -891,6 +1167,7 @@ def ts_sim_elaborate(test: dict) -> str:
     ts_info(
         TsInfoCode.GENERIC, "Scanning elaboration directories for elaboration command."
     )
+    check_start = time.time_ns()
     for dir_path in __find_elab_dirs():
         ts_debug(f"Scanning {dir_path}")
 
@@ -904,56 +1181,50 @@ def ts_sim_elaborate(test: dict) -> str:
         elab_dir = dir_path
         ts_info(TsInfoCode.GENERIC, f"Command found in {elab_dir}")
 
-        sim_cfg_file = __SIM_CONFIG_FILES(ts_get_cfg("simulator"), elab_dir)
         ts_debug("Testing if elaboration is up-to-date")
-        with open(__TARGET_LIBS_LIST(ts_get_cfg("target")), "rb") as fd:
-            target_libs_list = pickle.load(fd)
-        for lib_name, lib_dir in target_libs_list:
-            ts_debug(f"Checking library compilation directory. '{lib_name}': {lib_dir}")
-            if not os.path.isdir(lib_dir):
-                ts_throw_error(
-                    TsErrCode.GENERIC,
-                    f"Library compilation directory not found! '{lib_name}': {lib_dir}",
-                )
-            if lib_name.lower() == "uvm":
-                continue
-            if os.path.getmtime(sim_cfg_file) < os.path.getmtime(
-                __LIB_FILE_LIST(lib_dir)
-            ):
-                ts_info(TsInfoCode.GENERIC, "Elaboration needed")
-                break
-        else:
+        if __is_elab_up_to_date(elab_dir):
             with open(log_file_path, "w") as fd:
                 fd.write(f"Elaboration up-to-date: {elab_dir}")
             __write_log_trailer(log_file_path, 0, 0.0, "ELAB")
+            ts_profile_event("elab_check", check_start, time.time_ns(), test=test["name"])
+            ts_metrics_count("elab_reuse_hits")
+            ts_metrics_record_test(test, "elab", reused=True, elab_dir=elab_dir)
             ts_print("Elaboration up-to-date", color=TsColors.PURPLE, big=True)
             return log_file_path, elab_dir
+        ts_info(TsInfoCode.GENERIC, "Elaboration needed")
         break
     else:
         ts_info(TsInfoCode.GENERIC, "Elaboration directory not found.")
         elab_dir = ts_get_test_dir("elab", test)
+    ts_profile_event("elab_check", check_start, time.time_ns(), test=test["name"])
+    ts_metrics_count("elab_reuse_misses")
 
     ts_debug("Create elaboration directory")
     shutil.rmtree(elab_dir, ignore_errors=True)
     os.mkdir(elab_dir)
 
     # Generate elaboration configuration file
-    __generate_sim_config_file(elab_dir)
+    __generate_sim_config_file(elab_dir, ctx.libs)
 
     # Generate Coverage specification file
     __generate_coverage_spec_file(elab_dir, top_entity)
 
     # Run elaboration in test specific directory
     run_time = time.time()
-    elab_exit_code = exec_cmd_in_dir(
-        directory=elab_dir,
-        command=elab_cmd + " " + log_file_opt,
-        no_std_out=ts_get_cfg("no_sim_out"),
-        no_std_err=ts_get_cfg("no_sim_out"),
-        batch_mode=True
-    )
+    with ts_span("elaborate", test=test["name"]):
+        elab_exit_code = exec_cmd_in_dir(
+            directory=elab_dir,
+            command=elab_cmd + " " + log_file_opt,
+            no_std_out=ts_get_cfg("no_sim_out"),
+            no_std_err=ts_get_cfg("no_sim_out"),
+            batch_mode=True
+        )
     run_time = time.time() - run_time
 
+    ts_metrics_record_cmd(
+        test, "elab", reused=False, elab_dir=elab_dir, exit_code=elab_exit_code
+    )
+
     # Append log trailer
     __write_log_trailer(log_file_path, elab_exit_code, run_time, "ELAB")
 
@@ -970,27 +1241,29 @@ def ts_sim_elaborate(test: dict) -> str:
     return log_file_path, elab_dir
 
 
-def __create_sim_command_file(directory: str) -> list:
+def __create_sim_command_file(ctx: TsSimRunContext, directory: str) -> list:
     """
     Creates simulation specific command file ("do" file)
+    :param ctx: Simulation run context
+    :param directory: Simulation directory
     """
-    simulator = ts_get_cfg("simulator")
+    cfg = ctx.cfg
 
     lines = []
 
     # If user specified do file exist, execute it before the generated one.
-    for sim_dict in (ts_get_cfg("targets")[ts_get_cfg("target")], ts_get_cfg()):
+    for sim_dict in (ctx.target_cfg, cfg):
         with contextlib.suppress(KeyError):
             with open(sim_dict["do_file"]) as fd:
                 lines.extend(fd.readlines())
                 break
 
-    if simulator == "vcs":
+    if ctx.simulator == "vcs":
 
-        gui = ts_get_cfg("gui")
+        gui = cfg["gui"]
 
         # If wave dumping is enabled, instruct simulator to dump database
-        if ts_get_cfg("dump_waves"):
+        if cfg["dump_waves"]:
 
             if gui == "verdi":
                 type_db = "fsdb"
@@ -1020,20 +1293,29 @@ def __create_sim_command_file(directory: str) -> list:
 
     else:
         ts_script_bug(
-            f"Simulator '{simulator}' not supported in function '__create_sim_command_file'"
+            f"Simulator '{ctx.simulator}' not supported in function '__create_sim_command_file'"
         )
 
 
 def __build_sim_command(
-    test: dict, elab_dir: str, sim_dir: str, log_file_path: str, no_seed: bool = False
+    ctx: TsSimRunContext,
+    test: dict,
+    elab_dir: str,
+    sim_dir: str,
+    log_file_path: str,
+    no_seed: bool = False,
 ) -> str:
     """
     Builds simulation command.
-    :param sim_binary: Simulator specific command to launch simulation
-    :param sim_cmds: Simulator specific commands for various configurations.
+    :param ctx: Simulation run context
+    :param test: Test object/dictionary (from test list file)
+    :param elab_dir: Directory with simulation binary
+    :param sim_dir: Simulation directory
     :param log_file_path: Absolute path to simulation log file
+    :param no_seed: Do not pass seed to the simulation
     """
-    sim_cmds = __SIMULATOR_COMMANDS[ts_get_cfg("simulator")]["simulate"]
+    cfg = ctx.cfg
+    sim_cmds = ctx.sim_cmds["simulate"]
 
     # Build simulation command line
     sim_cmd = [os.path.join(elab_dir, sim_cmds["binary"])]
@@ -1043,14 +1325,14 @@ def __build_sim_command(
         sim_cmd.append(sim_cmds["seed"].format(test["seed"]))
 
     # Add GUI options and session file
-    sim_cmd.extend(__get_gui_simulation_options())
+    sim_cmd.extend(__get_gui_simulation_options(cfg))
 
     # Add license wait option
-    if ts_get_cfg("license_wait"):
+    if cfg["license_wait"]:
         sim_cmd.append(sim_cmds["license_wait"])
 
     # Add coverage specific argument
-    if ts_get_cfg("coverage"):
+    if cfg["coverage"]:
         sim_cmd.append(sim_cmds["coverage"].format(sim_dir))
 
     # Add Common options
@@ -1058,15 +1340,15 @@ def __build_sim_command(
 
     # Add Global, Target specific and Test specific simulation options
     for cfg_dict in (
-        ts_get_cfg(),
-        ts_get_cfg("targets")[ts_get_cfg("target")],
-        get_test(test["name"], TsGlobals.TS_TEST_LIST),
-        ts_get_cfg("sim_verbosity_levels")[ts_get_cfg("sim_verbosity")],
+        cfg,
+        ctx.target_cfg,
+        ctx.test_defs[test["name"]],
+        ctx.verbosity_cfg,
     ):
-        sim_cmd.extend(__add_comp_sim_elab_opts(cfg_dict, "sim_options"))
+        sim_cmd.extend(__add_comp_sim_elab_opts(cfg_dict, "sim_options", ctx.simulator))
 
     # Add extra options passed from command line
-    sim_cmd.append(ts_get_cfg("add_sim_options"))
+    sim_cmd.append(cfg["add_sim_options"])
 
     # Add log file path
     sim_cmd.append(sim_cmds["log_file"].format(log_file_path))
@@ -1076,17 +1358,17 @@ def __build_sim_command(
 
     # Add simulator specific command file
     sim_cmd_file = __SIM_CMD_FILE(sim_dir)
-    lines = __create_sim_command_file(ts_get_test_dir("sim", test))
+    lines = __create_sim_command_file(ctx, sim_dir)
     if lines:
         with open(sim_cmd_file, "w") as fd:
             fd.writelines(map(lambda x: x + "\n", lines))
         sim_cmd.append(sim_cmds["sim_cmd_file"].format(sim_cmd_file))
     # VCS runs in ucli mode when a do file is specified or gui is activated
-    if lines or ts_get_cfg("gui") is not None:
+    if lines or cfg["gui"] is not None:
         sim_cmd.append("-ucli")
 
     # Add UVM test name if specified
-    for single_dict in (ts_get_cfg(), ts_get_cfg("targets")[ts_get_cfg("target")]):
+    for single_dict in (cfg, ctx.target_cfg):
         if single_dict["test_name_strategy"] == "uvm":
             sim_cmd.append(sim_cmds["uvm_test_name"].format(test["base_name"]))
 
@@ -1100,11 +1382,11 @@ def ts_sim_run(test: dict, elab_dir: str = "") -> str:
     """
     ts_print("Launching simulation", color=TsColors.PURPLE, big=True)
 
-    top_entity = ts_get_cfg("targets")[ts_get_cfg("target")]["top_entity"]
+    ctx = ts_get_sim_run_context()
 
     if not elab_dir:
         # Build elaboration command
-        elab_cmd, *_ = __build_elab_command(test, top_entity)
+        elab_cmd, *_ = __build_elab_command(ctx, test)
 
         # Scan all elab directories for simulation binary
         ts_info(TsInfoCode.GENERIC, "looking for binary.")
@@ -1136,40 +1418,55 @@ def ts_sim_run(test: dict, elab_dir: str = "") -> str:
     # Get test specific log file path
     log_file_path = create_log_file_name("sim", test)
 
-    # If the design is only in VHDL then do not provide the seed to the simulation
-    with open(__TARGET_LIBS_LIST(ts_get_cfg("target")), "rb") as fd:
-        target_libs_list = pickle.load(fd)
-    for lib_name, lib_dir in target_libs_list:
-        if not os.path.exists(__VHDL_ONLY(lib_dir)):
-            vhdl_only = False
-            break
-    else:
-        vhdl_only = True
-
     # Generate simulation configuration file
-    __generate_sim_config_file(sim_dir)
+    __generate_sim_config_file(sim_dir, ctx.libs)
 
     # Build simulation command line
-    sim_cmd = __build_sim_command(test, elab_dir, sim_dir, log_file_path, vhdl_only)
+    # If the design is only in VHDL then do not provide the seed to the simulation
+    sim_cmd = __build_sim_command(
+        ctx, test, elab_dir, sim_dir, log_file_path, ctx.vhdl_only
+    )
 
     ts_info(TsInfoCode.GENERIC, sim_cmd)
 
     # Run simulation
     run_time = time.time()
-    sim_exit_code = exec_cmd_in_dir(
-        directory=sim_dir,
-        command=sim_cmd,
-        no_std_out=ts_get_cfg("no_sim_out"),
-        no_std_err=ts_get_cfg("no_sim_out"),
-        batch_mode=True
-    )
+    with ts_span("simulate", test=test["name"], seed=test["seed"]):
+        sim_exit_code = exec_cmd_in_dir(
+            directory=sim_dir,
+            command=sim_cmd,
+            no_std_out=ts_get_cfg("no_sim_out"),
+            no_std_err=ts_get_cfg("no_sim_out"),
+            batch_mode=True
+        )
     run_time = time.time() - run_time
     ts_print("Simulation Done", color=TsColors.PURPLE, big=True)
 
     ts_debug(f"Simulation exit code: {sim_exit_code}")
 
+    ts_metrics_record_cmd(
+        test,
+        "sim",
+        exit_code=sim_exit_code,
+        license_queue=bool(ctx.cfg["license_wait"]),
+    )
+
     # Append log trailer
     __write_log_trailer(log_file_path, sim_exit_code, run_time, "SIM")
 
+    # Save simulation run information (used by coverage catalog)
+    with open(__SIM_RUN_INFO(sim_dir), "w") as fd:
+        json.dump(
+            {
+                "test": test["name"],
+                "seed": test["seed"],
+                "elab_dir": elab_dir,
+                "run_time": run_time,
+                "exit_code": sim_exit_code,
+            },
+            fd,
+            indent=4,
+        )
+
     # Return path to log file for checking results!
     return log_file_path
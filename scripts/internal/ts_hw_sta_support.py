@@ -10,13 +10,21 @@
 ####################################################################################################
 
 
+import contextlib
+import copy
+import json
 import logging
 import os
 import shutil
+import signal
+from argparse import Namespace
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
 
-from .ts_hw_cfg_parser import parse_runcode_arg
+from .ts_hw_cfg_parser import parse_runcode_arg_root_dir
+from .ts_hw_check import get_snps_log_summary
 from .ts_hw_common import (
+    exec_cmd_in_dir,
     get_env_var_path,
     get_repo_root_path,
     ts_get_design_top,
@@ -30,19 +38,29 @@ from .ts_hw_logging import (
     TsErrCode,
     TSFormatter,
     TsInfoCode,
+    TsWarnCode,
+    ts_configure_logging,
     ts_debug,
     ts_info,
     ts_print,
     ts_throw_error,
+    ts_warning,
 )
+from .ts_hw_release import release_flow
+
+# Global variables with paths which are specific to each mode of multi-mode run (--modes)
+STA_MODE_VARS = ("TS_STA_RUN_DIR", "TS_STA_RESULTS_DIR", "TS_STA_REPORTS_DIR", "TS_STA_SETUP_FILE")
 
 
 def set_sta_global_vars(args):
     """
     Set static timing analysis flow global variables
     """
+    # Setting the netlist (before runcode directory is allocated, netlist may be missing)
+    if not args.open_result:
+        TsGlobals.TS_STA_DC_RM_NETLIST = __sta_netlist_selection(args)
     # Check runcode validity and update it if the _n+1 rule is applicable
-    TsGlobals.TS_STA_RUNCODE = parse_runcode_arg(args)
+    TsGlobals.TS_STA_RUNCODE = parse_runcode_arg_root_dir(args, f"{get_repo_root_path()}/sta")
     # Set synthesis run dir according to runcode
     TsGlobals.TS_STA_RUN_DIR = get_sta_rundir(TsGlobals.TS_STA_RUNCODE)
     # Set sythesis dirs for purpose of the run
@@ -73,9 +91,6 @@ def set_sta_global_vars(args):
     TsGlobals.TS_STA_DMSA_FILE = os.path.join(
         TsGlobals.TS_STA_RUN_DIR, TsGlobals.TS_STA_DMSA_FILE
     )
-    # Setting the netlist
-    if not args.open_result:
-        TsGlobals.TS_STA_DC_RM_NETLIST = __sta_netlist_selection(args)
     # STA setup file path
     TsGlobals.TS_STA_SETUP_FILE = os.path.join(
         TsGlobals.TS_STA_RUN_DIR, TsGlobals.TS_STA_SETUP_FILE
@@ -149,6 +164,8 @@ def build_sta_cmd(args):
 
     # LOG FILE
     logfile = f"{TsGlobals.TS_STA_LOGS_DIR}/{TsGlobals.TS_STA_RUNCODE}_sta"
+    if getattr(args, "modes", None):
+        logfile += f"_{args.mode}"
     if args.open_result:
         logfile += "_open{}".format(datetime.now().strftime("_%Y_%m_%d_%H_%M_%S_%f"))
     logfile += ".log"
@@ -470,7 +487,7 @@ def sta_setup(path: str, args):
         lines.append(f"set PARASITIC_FILES [dict get $MODES $MODE spef]\n")
         lines.append(f"\n")
         lines.append(
-            f'set PARASITIC_PATHS {ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{TsGlobals.TS_STA_RUNCODE}/results/ \n'
+            f'set PARASITIC_PATHS {ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{args.runcode}/results/ \n'
         )
         lines.append(f"\n")
     lines.append(f"\n")
@@ -521,7 +538,7 @@ def __sta_netlist_selection(args):
         path = f"{ts_get_root_rel_path(args.netlist)}"
     else:
         # Use default netlist location from flow_dirs/results/<design_name>.v
-        path = f'{ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{TsGlobals.TS_STA_RUNCODE}/results/{str(ts_get_design_top()).lower()}.v'
+        path = f'{ts_get_root_rel_path(TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"][args.source_data])}/{args.runcode}/results/{str(ts_get_design_top()).lower()}.v'
 
     if os.path.isfile(path):
         return path
@@ -530,25 +547,210 @@ def __sta_netlist_selection(args):
         return None
 
 
-def sta_release(source_dir, release_dir, flow_dir_type):
+def sta_release(source_dir, release_dir, flow_dir_type, mode="auto"):
     """
-    Hard-copy data from source directory to release directory
+    Release reports, logs and results from source directory to release directory.
+    Unchanged files are skipped, other files are linked or copied (see 'release_flow').
     """
     if source_dir is not release_dir:
-        os.makedirs(release_dir, exist_ok=True)
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_REPORTS_DIR"),
-            f"{release_dir}/reports",
-            dirs_exist_ok=True,
-        )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_LOGS_DIR"),
-            f"{release_dir}/logs",
-            dirs_exist_ok=True,
+        release_flow(flow_dir_type, release_dir, mode)
+        ts_print("Release is done!", color=TsColors.PURPLE, big=True)
+
+
+def get_sta_modes(args) -> list:
+    """
+    Returns names of modes selected by --modes ("all" or comma separated list of modes).
+    :param args: Argparse command line arguments object.
+    """
+    modes = [mode["name"] for mode in TsGlobals.TS_DESIGN_CFG["design"]["modes"]]
+    if args.modes == "all":
+        return modes
+
+    selected = []
+    for mode in args.modes.split(","):
+        mode = mode.strip()
+        if mode not in modes:
+            ts_throw_error(TsErrCode.ERR_STA_5, mode)
+        if mode not in selected:
+            selected.append(mode)
+    return selected
+
+
+@contextlib.contextmanager
+def __sta_mode_dirs(mode: str):
+    """
+    Temporarily points run, results and reports directories and setup file of STA
+    to sub-directories of a mode.
+    :param mode: Mode name
+    """
+    saved = {var: getattr(TsGlobals, var) for var in STA_MODE_VARS}
+    TsGlobals.TS_STA_RUN_DIR = os.path.join(saved["TS_STA_RUN_DIR"], mode)
+    TsGlobals.TS_STA_RESULTS_DIR = os.path.join(saved["TS_STA_RESULTS_DIR"], mode)
+    TsGlobals.TS_STA_REPORTS_DIR = os.path.join(saved["TS_STA_REPORTS_DIR"], mode)
+    TsGlobals.TS_STA_SETUP_FILE = os.path.join(
+        TsGlobals.TS_STA_RUN_DIR, os.path.basename(saved["TS_STA_SETUP_FILE"])
+    )
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            setattr(TsGlobals, var, value)
+
+
+def sta_modes_setup(modes: list, args) -> list:
+    """
+    Generates setup file and pt_shell command of each mode of multi-mode run. Each mode
+    runs in its own sub-directory of run directory, results and reports of the mode are
+    stored in sub-directories of results and reports directories. Design configuration
+    file is shared by all modes.
+    :param modes: Mode names
+    :param args: Argparse command line arguments object.
+    :return: List of jobs (mode, directory, pt_shell command and log file)
+    """
+    jobs = []
+    for mode in modes:
+        mode_args = copy.copy(args)
+        mode_args.mode = mode
+        # Standard output of parallel modes would interleave, it is kept in log of each mode
+        mode_args.no_std_out = args.no_std_out or args.jobs > 1
+
+        with __sta_mode_dirs(mode):
+            for directory in (
+                TsGlobals.TS_STA_RUN_DIR,
+                TsGlobals.TS_STA_RESULTS_DIR,
+                TsGlobals.TS_STA_REPORTS_DIR,
+            ):
+                os.makedirs(directory, exist_ok=True)
+            sta_setup(TsGlobals.TS_STA_SETUP_FILE, mode_args)
+            pt_cmd, log_file = build_sta_cmd(mode_args)
+            jobs.append(
+                {
+                    "mode": mode,
+                    "run_dir": TsGlobals.TS_STA_RUN_DIR,
+                    "cmd": pt_cmd,
+                    "log": log_file,
+                }
+            )
+    return jobs
+
+
+def init_sta_worker(args):
+    """
+    Multi-mode STA worker process initializer.
+    :param args: Argparse command line arguments object.
+    """
+    # Interrupt is handled by main process which terminates the whole process tree
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Worker which is not forked does not have logging configured
+    if not logging.getLogger().handlers:
+        ts_configure_logging(Namespace(verbose=args.verbose, no_color=args.no_color))
+
+
+def run_sta_mode_job(job: dict):
+    """
+    Runs pt_shell of a mode in worker process.
+    :param job: Job of the mode (see 'sta_modes_setup')
+    :return: Exit code of pt_shell, None if it could not be started.
+    """
+    try:
+        return exec_cmd_in_dir(directory=job["run_dir"], command=job["cmd"], batch_mode=True)
+    except SystemExit:
+        return None
+
+
+def run_sta_modes(jobs: list, args) -> list:
+    """
+    Runs pt_shell of modes in parallel (at most --jobs at once). Log of each mode is
+    checked as soon as its pt_shell finishes.
+    :param jobs: Jobs of modes (see 'sta_modes_setup')
+    :param args: Argparse command line arguments object.
+    :return: List of results of modes in order of jobs
+    """
+    corners = {m["name"]: m["corner"] for m in TsGlobals.TS_DESIGN_CFG["design"]["modes"]}
+    results = {}
+
+    ts_info(
+        TsInfoCode.GENERIC,
+        f"Running STA of {len(jobs)} modes (parallel jobs: {min(args.jobs, len(jobs))}).",
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(args.jobs, len(jobs))),
+        initializer=init_sta_worker,
+        initargs=(args,),
+    ) as executor:
+        running = {executor.submit(run_sta_mode_job, job): job for job in jobs}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                result = {
+                    "mode": job["mode"],
+                    "corner": corners.get(job["mode"]),
+                    "exit_code": future.result(),
+                    "log": job["log"],
+                    "errors": None,
+                    "warnings": None,
+                    "status": "PASSED",
+                }
+                results[job["mode"]] = result
+
+                if os.path.isfile(job["log"]):
+                    json_file = None
+                    if args.log_json:
+                        json_file = f"{os.path.splitext(args.log_json)[0]}_{job['mode']}.json"
+                    summary = get_snps_log_summary(
+                        f"STA {job['mode']}", job["log"], args.log_waivers, json_file
+                    )
+                    result["errors"] = summary["errors"] - summary["waived_errors"]
+                    result["warnings"] = summary["warnings"] - summary["waived_warnings"]
+                    if result["errors"]:
+                        result["status"] = "LOG ERRORS"
+                else:
+                    ts_warning(TsWarnCode.GENERIC, f"Log file '{job['log']}' was not found.")
+                    result["status"] = "NO LOG"
+
+                if result["exit_code"] is None:
+                    result["status"] = "ERROR"
+                elif result["exit_code"]:
+                    result["status"] = "PT FAILED"
+
+                ts_info(TsInfoCode.GENERIC, f"Mode '{job['mode']}' finished: {result['status']}")
+
+    return [results[job["mode"]] for job in jobs]
+
+
+def report_sta_modes_summary(results: list, json_file: str, wns: dict = None):
+    """
+    Prints merged summary of multi-mode run and stores it as JSON file.
+    :param results: Results of modes (see 'run_sta_modes')
+    :param json_file: Path to JSON summary
+    :param wns: Worst setup and hold slack by mode, None if not available
+                (see 'get_qor_wns_by_mode')
+    """
+    wns = wns or {}
+
+    def fmt(value) -> str:
+        return "-" if value is None else f"{value:.4g}"
+
+    ts_print("STA modes summary", color=TsColors.PURPLE, big=True)
+    ts_print(
+        f"{'Mode':<24} {'Corner':<24} {'Exit':>5} {'Errors':>7} {'Warnings':>9} "
+        f"{'Setup WNS':>10} {'Hold WNS':>10}  Status"
+    )
+    for result in results:
+        mode_wns = wns.get(result["mode"], {})
+        ts_print(
+            f"{result['mode']:<24} {result['corner'] or '-':<24} "
+            f"{fmt(result['exit_code']):>5} {fmt(result['errors']):>7} "
+            f"{fmt(result['warnings']):>9} {fmt(mode_wns.get('max')):>10} "
+            f"{fmt(mode_wns.get('min')):>10}  {result['status']}",
+            color=TsColors.GREEN if result["status"] == "PASSED" else TsColors.RED,
         )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_RESULTS_DIR"),
-            f"{release_dir}/results",
-            dirs_exist_ok=True,
+
+    with open(json_file, "w") as fd:
+        json.dump(
+            [dict(result, wns=wns.get(result["mode"], {})) for result in results], fd, indent=4
         )
-        ts_print("Release is done!", color=TsColors.PURPLE, big=True)
+    ts_info(TsInfoCode.GENERIC, f"STA modes summary stored in '{json_file}'")
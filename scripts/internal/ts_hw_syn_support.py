@@ -25,6 +25,7 @@ from .ts_hw_design_config_file import check_export_view_types
 from .ts_hw_export import export_dc_tcl, export_design_config
 from .ts_hw_global_vars import TsGlobals
 from .ts_hw_logging import TsColors, TSFormatter, TsInfoCode, ts_info, ts_print
+from .ts_hw_release import release_flow
 
 
 def set_syn_global_vars(args):
@@ -623,25 +624,11 @@ def open_ddc(args):
         )
 
 
-def release(source_dir, release_dir, flow_dir_type):
+def release(source_dir, release_dir, flow_dir_type, mode="auto"):
     """
-    Hard-copy data from source directory to release directory
+    Release reports, logs and results from source directory to release directory.
+    Unchanged files are skipped, other files are linked or copied (see 'release_flow').
     """
     if source_dir is not release_dir:
-        os.makedirs(release_dir, exist_ok=True)
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_REPORTS_DIR"),
-            f"{release_dir}/reports",
-            dirs_exist_ok=True,
-        )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_LOGS_DIR"),
-            f"{release_dir}/logs",
-            dirs_exist_ok=True,
-        )
-        shutil.copytree(
-            eval(f"TsGlobals.TS_{str(flow_dir_type).upper()}_RESULTS_DIR"),
-            f"{release_dir}/results",
-            dirs_exist_ok=True,
-        )
+        release_flow(flow_dir_type, release_dir, mode)
         ts_print("Release is done!", TsColors.PURPLE, big=True)
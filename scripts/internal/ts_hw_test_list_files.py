@@ -9,6 +9,8 @@
 import contextlib
 import os
 import re
+from collections.abc import Mapping
+from types import MappingProxyType
 
 from schema import SchemaError
 
@@ -99,6 +101,44 @@ def __load_test_list_file(list_file_path: str) -> list:
     return __load_test_list(list_file, list_file_path)
 
 
+class TsTestRun(Mapping):
+    """
+    Single run of a test (one loop iteration).
+
+    Behaves as a read-only test dictionary: keys of the test definition loaded from test list
+    file are looked up in shared definition (see 'get_test_definition'), 'seed' and 'loop_index'
+    are stored in the run itself. Only test name, seed and loop index are held by the object,
+    so it is cheap to create and to send to worker processes.
+    """
+
+    __slots__ = ("name", "seed", "loop_index")
+
+    def __init__(self, name: str, seed: int, loop_index: int = 0):
+        self.name = name
+        self.seed = seed
+        self.loop_index = loop_index
+
+    @property
+    def definition(self) -> Mapping:
+        return get_test_definition(self.name)
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        return self.definition[key]
+
+    def __iter__(self):
+        yield from self.definition
+        yield "seed"
+        yield "loop_index"
+
+    def __len__(self):
+        return len(self.definition) + 2
+
+    def __repr__(self):
+        return f"TsTestRun(name={self.name!r}, seed={self.seed!r}, loop_index={self.loop_index!r})"
+
+
 def load_tests():
     """
     Loads test from root list file and sub-list files.
@@ -109,6 +149,23 @@ def load_tests():
         if os.path.isfile(list_file):
             TsGlobals.TS_TEST_LIST.extend(__load_test_list_file(list_file))
 
+    # Index read-only views of tests by name. Views are shared by all runs of a test.
+    # First test of a given name wins (same as lookup in the test list).
+    TsGlobals.TS_TEST_DEFS = {}
+    for test in TsGlobals.TS_TEST_LIST:
+        TsGlobals.TS_TEST_DEFS.setdefault(test["name"], MappingProxyType(test))
+
+
+def get_test_definition(test_name: str) -> Mapping:
+    """
+    Obtains read-only test definition by name from list of all available tests.
+    :param test_name: Name of the test to obtain
+    """
+    try:
+        return TsGlobals.TS_TEST_DEFS[test_name]
+    except (TypeError, KeyError):
+        ts_script_bug(f"Could not find test '{test_name}'")
+
 
 def get_tests_to_run(test_names: list) -> list:
     """
@@ -31,7 +31,11 @@ from internal.ts_hw_cfg_parser import (
     do_sim_config_init,
 )
 from internal.ts_hw_common import init_signals_handler, ts_get_cfg, view_has_corner
-from internal.ts_hw_design_config_file import check_export_view_types, print_pdk_obj
+from internal.ts_hw_design_config_file import (
+    check_export_view_types,
+    load_pdk_configs,
+    print_pdk_obj,
+)
 from internal.ts_hw_export import export_dc_tcl, export_design_config, export_vivado_tcl
 from internal.ts_hw_global_vars import TsGlobals
 from internal.ts_hw_logging import (
@@ -68,6 +72,10 @@ if __name__ == "__main__":
     check_valid_design_target()
     load_source_list_files(ts_get_cfg("target"))
 
+    # Only target PDK is loaded by default
+    if args.list_pdks or args.list_pdk_std_cells or args.list_pdk_ips:
+        load_pdk_configs(args.revalidate_pdk, all_pdks=True)
+
     if args.list_pdks:
         print("List of loaded PDKs:")
         for pdk in TsGlobals.TS_PDK_CFGS:
@@ -165,17 +165,9 @@ if __name__ == "__main__":
             ts_info(TsInfoCode.INFO_SYS_2, args.runcode)
             # Delete DIR of runcode name if exists
             delete_dft_subdirs()
-        else:
-            # Test if database already exists, otherwise create sub-folder
-            if (
-                os.path.isdir(
-                    os.path.join(get_dft_rootdir(args), TsGlobals.TS_DFT_RUNCODE)
-                )
-                is True
-            ):
-                ts_throw_error(TsErrCode.ERR_SYN_2, args.runcode)
 
-        # Create new sub-folder with name of runcode
+        # Create new sub-folder with name of runcode (new runcode directory was already
+        # allocated following the _n+1 rule unless --force is used)
         create_dft_subdirs()
 
     else:
@@ -250,7 +242,7 @@ if __name__ == "__main__":
                     TsGlobals.TS_DFT_RUNCODE,
                 )
             )
-            dft_release(TsGlobals.TS_DFT_RUN_DIR, TsGlobals.TS_DFT_RELEASE_DIR, "dft")
+            dft_release(TsGlobals.TS_DFT_RUN_DIR, TsGlobals.TS_DFT_RELEASE_DIR, "dft", args.release_mode)
 
 
     else:
@@ -134,17 +134,9 @@ if __name__ == "__main__":
             ts_info(TsInfoCode.INFO_SYS_2, args.runcode)
             # Delete DIR of runcode name if exists
             delete_rtl_lint_subdirs()
-        else:
-            # Test if database already exists, otherwise create sub-folder
-            if (
-                os.path.isdir(
-                    os.path.join(get_dft_rootdir(args), TsGlobals.TS_RTL_LINT_RUNCODE)
-                )
-                is True
-            ):
-                ts_throw_error(TsErrCode.ERR_SYN_2, args.runcode)
-
-        # Create new sub-folder with name of runcode
+
+        # Create new sub-folder with name of runcode (new runcode directory was already
+        # allocated following the _n+1 rule unless --force is used)
         create_rtl_lint_subdirs()
 
     else:
@@ -129,12 +129,9 @@ if __name__ == "__main__":
             ts_info(TsInfoCode.INFO_PNR_2, TsGlobals.TS_PNR_RUNCODE)
             # Delete DIR of runcode name if exists
             delete_pnr_sub_dir()
-        else:
-            # Test if database already exists, otherwise create sub-folder
-            if open_result_test(args) is True:
-                ts_throw_error(TsErrCode.ERR_PNR_2, TsGlobals.TS_PNR_RUNCODE)
 
-        # Create new sub-folder with name of runcode
+        # Create new sub-folder with name of runcode (new runcode directory was already
+        # allocated following the _n+1 rule unless --force is used)
         create_pnr_sub_dirs()
 
     else:
@@ -185,6 +182,6 @@ if __name__ == "__main__":
                 TsGlobals.TS_PNR_RUNCODE,
             )
         )
-        release(TsGlobals.TS_PNR_RUN_DIR, TsGlobals.TS_PNR_RELEASE_DIR, "pnr")
+        release(TsGlobals.TS_PNR_RUN_DIR, TsGlobals.TS_PNR_RELEASE_DIR, "pnr", args.release_mode)
 
 sys.exit(0)
@@ -20,6 +20,12 @@
 # --dump-pwr-waves <fsdb/out>
 # --no-sim (does not run simulation, expects previous run of the target+test with specified seed)
 # --seed <seed> (specifies simulation seed)
+# --jobs <num> (runs scenarios in parallel)
+# --pipeline (runs power analysis while next scenarios are simulated)
+# --vcd-queue <num> (limits VCD files in flight in pipelined run)
+# --remove-vcd (removes VCD file after power analysis)
+# --no-shared-sim (simulates each scenario on its own)
+# --sim-jobs <num>, --pt-jobs <num> (limits parallel simulations / PrimeTime runs)
 #
 # For license see LICENSE file in repository root.
 ####################################################################################################
@@ -52,9 +58,7 @@ from internal.ts_hw_cfg_parser import (
     do_sim_config_init,
 )
 from internal.ts_hw_common import (
-    exec_cmd_in_dir,
     init_signals_handler,
-    ts_generate_seed,
     ts_get_root_rel_path,
     ts_unset_env_var,
 )
@@ -65,7 +69,6 @@ from internal.ts_hw_logging import (
     TsInfoCode,
     TsWarnCode,
     ts_configure_logging,
-    ts_debug,
     ts_info,
     ts_print,
     ts_throw_error,
@@ -128,6 +131,18 @@ if __name__ == "__main__":
         sys.exit(return_code)
 
     check_pwr_args(args)
+
+    if args.jobs > 1 or args.pipeline:
+        args.pipeline = True
+        if args.stay_in_tool:
+            ts_throw_error(
+                TsErrCode.GENERIC,
+                "--stay-in-tool can not be used with pipelined run (--pipeline, --jobs).",
+            )
+        if args.vcd_queue is not None and args.vcd_queue < 1:
+            ts_throw_error(TsErrCode.GENERIC, "--vcd-queue must be at least 1.")
+        # Outputs of parallel runs can not share terminal
+        args.batch_mode = True
     TsGlobals.TS_PWR_RUN_FILE = ts_get_root_rel_path(TsGlobals.TS_PWR_RUN_FILE)
     check_primetime_run_script()
 
@@ -136,116 +151,45 @@ if __name__ == "__main__":
     # Generate common design setup
     generate_common_setup()
 
-    # Preset seed
-    seed = 0
-    if hasattr(args, "seed"):
-        seed = args.seed
-
     ################################################################################################
     # Execute Scenarios
     ################################################################################################
-    for pwr_scenario in TsGlobals.TS_PWR_RUN_SCENARIOS:
-        ########################################################################################
-        # Simulate the scenario target and test
-        ########################################################################################
-        if not args.no_sim:
-            ts_print(
-                "Running simulation for '{}'.".format(pwr_scenario["name"]),
-                color=TsColors.PURPLE,
-                big=True,
-            )
-
-            # Set seed
-            if not hasattr(args, "seed"):
-                if get_optional_key(pwr_scenario, "randomized"):
-                    seed = ts_generate_seed()
-                else:
-                    seed = 0
-            else:
-                seed = args.seed
-
-            ts_info(TsInfoCode.GENERIC, f"Seed: {seed}")
-
-            # Build command to run simulation
-            run_sim_cmd = xterm_cmd_wrapper(build_run_sim_cmd(pwr_scenario, seed, args))
-
-            # Run simulation
-            ts_debug(f"Running command {run_sim_cmd}")
-            sim_exit_code = exec_cmd_in_dir(
-                directory=TsGlobals.TS_PWR_DIR,
-                command=run_sim_cmd,
-                batch_mode=args.batch_mode
-            )
-
-            ts_debug(f"Simulation exit code: {sim_exit_code}")
-
-            if sim_exit_code:
-                if not args.fail_fast:
-                    ts_warning(
-                        TsWarnCode.GENERIC,
-                        "Simulation failed on scenario {}... Continue...".format(
-                            pwr_scenario["name"]
-                        ),
-                    )
-                else:
+    scenarios = [
+        (pwr_scenario, get_scenario_seed(pwr_scenario, args))
+        for pwr_scenario in TsGlobals.TS_PWR_RUN_SCENARIOS
+    ]
+
+    groups = get_pwr_sim_groups(scenarios, not (args.no_shared_sim or args.no_sim))
+
+    if args.pipeline:
+        results = run_pwr_pipeline(groups, args)
+    else:
+        results = []
+        for group in groups:
+            for result in run_pwr_group(group, args):
+                results.append(result)
+                if result["status"] == "PASSED":
+                    continue
+                if args.fail_fast:
                     ts_throw_error(
                         TsErrCode.GENERIC,
-                        "Simulation failed on scenario {}... Failing fast!".format(
-                            pwr_scenario["name"]
+                        "Scenario {} failed ({})... Failing fast!".format(
+                            result["name"], result["status"]
                         ),
                     )
-
-        ########################################################################################
-        # Prepare for power analysis
-        ########################################################################################
-        vcd_file = get_vcd_file(pwr_scenario, seed)
-
-        # Generate specific power setup
-        generate_scenario_setup(pwr_scenario, vcd_file, args)
-
-        # Generate post PrimeTime hook file
-        generate_post_pwr_hook(pwr_scenario, args)
-
-        # Generate PrimeTime command
-        pt_shell_cmd = xterm_cmd_wrapper(build_prime_time_cmd(pwr_scenario), args)
-
-        ts_print(
-            "Running power analysis for '{}'.".format(pwr_scenario["name"]),
-            color=TsColors.PURPLE,
-            big=True,
-        )
-
-        ########################################################################################
-        # Run power analysis
-        ########################################################################################
-        ts_debug(f"Running command {pt_shell_cmd}")
-        pwr_exit_code = exec_cmd_in_dir(
-            directory=pwr_scenario["rundir"],
-            command=pt_shell_cmd,
-            batch_mode=args.batch_mode
-        )
-
-        ts_debug(f"PrimeTime exit code: {pwr_exit_code}")
-        if pwr_exit_code:
-            if not args.fail_fast:
                 ts_warning(
                     TsWarnCode.GENERIC,
-                    "Power analysis failed on scenario {}... Continue".format(
-                        pwr_scenario["name"]
-                    ),
-                )
-            else:
-                ts_throw_error(
-                    TsErrCode.GENERIC,
-                    "Power analysis failed on scenario {}... Failing fast".format(
-                        pwr_scenario["name"]
+                    "Scenario {} failed ({})... Continue...".format(
+                        result["name"], result["status"]
                     ),
                 )
 
+    print_pwr_results(results)
+
     ts_print("Power Analysis Done!", color=TsColors.PURPLE, big=True)
 
     # Unset license queuing
     set_prime_time_license_queuing(False)
     set_verdi_license_queuing(False)
 
-    sys.exit(0)
+    sys.exit(int(any(result["status"] != "PASSED" for result in results)))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Tropic Square VCD reduction script for power analysis
+#
+# Cuts time window out of VCD file, filters it to a scope and stores it as (gzip-compressed)
+# VCD or SAIF toggle summary. VCD file is processed in single pass with bounded memory.
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import sys
+
+import argcomplete
+from internal.ts_hw_args import (
+    TsArgumentParser,
+    add_ts_common_args,
+    add_ts_pwr_vcd_args,
+)
+from internal.ts_hw_common import init_signals_handler
+from internal.ts_hw_logging import (
+    TsErrCode,
+    TsInfoCode,
+    ts_configure_logging,
+    ts_info,
+    ts_throw_error,
+)
+from internal.ts_hw_pwr_vcd import reduce_vcd
+
+if __name__ == "__main__":
+
+    init_signals_handler()
+
+    parser = TsArgumentParser(description="VCD reduction script for power analysis")
+    add_ts_common_args(parser)
+    add_ts_pwr_vcd_args(parser)
+    argcomplete.autocomplete(parser)
+    args = parser.parse_args()
+
+    ts_configure_logging(args)
+
+    if args.start is not None and args.end is not None and args.start > args.end:
+        ts_throw_error(TsErrCode.GENERIC, "Start of time window is after its end.")
+
+    reduce_vcd(args.vcd_file, args.output, args.start, args.end, args.scope, args.format)
+    ts_info(TsInfoCode.GENERIC, f"Activity stored in '{args.output}'")
+
+    sys.exit(0)
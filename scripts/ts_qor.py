@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Tropic Square QoR database query script
+#
+# Shows runcodes, trends of metrics and differences between runcodes stored in QoR database
+# by ts_syn_run.py and ts_sta_run.py (timing, QoR, area and power reports).
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import sys
+import time
+
+import argcomplete
+from internal.ts_hw_args import TsArgumentParser, add_ts_common_args, add_ts_qor_args
+from internal.ts_hw_common import init_signals_handler
+from internal.ts_hw_logging import TsColors, ts_configure_logging, ts_print
+from internal.ts_hw_qor import (
+    get_qor_diff,
+    get_qor_paths,
+    get_qor_runs,
+    get_qor_trend,
+    ingest_qor_reports,
+    qor_db_connect,
+)
+
+
+def fmt(value) -> str:
+    """
+    Formats metric value.
+    """
+    return "-" if value is None else f"{value:.6g}"
+
+
+def print_runs(conn, args):
+    """
+    Prints runcodes in QoR database.
+    """
+    ts_print(f"{'Flow':<8} {'Runcode':<32} {'Design':<24} {'Reports':>8}  Ingested")
+    for run in get_qor_runs(conn, args.flow):
+        ts_print(
+            f"{run['flow']:<8} {run['runcode']:<32} {run['design'] or '-':<24} "
+            f"{run['reports']:>8}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(run['time']))}"
+        )
+
+
+def print_trend(conn, args):
+    """
+    Prints values of metrics across runcodes with change to previous runcode.
+    """
+    key = None
+    for row in get_qor_trend(conn, args.flow, args.metric, args.mode, args.group, args.last):
+        row_key = (row["name"], row["mode"], row["path_group"], row["report"])
+        if row_key != key:
+            key = row_key
+            ts_print(
+                f"{row['name']} (mode: {row['mode'] or '-'}, corner: {row['corner'] or '-'}, "
+                f"group: {row['path_group'] or '-'}, report: {row['report']})",
+                color=TsColors.PURPLE,
+            )
+            prev = None
+        delta = "" if prev is None else fmt(row["value"] - prev)
+        ts_print(f"    {row['runcode']:<32} {fmt(row['value']):>14} {delta:>14}")
+        prev = row["value"]
+
+
+def print_diff(conn, args):
+    """
+    Prints metrics of two runcodes side by side.
+    """
+    ts_print(
+        f"{'Metric':<40} {'Mode':<16} {'Group':<16} {args.runcode_a[:14]:>14} "
+        f"{args.runcode_b[:14]:>14} {'Delta':>14}  Report"
+    )
+    for name, mode, _, group, report, a, b in get_qor_diff(
+        conn, args.flow, args.runcode_a, args.runcode_b, args.metric
+    ):
+        if args.changed and a == b:
+            continue
+        delta = b - a if a is not None and b is not None else None
+        ts_print(
+            f"{name:<40} {mode or '-':<16} {group or '-':<16} {fmt(a):>14} {fmt(b):>14} "
+            f"{fmt(delta):>14}  {report}",
+            color=TsColors.ORANGE if a != b else None,
+        )
+
+
+def print_paths(conn, args):
+    """
+    Prints worst timing paths of a runcode.
+    """
+    ts_print(f"{'Slack':>12} {'Type':<5} {'Mode':<16} {'Group':<16} Startpoint -> Endpoint")
+    for path in get_qor_paths(conn, args.flow, args.runcode, args.group, args.limit):
+        ts_print(
+            f"{fmt(path['slack']):>12} {path['path_type']:<5} {path['mode'] or '-':<16} "
+            f"{path['path_group'] or '-':<16} {path['startpoint']} -> {path['endpoint']}",
+            color=TsColors.RED if path["slack"] < 0 else None,
+        )
+
+
+if __name__ == "__main__":
+
+    init_signals_handler()
+
+    parser = TsArgumentParser(description="QoR database query script")
+    add_ts_common_args(parser)
+    add_ts_qor_args(parser)
+    argcomplete.autocomplete(parser)
+    args = parser.parse_args()
+
+    ts_configure_logging(args)
+
+    if args.command == "ingest":
+        ingest_qor_reports(
+            args.flow, args.runcode, args.reports_dir, args.qor_db, args.mode
+        )
+        sys.exit(0)
+
+    conn = qor_db_connect(args.qor_db)
+    {
+        "runs": print_runs,
+        "trend": print_trend,
+        "diff": print_diff,
+        "paths": print_paths,
+    }[args.command](conn, args)
+    conn.close()
+
+    sys.exit(0)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+####################################################################################################
+# Tropic Square release verification script
+#
+# Verifies files released by syn/sta/pnr/dft flows (--release) towards release manifest.
+#
+# For license see LICENSE file in repository root.
+####################################################################################################
+
+import sys
+
+import argcomplete
+from internal.ts_hw_args import (
+    TsArgumentParser,
+    add_ts_common_args,
+    add_ts_release_verify_args,
+)
+from internal.ts_hw_common import init_signals_handler
+from internal.ts_hw_logging import (
+    TsErrCode,
+    TsInfoCode,
+    ts_configure_logging,
+    ts_info,
+    ts_throw_error,
+)
+from internal.ts_hw_release import verify_release
+
+if __name__ == "__main__":
+
+    init_signals_handler()
+
+    parser = TsArgumentParser(description="Release verification script")
+    add_ts_common_args(parser)
+    add_ts_release_verify_args(parser)
+    argcomplete.autocomplete(parser)
+    args = parser.parse_args()
+
+    ts_configure_logging(args)
+
+    problems = verify_release(args.release_dir, args.full)
+    for rel, problem in problems:
+        print(f"    {rel}: {problem}")
+    if problems:
+        ts_throw_error(
+            TsErrCode.GENERIC, f"Release '{args.release_dir}' differs from its manifest!"
+        )
+
+    ts_info(TsInfoCode.GENERIC, f"Release '{args.release_dir}' verified OK")
+
+    sys.exit(0)
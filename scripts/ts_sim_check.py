@@ -16,6 +16,7 @@ __maintainer__ = "Ondrej Ille"
 import argcomplete
 import junit_xml
 import sys
+import time
 
 from internal.ts_hw_args import (
     TsArgumentParser,
@@ -34,6 +35,8 @@ from internal.ts_hw_common import (
 )
 from internal.ts_hw_global_vars import TsGlobals
 from internal.ts_hw_logging import ts_configure_logging
+from internal.ts_hw_metrics import ts_metrics_count
+from internal.ts_hw_profile import ts_span
 
 
 def sim_check(arguments, log_files):
@@ -41,8 +44,9 @@ def sim_check(arguments, log_files):
     args = {"exp_junit_logs": False, **vars(arguments)}
 
     junit_tests = []
+    check_start = time.time()
 
-    with TSLogChecker() as checker:
+    with ts_span("check"), TSLogChecker() as checker:
 
         # Go through the log files provided (multiple arguments) and check results
         for log_file in map(ts_get_curr_dir_rel_path, log_files):
@@ -53,6 +57,8 @@ def sim_check(arguments, log_files):
                 generate_junit_test_object(results, log_file, args["exp_junit_logs"])
             )
 
+    ts_metrics_count("log_check_time", time.time() - check_start)
+
     # Create JUnit test collection and export it
     ts = junit_xml.TestSuite("Test results", junit_tests)
     with open(ts_get_root_rel_path(TsGlobals.TS_SIM_JUNIT_SUMMARY_PATH), "w") as f:
@@ -44,6 +44,7 @@ from internal.ts_hw_logging import (
     ts_print,
     ts_throw_error,
 )
+from internal.ts_hw_profile import ts_span
 from internal.ts_hw_simulator_ifc import ts_sim_compile
 from internal.ts_hw_source_list_files import (
     load_source_list_files,
@@ -68,7 +69,8 @@ def sim_compile(arguments):
     # Loading source list files for a target
     ts_info(TsInfoCode.INFO_CMN_3, args["target"])
 
-    load_source_list_files(args["target"])
+    with ts_span("load_source_list"):
+        load_source_list_files(args["target"])
 
     # Print list of targets
     if args["list_targets"]:
@@ -13,11 +13,15 @@ __copyright__ = "Tropic Square"
 __license___ = "TODO:"
 __maintainer__ = "Henri LHote"
 
+import hashlib
+import json
 import os
 import pickle
+import re
 import shutil
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import argcomplete
 from internal.ts_hw_args import (
@@ -46,22 +50,134 @@ from internal.ts_hw_logging import (
 COVERAGE_OUTPUT_DIR = ts_get_root_rel_path(TsGlobals.TS_COVERAGE_DIR_PATH)
 DEFAULT_OUTPUT_DB = "coverage_merge"
 
+# Version of merge manifest format. Increment when format changes!
+MERGE_MANIFEST_VERSION = 2
 
-def __merge_databases(args):
+# Version of coverage catalog format. Increment when format changes!
+COVERAGE_CATALOG_VERSION = 1
+
+COVERAGE_CATALOG = os.path.join(COVERAGE_OUTPUT_DIR, "coverage_catalog.json")
+
+SIM_RUN_INFO = "_ts_flow_simulation_run_info.json"
+
+REF_ELAB_DIR = "_ts_flow_reference_elaboration_directory"
+
+# Sections of urg grading report: tests selected by grading and other tests or summaries
+GRADE_SELECTED_SECTION_REGEX = re.compile(
+    r"\s*(graded\s+tests|tests\s+graded|selected\s+tests)\b", re.IGNORECASE
+)
+GRADE_OTHER_SECTION_REGEX = re.compile(
+    r"\s*(redundant|non-?contributing|ungraded|tests\s+(not|with\s+no|that\s+do)\b"
+    r"|total\s+coverage|hierarchical|groups\b)",
+    re.IGNORECASE,
+)
+
+# Separators of path components and test names in rows of urg grading report
+GRADE_NAME_SPLIT_REGEX = re.compile(r"[\s/:]+")
+
+
+def __read_catalog_entry(sim_db: str) -> dict:
     """
-    Merge input databases
+    Read catalog entry of a simulation database from simulation directory.
+    :param sim_db: Simulation database
+    :return: Catalog entry: simulation database, elaboration database, test name, seed,
+             simulation run time
     """
+    sim_dir = os.path.dirname(sim_db)
+    run_info_path = os.path.join(sim_dir, SIM_RUN_INFO)
+    if os.path.isfile(run_info_path):
+        with open(run_info_path) as fd:
+            run_info = json.load(fd)
+        return {
+            "sim_db": sim_db,
+            "elab_db": os.path.join(run_info["elab_dir"], "simv.vdb"),
+            "test": run_info["test"],
+            "seed": run_info["seed"],
+            "run_time": run_info["run_time"],
+            "mtime": os.stat(run_info_path).st_mtime_ns,
+        }
+
+    # Simulation ran by older flow, only reference elaboration directory is available
+    ref_elab_dir_path = os.path.join(sim_dir, REF_ELAB_DIR)
+    with open(ref_elab_dir_path, "rb") as fd:
+        elab_db = os.path.join(pickle.load(fd), "simv.vdb")
+    return {
+        "sim_db": sim_db,
+        "elab_db": elab_db,
+        "test": None,
+        "seed": None,
+        "run_time": None,
+        "mtime": os.stat(ref_elab_dir_path).st_mtime_ns,
+    }
 
-    # - Create command line
-    command = ["urg -full64"]
 
-    # - Manage reporting
-    if args["no_report"]:
-        command.append("-noreport")
-        ts_debug("Coverage databases will be merged without report.")
+def __get_catalog_entry_mtime(sim_db: str):
+    """
+    Modification time of file the catalog entry of a simulation database is read from.
+    :param sim_db: Simulation database
+    """
+    sim_dir = os.path.dirname(sim_db)
+    for file_name in (SIM_RUN_INFO, REF_ELAB_DIR):
+        try:
+            return os.stat(os.path.join(sim_dir, file_name)).st_mtime_ns
+        except FileNotFoundError:
+            pass
+    ts_throw_error(
+        TsErrCode.GENERIC,
+        f"Simulation directory '{sim_dir}' does not contain simulation run information!",
+    )
 
-    # - Add simulation databases
-    input_dbs = set()
+
+def __get_coverage_catalog(sim_dbs: list) -> dict:
+    """
+    Get coverage catalog of simulation databases. Catalog is stored in coverage output
+    directory, only entries of new or re-run simulations are read from simulation
+    directories.
+    :param sim_dbs: Simulation databases
+    :return: Catalog: simulation database -> catalog entry
+    """
+    stored_entries = {}
+    try:
+        with open(COVERAGE_CATALOG) as fd:
+            catalog = json.load(fd)
+        if catalog.get("version") == COVERAGE_CATALOG_VERSION:
+            stored_entries = catalog["entries"]
+    except (FileNotFoundError, ValueError):
+        pass
+
+    entries = {}
+    for sim_db in sim_dbs:
+        entry = stored_entries.get(sim_db)
+        if entry is None or entry["mtime"] != __get_catalog_entry_mtime(sim_db):
+            ts_debug(f"Updating catalog entry of '{sim_db}'")
+            entry = __read_catalog_entry(sim_db)
+        entries[sim_db] = entry
+
+    # Store updated catalog, entries of databases not processed by this call are kept
+    if any(stored_entries.get(sim_db) != entry for sim_db, entry in entries.items()):
+        os.makedirs(COVERAGE_OUTPUT_DIR, exist_ok=True)
+        tmp_path = f"{COVERAGE_CATALOG}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fd:
+            json.dump(
+                {
+                    "version": COVERAGE_CATALOG_VERSION,
+                    "entries": {**stored_entries, **entries},
+                },
+                fd,
+                indent=4,
+            )
+        os.replace(tmp_path, COVERAGE_CATALOG)
+
+    return entries
+
+
+def __get_input_databases(args) -> tuple:
+    """
+    Get simulation and associated elaboration databases to be merged.
+    :return: Tuple (list of (simulation database, elaboration database), coverage catalog
+             of the simulation databases)
+    """
+    sim_dbs = set()
     if args["test"]:
         # Take specified databases
         for test in args["test"]:
@@ -83,7 +199,7 @@ def __merge_databases(args):
                     "Make sure you ran the simulation with the '--coverage' option.",
                 )
             ts_debug("OK")
-            input_dbs.add(input_db)
+            sim_dbs.add(input_db)
     else:
         # Else take all databases available in build directory
         build_dir = ts_get_root_rel_path(TsGlobals.TS_SIM_BUILD_PATH)
@@ -98,37 +214,32 @@ def __merge_databases(args):
                 sim_db = os.path.join(dir_entry.path, "simv.vdb")
                 if os.path.isdir(sim_db):
                     ts_debug(f"Adding simulation database: '{sim_db}'")
-                    input_dbs.add(sim_db)
-        if not input_dbs:
+                    sim_dbs.add(sim_db)
+        if not sim_dbs:
             ts_throw_error(TsErrCode.GENERIC, "Could not find any database to merge!")
 
-    # Add elaboration coverage databases associated to simulation databases
-    for sim_db in input_dbs.copy():
-        with open(
-            os.path.join(
-                os.path.dirname(sim_db), "_ts_flow_reference_elaboration_directory"
-            ),
-            "rb",
-        ) as fd:
-            elab_db = os.path.join(pickle.load(fd), "simv.vdb")
-            if elab_db not in input_dbs:
-                ts_debug(f"Adding elaboration database: '{elab_db}'")
-                input_dbs.add(elab_db)
+    # Find elaboration coverage databases associated to simulation databases
+    catalog = __get_coverage_catalog(sorted(sim_dbs))
+    return [(sim_db, catalog[sim_db]["elab_db"]) for sim_db in sorted(sim_dbs)], catalog
 
-    for input_db in input_dbs:
-        command.append(f"-dir {input_db}")
 
-    # - Exclusion file
-    if args["elfile"]:
-        elfile = ts_get_root_rel_path(args["elfile"])
-        if not os.path.isfile(elfile):
-            ts_throw_error(
-                TsErrCode.GENERIC, f"Exclusion file '{elfile}' does not exist."
-            )
-        ts_info(TsInfoCode.GENERIC, f"Using exclusion file '{elfile}'")
-        command.append(f"-elfile {elfile}")
+def __get_exclusion_file(args):
+    """
+    Get path of exclusion file, None if no exclusion file is used.
+    """
+    if not args["elfile"]:
+        return None
+    elfile = ts_get_root_rel_path(args["elfile"])
+    if not os.path.isfile(elfile):
+        ts_throw_error(TsErrCode.GENERIC, f"Exclusion file '{elfile}' does not exist.")
+    ts_info(TsInfoCode.GENERIC, f"Using exclusion file '{elfile}'")
+    return elfile
 
-    # - Output database management
+
+def __get_output_database_path(args) -> str:
+    """
+    Get path of output database.
+    """
     output_db = args.get("output", DEFAULT_OUTPUT_DB)
 
     # output arg can be either:
@@ -137,10 +248,21 @@ def __merge_databases(args):
     #   - absolute path, e.g. /projects/tropic01/sim/coverage_output/example_db.vdb
     if not output_db.endswith(".vdb"):
         output_db += ".vdb"
-    output_db = os.path.join(COVERAGE_OUTPUT_DIR, output_db)
+    return os.path.join(COVERAGE_OUTPUT_DIR, output_db)
+
+
+def __get_output_database(args) -> str:
+    """
+    Get path of output database. Removes the database if '--clear' is set.
+    Existing database is allowed in incremental mode.
+    """
+    output_db = __get_output_database_path(args)
     if args["clear"]:
         ts_debug(f"Removing directory '{output_db}'")
         shutil.rmtree(output_db, ignore_errors=True)
+        __remove_merge_manifest(output_db)
+    if args["incremental"]:
+        return output_db
     ts_info(TsInfoCode.GENERIC, f"Checking absence of '{output_db}'")
     if os.path.isdir(output_db):
         ts_throw_error(
@@ -149,14 +271,40 @@ def __merge_databases(args):
             "Activate the '--clear' option to remove it.",
         )
     ts_debug("OK")
+    return output_db
+
+
+def __build_merge_command(input_dbs, output_db: str, report: bool, elfile=None) -> str:
+    """
+    Build merge command
+    :param input_dbs: Databases to be merged
+    :param output_db: Output database
+    :param report: Generate report upon merge
+    :param elfile: Exclusion file
+    """
+    command = ["urg -full64"]
+
+    if not report:
+        command.append("-noreport")
+
+    for input_db in input_dbs:
+        command.append(f"-dir {input_db}")
+
+    if elfile:
+        command.append(f"-elfile {elfile}")
+
     command.append(f"-dbname {output_db}")
 
-    # - Format command
-    command = " ".join(command)
+    return " ".join(command)
+
+
+def __run_merge(command: str) -> int:
+    """
+    Run merge command in coverage output directory
+    :param command: Merge command
+    """
     ts_info(TsInfoCode.GENERIC, command)
 
-    # - Run coverage
-    os.makedirs(COVERAGE_OUTPUT_DIR, exist_ok=True)
     run_time = time.time()
     merge_exit_code = exec_cmd_in_dir(
         directory=COVERAGE_OUTPUT_DIR,
@@ -171,6 +319,379 @@ def __merge_databases(args):
     return merge_exit_code
 
 
+def __tree_merge(input_dbs: list, output_db: str, fan_in: int, jobs: int) -> list:
+    """
+    Merge databases by tree reduction. Databases are partitioned into groups of 'fan_in'
+    databases, groups are merged in parallel into intermediate databases (without report),
+    intermediate databases are merged again, until there is at most 'fan_in' of them.
+    :param input_dbs: List of (simulation database, elaboration database)
+    :param output_db: Output database. Intermediate databases are placed next to it.
+    :param fan_in: Maximal number of simulation databases merged by single merge
+    :param jobs: Maximal number of merges running in parallel
+    :return: Intermediate databases to be merged into output database
+    """
+    tree_dir = os.path.splitext(output_db)[0] + "_tree"
+    shutil.rmtree(tree_dir, ignore_errors=True)
+    os.makedirs(tree_dir)
+
+    # First level merges simulation databases together with their elaboration databases
+    groups = []
+    for i in range(0, len(input_dbs), fan_in):
+        group = input_dbs[i : i + fan_in]
+        elab_dbs = sorted(set(elab_db for _, elab_db in group))
+        groups.append([sim_db for sim_db, _ in group] + elab_dbs)
+
+    level = 0
+    while len(groups) > 1:
+        ts_info(
+            TsInfoCode.GENERIC,
+            f"Merging level {level}: {len(groups)} group(s) of at most {fan_in} database(s)",
+        )
+        level_dbs = [
+            os.path.join(tree_dir, f"level_{level}_group_{i}.vdb")
+            for i in range(len(groups))
+        ]
+        with ProcessPoolExecutor(jobs) as executor:
+            exit_codes = executor.map(
+                __run_merge,
+                [
+                    __build_merge_command(group, level_db, report=False)
+                    for group, level_db in zip(groups, level_dbs)
+                ],
+            )
+            for exit_code, level_db in zip(exit_codes, level_dbs):
+                if exit_code != 0:
+                    ts_throw_error(
+                        TsErrCode.GENERIC,
+                        f"Merge of intermediate database '{level_db}' failed "
+                        f"with exit code {exit_code}!",
+                    )
+
+        groups = [level_dbs[i : i + fan_in] for i in range(0, len(level_dbs), fan_in)]
+        level += 1
+
+    return groups[0]
+
+
+def __get_merge_manifest_path(output_db: str) -> str:
+    """
+    Path of manifest of databases merged into output database.
+    :param output_db: Output database
+    """
+    return os.path.splitext(output_db)[0] + "_manifest.json"
+
+
+def __get_db_fingerprint(db: str) -> str:
+    """
+    Fingerprint of database content: relative path, size and modification time of each file.
+    :param db: Database directory
+    """
+    fingerprint = hashlib.sha256()
+    for root, dirs, files in os.walk(db):
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            stat = os.stat(file_path)
+            fingerprint.update(
+                f"{os.path.relpath(file_path, db)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode()
+            )
+    return fingerprint.hexdigest()
+
+
+def __get_elfile_fingerprint(elfile):
+    """
+    Fingerprint of exclusion file: its path and SHA-256 of its content.
+    :param elfile: Exclusion file, None if no exclusion file is used.
+    :return: Fingerprint, None if no exclusion file is used.
+    """
+    if elfile is None:
+        return None
+    with open(elfile, "rb") as fd:
+        return f"{elfile}:{hashlib.sha256(fd.read()).hexdigest()}"
+
+
+def __remove_merge_manifest(output_db: str):
+    """
+    Removes manifest of output database, e.g. when output database is rebuilt.
+    :param output_db: Output database
+    """
+    try:
+        os.remove(__get_merge_manifest_path(output_db))
+        ts_debug(f"Removed manifest of '{output_db}'")
+    except FileNotFoundError:
+        pass
+
+
+def __load_merge_manifest(output_db: str):
+    """
+    Loads manifest of databases merged into output database.
+    :param output_db: Output database
+    :return: Manifest dictionary, None if output database or manifest does not exist or
+             manifest is not valid.
+    """
+    if not os.path.isdir(output_db):
+        return None
+    try:
+        with open(__get_merge_manifest_path(output_db)) as fd:
+            manifest = json.load(fd)
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get("version") != MERGE_MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def __write_merge_manifest(output_db: str, sim_dbs: dict, elab_dbs: dict, elfile):
+    """
+    Writes manifest of databases merged into output database.
+    :param output_db: Output database
+    :param sim_dbs: Simulation databases merged: path -> fingerprint
+    :param elab_dbs: Elaboration databases merged: path -> fingerprint
+    :param elfile: Exclusion file used by the merge, None if no exclusion file is used.
+    """
+    manifest_path = __get_merge_manifest_path(output_db)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as fd:
+        json.dump(
+            {
+                "version": MERGE_MANIFEST_VERSION,
+                "sim_dbs": sim_dbs,
+                "elab_dbs": elab_dbs,
+                "elfile": __get_elfile_fingerprint(elfile),
+            },
+            fd,
+            indent=4,
+        )
+    os.replace(tmp_path, manifest_path)
+
+
+def __get_incremental_inputs(input_dbs: list, output_db: str, manifest: dict, elfile):
+    """
+    Get databases which are not merged in output database yet.
+    :param input_dbs: List of (simulation database, elaboration database)
+    :param output_db: Output database
+    :param manifest: Manifest of output database
+    :param elfile: Exclusion file, None if no exclusion file is used.
+    :return: Sub-list of 'input_dbs' to be merged into output database, None if output
+             database must be rebuilt from scratch.
+    """
+    if manifest is None:
+        ts_info(TsInfoCode.GENERIC, f"No valid manifest for '{output_db}', full merge.")
+        return None
+
+    if manifest["elfile"] != __get_elfile_fingerprint(elfile):
+        ts_info(TsInfoCode.GENERIC, "Exclusion file changed, full merge.")
+        return None
+
+    for elab_db in sorted(set(elab_db for _, elab_db in input_dbs)):
+        fingerprint = manifest["elab_dbs"].get(elab_db)
+        if fingerprint is not None and fingerprint != __get_db_fingerprint(elab_db):
+            ts_info(
+                TsInfoCode.GENERIC, f"Elaboration database '{elab_db}' changed, full merge."
+            )
+            return None
+
+    new_dbs = []
+    for sim_db, elab_db in input_dbs:
+        fingerprint = manifest["sim_dbs"].get(sim_db)
+        if fingerprint is None:
+            new_dbs.append((sim_db, elab_db))
+        elif fingerprint != __get_db_fingerprint(sim_db):
+            # Already merged database can not be replaced in output database
+            ts_info(
+                TsInfoCode.GENERIC, f"Simulation database '{sim_db}' changed, full merge."
+            )
+            return None
+    return new_dbs
+
+
+def __merge_databases(args):
+    """
+    Merge input databases
+    """
+    input_dbs, _ = __get_input_databases(args)
+
+    # - Manage reporting
+    if args["no_report"]:
+        ts_debug("Coverage databases will be merged without report.")
+
+    # - Exclusion file
+    elfile = __get_exclusion_file(args)
+
+    # - Output database management
+    output_db = __get_output_database(args)
+    merge_db = output_db
+    dbs_to_merge = input_dbs
+
+    os.makedirs(COVERAGE_OUTPUT_DIR, exist_ok=True)
+
+    # - Incremental mode: merge only databases not yet merged in output database
+    if args["incremental"]:
+        manifest = __load_merge_manifest(output_db)
+        new_dbs = __get_incremental_inputs(input_dbs, output_db, manifest, elfile)
+        if new_dbs is None:
+            ts_debug(f"Removing directory '{output_db}'")
+            shutil.rmtree(output_db, ignore_errors=True)
+        elif not new_dbs:
+            ts_info(TsInfoCode.GENERIC, f"Output database '{output_db}' is up-to-date.")
+            return 0
+        else:
+            ts_info(
+                TsInfoCode.GENERIC,
+                f"Merging {len(new_dbs)} new database(s) into '{output_db}'",
+            )
+            dbs_to_merge = new_dbs
+            merge_db = os.path.splitext(output_db)[0] + "_incr.vdb"
+            shutil.rmtree(merge_db, ignore_errors=True)
+
+    # - Output database is rebuilt -> Its manifest is no longer valid
+    if merge_db == output_db:
+        __remove_merge_manifest(output_db)
+
+    # - Merge in a tree if there are too many databases for single merge
+    fan_in = args["merge_fan_in"]
+    if fan_in > 1 and len(dbs_to_merge) > fan_in:
+        final_dbs = __tree_merge(dbs_to_merge, output_db, fan_in, args["merge_jobs"])
+    else:
+        final_dbs = [sim_db for sim_db, _ in dbs_to_merge]
+        final_dbs.extend(sorted(set(elab_db for _, elab_db in dbs_to_merge)))
+
+    # - Previous output database is input of incremental merge
+    if merge_db != output_db:
+        final_dbs.insert(0, output_db)
+
+    # - Run coverage, only final merge produces the report
+    merge_exit_code = __run_merge(
+        __build_merge_command(final_dbs, merge_db, not args["no_report"], elfile)
+    )
+
+    if merge_exit_code == 0 and fan_in > 1:
+        shutil.rmtree(os.path.splitext(output_db)[0] + "_tree", ignore_errors=True)
+
+    # - Replace previous output database by incrementally merged one
+    if merge_exit_code == 0 and merge_db != output_db:
+        shutil.rmtree(output_db)
+        os.rename(merge_db, output_db)
+
+    # - Keep track of merged databases
+    if merge_exit_code == 0 and args["incremental"]:
+        sim_dbs = {} if merge_db == output_db else dict(manifest["sim_dbs"])
+        elab_dbs = {} if merge_db == output_db else dict(manifest["elab_dbs"])
+        for sim_db, elab_db in dbs_to_merge:
+            sim_dbs[sim_db] = __get_db_fingerprint(sim_db)
+            if elab_db not in elab_dbs:
+                elab_dbs[elab_db] = __get_db_fingerprint(elab_db)
+        __write_merge_manifest(output_db, sim_dbs, elab_dbs, elfile)
+
+    return merge_exit_code
+
+
+def __get_graded_tests(grade_report: str, catalog_entries: list) -> list:
+    """
+    Get tests selected by coverage grading, in order of their contribution. Only rows of
+    the section of grading report listing graded tests are taken into account, tests
+    listed in other sections (e.g. redundant tests) are not selected.
+    :param grade_report: Grading report in text format
+    :param catalog_entries: Catalog entries of graded simulation databases
+    :return: Catalog entries of selected tests
+    """
+    # Tests are identified in the report by path of their database (simulation directory)
+    entries = {
+        os.path.basename(os.path.dirname(entry["sim_db"])): entry for entry in catalog_entries
+    }
+
+    selected = []
+    found_section = False
+    in_section = False
+    with open(grade_report) as fd:
+        for line in fd:
+            if GRADE_SELECTED_SECTION_REGEX.match(line):
+                found_section = in_section = True
+                continue
+            if GRADE_OTHER_SECTION_REGEX.match(line):
+                in_section = False
+                continue
+            if not in_section:
+                continue
+            for name in GRADE_NAME_SPLIT_REGEX.split(line):
+                entry = entries.get(name)
+                if entry is not None and entry not in selected:
+                    selected.append(entry)
+                    break
+
+    if not found_section:
+        ts_throw_error(
+            TsErrCode.GENERIC,
+            f"Section of graded tests not found in grading report '{grade_report}'!",
+        )
+    return selected
+
+
+def __grade_databases(args):
+    """
+    Grade simulation databases: select minimal set of tests reaching the same merged
+    coverage, report contribution of the tests and the redundant ones.
+    """
+    input_dbs, catalog = __get_input_databases(args)
+    elfile = __get_exclusion_file(args)
+
+    os.makedirs(COVERAGE_OUTPUT_DIR, exist_ok=True)
+    output_db = os.path.splitext(__get_output_database_path(args))[0]
+    report_dir = f"{output_db}_grade"
+    shutil.rmtree(report_dir, ignore_errors=True)
+
+    # - Let urg select tests in order of their coverage contribution
+    command = ["urg -full64"]
+    command.extend(f"-dir {sim_db}" for sim_db, _ in input_dbs)
+    command.extend(f"-dir {elab_db}" for elab_db in sorted(set(e for _, e in input_dbs)))
+    if elfile:
+        command.append(f"-elfile {elfile}")
+    command.append(f"-grade {args['grade']} -format text -report {report_dir}")
+    grade_exit_code = __run_merge(" ".join(command))
+    if grade_exit_code:
+        return grade_exit_code
+
+    grade_report = os.path.join(report_dir, "grade.txt")
+    if not os.path.isfile(grade_report):
+        ts_throw_error(TsErrCode.GENERIC, f"Grading report '{grade_report}' not found!")
+
+    entries = [catalog[sim_db] for sim_db, _ in input_dbs]
+    selected = __get_graded_tests(grade_report, entries)
+    redundant = [entry for entry in entries if entry not in selected]
+
+    def _run_time(tests):
+        return sum(entry["run_time"] or 0 for entry in tests)
+
+    # - Store minimal test set
+    with open(f"{output_db}_grade.json", "w") as fd:
+        json.dump(
+            {
+                "selected": selected,
+                "redundant": redundant,
+                "selected_run_time": _run_time(selected),
+                "total_run_time": _run_time(entries),
+            },
+            fd,
+            indent=4,
+        )
+
+    for rank, entry in enumerate(selected):
+        ts_info(
+            TsInfoCode.GENERIC,
+            f"{rank + 1:>4}: {entry['test']} (seed: {entry['seed']}, "
+            f"run time: {entry['run_time'] or 0:.1f} s) '{entry['sim_db']}'",
+        )
+    ts_info(
+        TsInfoCode.GENERIC,
+        f"{len(selected)} of {len(entries)} test(s) reach the merged coverage, "
+        f"{len(redundant)} test(s) are redundant. Run time of selected tests: "
+        f"{_run_time(selected):.1f} s of {_run_time(entries):.1f} s.",
+    )
+    ts_info(TsInfoCode.GENERIC, f"Minimal test set stored in '{output_db}_grade.json'")
+
+    return 0
+
+
 def __show_output_database(args):
     """
     Display output database in GUI
@@ -218,6 +739,10 @@ def sim_coverage(arguments):
         "gui": False,
         "no_report": False,
         "no_sim_out": False,
+        "incremental": False,
+        "grade": None,
+        "merge_fan_in": 0,
+        "merge_jobs": 1,
         **vars(arguments),
     }
 
@@ -230,6 +755,10 @@ def sim_coverage(arguments):
     elif args["gui"]:
         exit_code = __show_output_database(args)
 
+    # Grade input databases
+    elif args["grade"]:
+        exit_code = __grade_databases(args)
+
     # Merge input databases
     else:
         exit_code = __merge_databases(args)
@@ -16,13 +16,15 @@ __maintainer__ = "Ondrej Ille"
 import os
 import shutil
 import sys
+import time
 from concurrent.futures import ProcessPoolExecutor, wait
-from copy import deepcopy
 
 import argcomplete
 from internal.ts_hw_args import (
     TsArgumentParser,
     add_cfg_files_arg,
+    add_metrics_args,
+    add_profile_arg,
     add_target_arg,
     add_ts_common_args,
     add_ts_sim_regress_args,
@@ -53,51 +55,129 @@ from internal.ts_hw_logging import (
     ts_print,
     ts_throw_error,
 )
-from internal.ts_hw_simulator_ifc import ts_sim_elaborate
-from internal.ts_hw_test_list_files import get_test_list, get_tests_to_run, load_tests
+from internal.ts_hw_metrics import (
+    ts_metrics_init,
+    ts_metrics_init_worker,
+    ts_metrics_merge,
+    ts_metrics_pop,
+    ts_metrics_record_test,
+)
+from internal.ts_hw_profile import (
+    ts_profile_event,
+    ts_profile_flush,
+    ts_profile_init,
+    ts_profile_init_worker,
+    ts_span,
+)
+from internal.ts_hw_simulator_ifc import (
+    ts_get_sim_run_context,
+    ts_init_sim_run_context,
+    ts_sim_elaborate,
+)
+from internal.ts_hw_test_list_files import (
+    TsTestRun,
+    get_test_list,
+    get_tests_to_run,
+    load_tests,
+)
 from ts_sim_check import sim_check
 from ts_sim_compile import sim_compile
 from ts_sim_run import ts_sim_run
 
 
-def elaborate_regression_test(test, loop_index):
+def elaborate_regression_test(test_name, loop_index):
     """
     Elaborate single test.
+    :return: Test run, elaboration log file and elaboration directory.
     """
     ts_print(
-        f"Starting test: {test['name']}-{loop_index}", color=TsColors.PURPLE, big=True
+        f"Starting test: {test_name}-{loop_index}", color=TsColors.PURPLE, big=True
     )
 
-    test["seed"] = ts_generate_seed()
+    test = TsTestRun(test_name, ts_generate_seed(), loop_index)
 
     # Call pre-test hooks
-    ts_call_global_hook(TsHooks.PRE_TEST, test["name"], test["seed"], loop_index)
+    hook_context = {"test": test, "seed": test["seed"], "loop": loop_index}
+    ts_call_global_hook(
+        TsHooks.PRE_TEST, test["name"], test["seed"], loop_index, **hook_context
+    )
     ts_call_local_hook(
-        TsHooks.PRE_TEST_SPECIFIC, test, test["name"], test["seed"], loop_index
+        TsHooks.PRE_TEST_SPECIFIC,
+        test,
+        test["name"],
+        test["seed"],
+        loop_index,
+        **hook_context,
     )
 
     #######################################################################################
     # Run elaboration
     #######################################################################################
-    return ts_sim_elaborate(test)
+    return (test, *ts_sim_elaborate(test))
+
+
+def init_regression_worker(ctx, profile_file, metrics):
+    """
+    Regression worker process initializer.
+    :param ctx: Simulation run context built by main process.
+    :param profile_file: Trace file if profiling is enabled, None otherwise.
+    :param metrics: Metrics collection is enabled.
+    """
+    ts_init_sim_run_context(ctx)
+    if profile_file is not None:
+        ts_profile_init_worker(profile_file)
+    if metrics:
+        ts_metrics_init_worker()
 
 
-def run_regression_test(test, loop_index, elab_dir):
+def run_regression_test(test, elab_dir, queued_at=0):
     """
     Run single test.
+    :param test: Test run (TsTestRun). Test definition is shared with parent process,
+                 only name, seed and loop index are sent to the worker.
+    :param elab_dir: Elaboration directory
+    :param queued_at: Time the test was queued at (ns, as returned by 'time.time_ns')
+    :return: Simulation log file and metrics collected by the worker.
     """
+    if queued_at:
+        ts_profile_event("queue", queued_at, time.time_ns(), test=test["name"])
+        ts_metrics_record_test(
+            test, "sim", queue_time=(time.time_ns() - queued_at) / 1e9
+        )
+
+    try:
+        return __run_regression_test(test, elab_dir), ts_metrics_pop()
+    finally:
+        ts_profile_flush()
+
+
+def __run_regression_test(test, elab_dir):
+    """
+    Run single test, see 'run_regression_test'.
+    """
+    loop_index = test["loop_index"]
+
     #######################################################################################
     # Run simulation
     #######################################################################################
-    ts_call_global_hook(TsHooks.PRE_SIM)
+    hook_context = {"test": test, "seed": test["seed"], "loop": loop_index}
+    ts_call_global_hook(TsHooks.PRE_SIM, **hook_context)
 
     sim_log_file = ts_sim_run(test, elab_dir)
 
     # Call post-test hooks
+    hook_context["log_file"] = sim_log_file
     ts_call_local_hook(
-        TsHooks.POST_TEST_SPECIFIC, test, test["name"], test["seed"], loop_index
+        TsHooks.POST_TEST_SPECIFIC,
+        test,
+        test["name"],
+        test["seed"],
+        loop_index,
+        **hook_context,
+    )
+    ts_call_global_hook(
+        TsHooks.POST_TEST, test["name"], test["seed"], loop_index, **hook_context
     )
-    ts_call_global_hook(TsHooks.POST_TEST, test["name"], test["seed"], loop_index)
 
     return sim_log_file
 
@@ -112,14 +192,19 @@ if __name__ == "__main__":
     add_cfg_files_arg(parser)
     add_target_arg(parser)
     add_ts_sim_regress_args(parser)
+    add_profile_arg(parser)
+    add_metrics_args(parser)
     argcomplete.autocomplete(parser)
     args = parser.parse_args()
     TsGlobals.TS_SIM_CFG_PATH = args.sim_cfg
     ts_configure_logging(args)
+    ts_profile_init(args.profile)
+    ts_metrics_init(args.metrics_json, args.metrics_prom)
 
     # Load config file, merge with args and check configuration
-    do_sim_config_init(args)
-    do_design_config_init(args)
+    with ts_span("config_load"):
+        do_sim_config_init(args)
+        do_design_config_init(args)
 
     # Fill default config values for command line options which are not available
     # in ts_sim_regress.py
@@ -136,7 +221,8 @@ if __name__ == "__main__":
     check_target(args.target)
 
     # Load available tests
-    load_tests()
+    with ts_span("load_tests"):
+        load_tests()
 
     # Check that no test is given as a special option
     if not args.test_name:
@@ -183,19 +269,37 @@ if __name__ == "__main__":
 
     futures = []
 
-    with ProcessPoolExecutor(ts_get_cfg("regress_jobs")) as executor:
+    # Configuration snapshot is shipped to each worker once, when the worker starts
+    with ProcessPoolExecutor(
+        ts_get_cfg("regress_jobs"),
+        initializer=init_regression_worker,
+        initargs=(
+            ts_get_sim_run_context(),
+            TsGlobals.TS_PROFILE_FILE,
+            TsGlobals.TS_METRICS is not None,
+        ),
+    ) as executor:
         for test in TsGlobals.TS_TEST_RUN_LIST:
             for i in range(test["regress_loops"]):
-                _test = deepcopy(test)
                 # Elaborate each test one by one - blocking
-                elab_log_file, elab_dir = elaborate_regression_test(_test, i)
+                _test, elab_log_file, elab_dir = elaborate_regression_test(
+                    test["name"], i
+                )
                 all_elab_log_files.append(elab_log_file)
                 # Enqueue run job in thread pool - non-blocking
-                futures.append(executor.submit(run_regression_test, _test, i, elab_dir))
+                futures.append(
+                    executor.submit(
+                        run_regression_test, _test, elab_dir, time.time_ns()
+                    )
+                )
         # Wait until all jobs are finished
         wait(futures)
 
-    all_sim_log_files = [future.result() for future in futures]
+    all_sim_log_files = []
+    for future in futures:
+        sim_log_file, worker_metrics = future.result()
+        all_sim_log_files.append(sim_log_file)
+        ts_metrics_merge(worker_metrics)
 
     ts_call_global_hook(TsHooks.POST_RUN)
 
@@ -214,7 +318,7 @@ if __name__ == "__main__":
         ts_info(TsInfoCode.GENERIC, "Checking log files:")
         ret_val = sim_check(args, all_sim_log_files)
 
-        ts_call_global_hook(TsHooks.POST_CHECK)
+        ts_call_global_hook(TsHooks.POST_CHECK, result=ret_val)
 
     ###############################################################################################
     # Backup regression logs
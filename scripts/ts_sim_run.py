@@ -20,6 +20,8 @@ import argcomplete
 from internal.ts_hw_args import (
     TsArgumentParser,
     add_cfg_files_arg,
+    add_metrics_args,
+    add_profile_arg,
     add_target_arg,
     add_ts_common_args,
     add_ts_sim_run_args,
@@ -47,8 +49,15 @@ from internal.ts_hw_logging import (
     ts_print,
     ts_throw_error,
 )
+from internal.ts_hw_metrics import ts_metrics_init
+from internal.ts_hw_profile import ts_profile_init, ts_span
 from internal.ts_hw_simulator_ifc import ts_sim_elaborate, ts_sim_run
-from internal.ts_hw_test_list_files import get_test_list, get_tests_to_run, load_tests
+from internal.ts_hw_test_list_files import (
+    TsTestRun,
+    get_test_list,
+    get_tests_to_run,
+    load_tests,
+)
 from ts_sim_check import sim_check
 from ts_sim_compile import sim_compile
 
@@ -62,14 +71,19 @@ if __name__ == "__main__":
     add_cfg_files_arg(parser)
     add_target_arg(parser)
     add_ts_sim_run_args(parser)
+    add_profile_arg(parser)
+    add_metrics_args(parser)
     argcomplete.autocomplete(parser)
     args = parser.parse_args()
     TsGlobals.TS_SIM_CFG_PATH = args.sim_cfg
     ts_configure_logging(args)
+    ts_profile_init(args.profile)
+    ts_metrics_init(args.metrics_json, args.metrics_prom)
 
     # Load config file, merge with args and check configuration
-    do_sim_config_init(args)
-    do_design_config_init(args)
+    with ts_span("config_load"):
+        do_sim_config_init(args)
+        do_design_config_init(args)
 
     # Re-compile if "recompile" is set
     if ts_get_cfg("recompile"):
@@ -82,7 +96,8 @@ if __name__ == "__main__":
     check_target(args.target)
 
     # Load available tests
-    load_tests()
+    with ts_span("load_tests"):
+        load_tests()
 
     # Print available tests and exit
     if args.list_tests:
@@ -123,18 +138,26 @@ if __name__ == "__main__":
     all_sim_log_files = []
     all_elab_log_files = []
 
-    for test in TsGlobals.TS_TEST_RUN_LIST:
-        ts_print(f"Starting test: {test['name']}", color=TsColors.PURPLE)
+    for test_def in TsGlobals.TS_TEST_RUN_LIST:
+        ts_print(f"Starting test: {test_def['name']}", color=TsColors.PURPLE)
 
         # Loop if test shall be run multiple times
         for i in range(args.loop):
-            test["seed"] = ts_generate_seed()
+            test = TsTestRun(test_def["name"], ts_generate_seed(), i)
             elab_dir = ""
 
             # Call pre-test hooks
-            ts_call_global_hook(TsHooks.PRE_TEST, test["name"], test["seed"], i)
+            hook_context = {"test": test, "seed": test["seed"], "loop": i}
+            ts_call_global_hook(
+                TsHooks.PRE_TEST, test["name"], test["seed"], i, **hook_context
+            )
             ts_call_local_hook(
-                TsHooks.PRE_TEST_SPECIFIC, test, test["name"], test["seed"], i
+                TsHooks.PRE_TEST_SPECIFIC,
+                test,
+                test["name"],
+                test["seed"],
+                i,
+                **hook_context,
             )
 
             if not args.sim_only:
@@ -159,15 +182,23 @@ if __name__ == "__main__":
             #######################################################################################
             # Run simulation
             #######################################################################################
-            ts_call_global_hook(TsHooks.PRE_SIM)
+            ts_call_global_hook(TsHooks.PRE_SIM, **hook_context)
 
             sim_log_file = ts_sim_run(test, elab_dir)
             all_sim_log_files.append(sim_log_file)
 
+            hook_context["log_file"] = sim_log_file
             ts_call_local_hook(
-                TsHooks.POST_TEST_SPECIFIC, test, test["name"], test["seed"], i
+                TsHooks.POST_TEST_SPECIFIC,
+                test,
+                test["name"],
+                test["seed"],
+                i,
+                **hook_context,
+            )
+            ts_call_global_hook(
+                TsHooks.POST_TEST, test["name"], test["seed"], i, **hook_context
             )
-            ts_call_global_hook(TsHooks.POST_TEST, test["name"], test["seed"], i)
 
             # Check result of single test and abort if there is fail-fast!
             if TsGlobals.TS_SIM_CFG.get("fail_fast"):
@@ -192,6 +223,6 @@ if __name__ == "__main__":
         ts_print("Checking log files", color=TsColors.PURPLE, big=True)
         ret_val = sim_check(args, all_sim_log_files)
 
-        ts_call_global_hook(TsHooks.POST_CHECK)
+        ts_call_global_hook(TsHooks.POST_CHECK, result=ret_val)
 
     sys.exit(ret_val)
@@ -18,6 +18,7 @@ __license___ = "TODO:"
 __maintainer__ = "Jan Zapeca"
 
 import os
+import sqlite3
 import sys
 
 import argcomplete
@@ -28,8 +29,10 @@ from internal.ts_hw_args import (
     add_force_arg,
     add_lic_wait_arg,
     add_pd_common_args,
+    add_qor_ingest_args,
     add_release_arg,
     add_runcode_arg,
+    add_snps_log_args,
     add_source_data_arg,
     add_stayin_arg,
     add_ts_common_args,
@@ -55,22 +58,29 @@ from internal.ts_hw_logging import (
     TsColors,
     TsErrCode,
     TsInfoCode,
+    TsWarnCode,
     ts_configure_logging,
     ts_info,
     ts_print,
     ts_throw_error,
+    ts_warning,
 )
+from internal.ts_hw_qor import get_qor_wns_by_mode, ingest_qor_reports, qor_db_connect
 from internal.ts_hw_source_list_files import load_source_list_files
 from internal.ts_hw_sta_support import (
     build_sta_cmd,
     create_sta_sub_dirs,
     delete_sta_sub_dir,
+    get_sta_modes,
+    report_sta_modes_summary,
+    run_sta_modes,
     runcode_dir_test,
     set_sta_global_vars,
     sta_design_cfg_file,
     sta_dmsa_file,
     sta_logging,
     sta_open_design,
+    sta_modes_setup,
     sta_setup,
 )
 from internal.ts_hw_syn_support import release, set_license_queuing
@@ -93,6 +103,8 @@ if __name__ == "__main__":
     add_force_arg(parser)
     add_source_data_arg(parser, "syn")
     add_release_arg(parser)
+    add_snps_log_args(parser)
+    add_qor_ingest_args(parser)
     add_pd_common_args(parser)
     add_batch_mode_arg(parser)
 
@@ -128,14 +140,6 @@ if __name__ == "__main__":
     # Check --mode selector validity
     check_valid_mode_arg(args)
 
-    # Check existance of runcode - runcode is also name of run dir TS_REPO_ROOT/sta/{runcode}
-    if args.runcode is None:
-        ts_throw_error(TsErrCode.ERR_STA_0)
-    else:
-        ts_info(TsInfoCode.INFO_STA_0, args.runcode)
-        # Set sta flow global variables
-        set_sta_global_vars(args)
-
     # dmsa
     #   no open-result
     #   no mode - mutual exclusivity
@@ -144,23 +148,40 @@ if __name__ == "__main__":
     #   no dmsa
     #   mode is possible
 
+    # modes
+    #   no dmsa, no mode - mutual exclusivity
+    #   no open-result, no stay-in-tool, no checker
+
     if bool(args.open_result) & bool(args.dmsa):
         ts_throw_error(TsErrCode.ERR_STA_7)
+    elif args.modes:
+        if args.dmsa or args.mode:
+            ts_throw_error(TsErrCode.ERR_STA_6)
+        for switch in ("open_result", "stay_in_tool", "checker"):
+            if getattr(args, switch):
+                ts_throw_error(TsErrCode.ERR_STA_8, switch.replace("_", "-"))
+        if args.jobs < 1:
+            ts_throw_error(TsErrCode.GENERIC, "Number of --jobs must be at least 1!")
     elif not bool(args.open_result) and not (bool(args.dmsa) ^ bool(args.mode)):
         ts_throw_error(TsErrCode.ERR_STA_6)
 
+    # Check existance of runcode - runcode is also name of run dir TS_REPO_ROOT/sta/{runcode}
+    if args.runcode is None:
+        ts_throw_error(TsErrCode.ERR_STA_0)
+    else:
+        ts_info(TsInfoCode.INFO_STA_0, args.runcode)
+        # Set sta flow global variables
+        set_sta_global_vars(args)
+
     # Check if user requires either running a new sta or opennig an existing sta session database
     if args.open_result is False:
         if args.force is True:
             ts_info(TsInfoCode.INFO_STA_2, TsGlobals.TS_STA_RUNCODE)
             # Delete DIR of runcode name if exists
             delete_sta_sub_dir()
-        else:
-            # Test if database already exists, otherwise create sub-folder
-            if runcode_dir_test(args) is True:
-                ts_throw_error(TsErrCode.ERR_STA_2, TsGlobals.TS_STA_RUNCODE)
 
-        # Create new sub-folder with name of runcode
+        # Create new sub-folder with name of runcode (new runcode directory was already
+        # allocated following the _n+1 rule unless --force is used)
         create_sta_sub_dirs()
 
     else:
@@ -175,28 +196,68 @@ if __name__ == "__main__":
     # Generates design configuration tcl file
     sta_design_cfg_file(args)
 
-    # Generate static timing analysis setup tcl file
-    sta_setup(TsGlobals.TS_STA_SETUP_FILE, args)
-
-    # Generate static timing analysis dmsa setup tcl file
-    if args.dmsa:
-        sta_dmsa_file(TsGlobals.TS_STA_DMSA_FILE, args)
-
     # Set enviromental variable for DC - license quering
     set_license_queuing(args, "pt_shell", "SNPSLMD_QUEUE")
 
-    # Prepare pt_cmd
-    [pt_cmd, log_file] = build_sta_cmd(args)
+    if args.modes:
+        # Generate setup tcl file and pt_cmd of each mode
+        mode_jobs = sta_modes_setup(get_sta_modes(args), args)
 
-    ts_print(f"Running STA { 'without' if args.no_std_out else 'with'} standard output",
-             color=TsColors.PURPLE, big=True)
+        ts_print(f"Running STA of modes: {', '.join(job['mode'] for job in mode_jobs)}",
+                 color=TsColors.PURPLE, big=True)
+
+        # Run STA of modes and check their logs
+        mode_results = run_sta_modes(mode_jobs, args)
+
+        exit_code = any(result["status"] != "PASSED" for result in mode_results)
+
+    else:
+        # Generate static timing analysis setup tcl file
+        sta_setup(TsGlobals.TS_STA_SETUP_FILE, args)
 
-    # Run STA
-    exec_cmd_in_dir(
-        directory=TsGlobals.TS_STA_RUN_DIR, command=pt_cmd, batch_mode=args.batch_mode
-    )
+        # Generate static timing analysis dmsa setup tcl file
+        if args.dmsa:
+            sta_dmsa_file(TsGlobals.TS_STA_DMSA_FILE, args)
 
-    exit_code = check_snps_log_file("STA", log_file)
+        # Prepare pt_cmd
+        [pt_cmd, log_file] = build_sta_cmd(args)
+
+        ts_print(f"Running STA { 'without' if args.no_std_out else 'with'} standard output",
+                 color=TsColors.PURPLE, big=True)
+
+        # Run STA
+        exec_cmd_in_dir(
+            directory=TsGlobals.TS_STA_RUN_DIR, command=pt_cmd, batch_mode=args.batch_mode
+        )
+
+        exit_code = check_snps_log_file("STA", log_file, args.log_waivers, args.log_json)
+
+    # Ingest reports to QoR database
+    if not args.no_qor:
+        ingest_qor_reports(
+            "sta",
+            TsGlobals.TS_STA_RUNCODE,
+            TsGlobals.TS_STA_REPORTS_DIR,
+            args.qor_db,
+            default_mode=args.mode,
+            design=TsGlobals.TS_DESIGN_CFG["design"]["target"],
+        )
+
+    # Merge results of modes to single summary
+    if args.modes:
+        wns = None
+        if not args.no_qor:
+            try:
+                conn = qor_db_connect(args.qor_db)
+                wns = get_qor_wns_by_mode(conn, "sta", TsGlobals.TS_STA_RUNCODE)
+                conn.close()
+            except (OSError, sqlite3.Error) as e:
+                ts_warning(TsWarnCode.GENERIC, f"Slacks of modes not read from QoR database: {e}")
+        report_sta_modes_summary(
+            mode_results,
+            f"{TsGlobals.TS_STA_LOGS_DIR}/{TsGlobals.TS_STA_RUNCODE}_sta_modes.json",
+            wns,
+        )
 
     # Goodbye STA!
     ts_print("STA is done!", color=TsColors.PURPLE, big=True)
@@ -213,6 +274,6 @@ if __name__ == "__main__":
                 TsGlobals.TS_STA_RUNCODE,
             )
         )
-        release(TsGlobals.TS_STA_RUN_DIR, TsGlobals.TS_STA_RELEASE_DIR, "sta")
+        release(TsGlobals.TS_STA_RUN_DIR, TsGlobals.TS_STA_RELEASE_DIR, "sta", args.release_mode)
 
     sys.exit(exit_code)
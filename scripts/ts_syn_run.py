@@ -28,8 +28,10 @@ from internal.ts_hw_args import (
     add_force_arg,
     add_lic_wait_arg,
     add_pd_common_args,
+    add_qor_ingest_args,
     add_release_arg,
     add_runcode_arg,
+    add_snps_log_args,
     add_stayin_arg,
     add_ts_common_args,
     add_ts_syn_run_args,
@@ -57,6 +59,7 @@ from internal.ts_hw_logging import (
 from internal.ts_hw_check import (
     check_snps_log_file
 )
+from internal.ts_hw_qor import ingest_qor_reports
 from internal.ts_hw_source_list_files import load_source_list_files
 from internal.ts_hw_syn_support import (
     build_synthesis_cmd,
@@ -92,6 +95,8 @@ if __name__ == "__main__":
     add_ts_syn_run_args(parser, "dc_shell")
     add_force_arg(parser)
     add_release_arg(parser)
+    add_snps_log_args(parser)
+    add_qor_ingest_args(parser)
     add_pd_common_args(parser)
     add_batch_mode_arg(parser)
 
@@ -179,7 +184,17 @@ if __name__ == "__main__":
         directory=TsGlobals.TS_SYN_RUN_DIR, command=dc_cmd, batch_mode=args.batch_mode
     )
 
-    exit_code = check_snps_log_file("Synthesis", log_file)
+    exit_code = check_snps_log_file("Synthesis", log_file, args.log_waivers, args.log_json)
+
+    # Ingest reports to QoR database
+    if not args.no_qor:
+        ingest_qor_reports(
+            "syn",
+            args.runcode,
+            TsGlobals.TS_SYN_REPORTS_DIR,
+            args.qor_db,
+            design=TsGlobals.TS_DESIGN_CFG["design"]["target"],
+        )
 
     # Goodbye synthesis!
     ts_print("Synthesis is done!", color=TsColors.PURPLE, big=True)
@@ -195,6 +210,6 @@ if __name__ == "__main__":
                 TsGlobals.TS_DESIGN_CFG["design"]["flow_dirs"]["syn"], args.runcode
             )
         )
-        release(TsGlobals.TS_SYN_RUN_DIR, TsGlobals.TS_SYN_RELEASE_DIR, "syn")
+        release(TsGlobals.TS_SYN_RUN_DIR, TsGlobals.TS_SYN_RELEASE_DIR, "syn", args.release_mode)
 
     sys.exit(exit_code)